@@ -1,5 +1,7 @@
 import sys
 
+import pytest
+
 collect_ignore = [
     "setup.py",
     "extra/contrib/fusion_rgb_cycle.py",  # depends on coloraide
@@ -11,3 +13,16 @@ if sys.platform != "linux":
 
 if sys.platform not in ["win32", "cygwin"]:
     collect_ignore.append("extra/windows/LQiNFO.py")
+
+
+@pytest.fixture(autouse=True)
+def lock_storage(monkeypatch, tmp_path):
+    """Keep the device locks taken by drivers out of the real runtime directory."""
+
+    import liquidctl.driver.usb
+    from liquidctl.keyval import RuntimeStorage, _FilesystemBackend
+
+    backend = _FilesystemBackend(["locks"], runtime_dirs=[str(tmp_path)])
+    storage = RuntimeStorage(["locks"], backend)
+    monkeypatch.setattr(liquidctl.driver.usb._DeviceLock, "_storage", storage)
+    return storage
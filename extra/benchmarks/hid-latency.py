@@ -0,0 +1,91 @@
+"""Benchmark the round-trip latency of HID devices with each HID backend.
+
+Compares hidapi against the native hidraw backend (Linux only), on real
+devices.  Each round trip is either a call to the driver's `get_status`, or,
+with --request, writing a raw report and reading the next report of up to
+--length bytes.  Run it with the devices otherwise idle, and beware that some
+devices only push their status periodically.
+
+Usage:
+
+    python extra/benchmarks/hid-latency.py --match <substring> [options]
+
+Options:
+
+    --request <hex>   Send this report, e.g. 7401, instead of calling get_status
+    --length <n>      Length of the reply to --request (default: 64)
+    --runs <n>        Round trips per backend (default: 100)
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# use the local liquidctl modules, instead of other versions that may be installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from liquidctl import find_liquidctl_devices  # noqa: E402
+from liquidctl.driver.usb import UsbHidDriver  # noqa: E402
+
+BACKENDS = ["hidapi", "hidraw"]
+
+
+def round_trip(dev, request, length):
+    if request is None:
+        dev.get_status()
+        return
+    dev.device.clear_enqueued_reports()
+    dev.device.write(request)
+    dev.device.read(length)
+
+
+def measure(backend, args, request):
+    """Return the round-trip times, in seconds, with `backend`."""
+
+    os.environ["LIQUIDCTL_HID_BACKEND"] = backend
+    devs = [
+        dev
+        for dev in find_liquidctl_devices(match=args.match)
+        if isinstance(dev, UsbHidDriver)
+    ]
+    if not devs:
+        sys.exit(f"no HID device matches {args.match!r}")
+    dev = devs[0]
+
+    times = []
+    with dev.connect():
+        round_trip(dev, request, args.length)  # warm up
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            round_trip(dev, request, args.length)
+            times.append(time.perf_counter() - start)
+    return dev.description, times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--match", required=True, help="select the device to use")
+    parser.add_argument("--request", help="raw report to send, in hex")
+    parser.add_argument("--length", type=int, default=64, help="length of the reply")
+    parser.add_argument("--runs", type=int, default=100, help="round trips per backend")
+    args = parser.parse_args()
+
+    if sys.platform != "linux":
+        sys.exit("the hidraw backend is only available on Linux")
+
+    request = list(bytes.fromhex(args.request)) if args.request else None
+
+    for backend in BACKENDS:
+        description, times = measure(backend, args, request)
+        print(
+            f"{backend:<8} {description}: "
+            f"median {statistics.median(times) * 1e3:8.3f} ms, "
+            f"min {min(times) * 1e3:8.3f} ms"
+        )
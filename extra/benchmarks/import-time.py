@@ -0,0 +1,71 @@
+"""Benchmark the time it takes to import liquidctl and to find devices.
+
+Compares the lazy driver registry against eagerly importing every driver
+module, which is what liquidctl did before the registry existed.  Each case
+runs in a fresh interpreter, and the best of a few runs is reported.
+
+Usage:
+
+    python extra/benchmarks/import-time.py [--runs <n>]
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import argparse
+import os
+import subprocess
+import sys
+
+CASES = [
+    ("import (lazy)", "import liquidctl"),
+    (
+        "import (eager)",
+        "import liquidctl; from liquidctl.driver import registry; registry.load_all_drivers()",
+    ),
+    ("import and find (lazy)", "import liquidctl; list(liquidctl.find_liquidctl_devices())"),
+    (
+        "import and find (eager)",
+        "import liquidctl; from liquidctl.driver import registry; registry.load_all_drivers(); "
+        "list(liquidctl.find_liquidctl_devices())",
+    ),
+]
+
+TEMPLATE = """
+import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code, runs, env):
+    """Return the best time, in seconds, to run `code` in a new interpreter."""
+
+    best = None
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", TEMPLATE.format(code)],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        elapsed = float(out.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per case (default: 10)")
+    args = parser.parse_args()
+
+    # use the local liquidctl modules, instead of other versions that may be installed
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+
+    for name, code in CASES:
+        print(f"{name:<24} {measure(code, args.runs, env) * 1e3:8.1f} ms")
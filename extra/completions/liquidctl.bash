@@ -69,12 +69,18 @@ _liquidctl_main() {
     initialize
     list
     status
+    batch
+    apply
     "
 
     local boolean_options="
     --verbose -v
     --debug -g
     --json
+    --no-cache
+    --concurrent-buses
+    --daemon
+    --force
     --version
     --help
     --single-12v-ocp
@@ -106,6 +112,13 @@ _liquidctl_main() {
     --maximum-leds
     --temperature-sensor
     --fan-mode
+    --jobs -j
+    --watch
+    --status-ttl
+    --lock-timeout
+    --record
+    --replay
+    --format
     "
 
     # generate options list and remove any flag that has already been given
@@ -170,6 +183,10 @@ _liquidctl_main() {
             COMPREPLY=($(compgen -W "balanced quiet extreme" -- "$cur"))
             return
             ;;
+        --format)
+            COMPREPLY=($(compgen -W "jsonl csv openmetrics" -- "$cur"))
+            return
+            ;;
         --* | -[a-z]*1)
             COMPREPLY=()
             return
@@ -196,7 +213,7 @@ _liquidctl_main() {
               return
               ;;
           -*) ;;
-          initialize | list | status | set )
+          initialize | list | status | set | batch | apply )
               cmd="$s"
               break
               ;;
@@ -218,6 +235,8 @@ _liquidctl_main() {
       initialize) _liquidctl_initialize_command ;;
       status) COMPREPLY="" ;;
       set) _liquidctl_set_command ;;
+      batch) _filedir ;;
+      apply) _filedir ;;
       *)          ;;
   esac
 }
@@ -0,0 +1,59 @@
+"""Generate liquidctl/driver/_registry_table.py from the drivers themselves.
+
+Usage:
+
+    python extra/generate-driver-registry.py > liquidctl/driver/_registry_table.py
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import json
+import sys
+
+HEADER = '''"""Table of the drivers that ship with liquidctl.
+
+Automatically generated by extra/generate-driver-registry.py; do not edit.
+See liquidctl.driver.registry for how this table is used.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# (module, class, bus, vendor id, product id, description, match aliases)
+DRIVERS = ['''
+
+
+def _literal(value):
+    if isinstance(value, int):
+        return f"0x{value:04x}"
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, tuple):
+        if len(value) == 1:
+            return f"({_literal(value[0])},)"
+        return f"({', '.join(map(_literal, value))})"
+    return repr(value)
+
+
+def format_table(rows):
+    """Format `rows` as the contents of the registry table module."""
+
+    lines = [HEADER]
+    for row in rows:
+        lines.append(f"    {_literal(row)},")
+    lines.append("]")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    # This script is meant to be executed from this directory or the project root.
+    # We use that assumption to make Python pick the local liquidctl modules,
+    # instead other versions that may be installed on the environment/system.
+    sys.path = ["..", ""] + sys.path
+
+    from liquidctl.driver.registry import build_table
+
+    sys.stdout.write(format_table(build_table()))
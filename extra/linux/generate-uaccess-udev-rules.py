@@ -16,10 +16,13 @@ if __name__ == "__main__":
         print("liquidctl udev rules files must use UTF-8, reconfiguring stdout", file=sys.stderr)
         sys.stdout.reconfigure(encoding="utf-8")
 
+    from liquidctl.driver import registry
     from liquidctl.driver.base import find_all_subclasses
     from liquidctl.driver.nvidia import _NvidiaI2CDriver
     from liquidctl.driver.usb import BaseUsbDriver
 
+    registry.load_all_drivers()
+
     HEADER = """
     # Rules that grant unprivileged access to devices supported by liquidctl.
     #
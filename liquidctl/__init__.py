@@ -42,6 +42,9 @@ other hardware monitoring or LED controller devices in Python:
                 radical_red = [0xff, 0x35, 0x5e]
                 dev.set_color(channel='pump', mode='fixed', colors=[radical_red])
 
+Programs based on asyncio can use the equivalent coroutines in `liquidctl.aio`
+instead, which do not block the event loop.
+
 A command-line interface is also available:
 
     $ python -m liquidctl --help
@@ -0,0 +1,198 @@
+"""asyncio interface to liquidctl devices.
+
+    import asyncio
+    from liquidctl import aio
+
+    async def main():
+        for dev in await aio.find_liquidctl_devices():
+            async with dev.connect():
+                print(dev.description, await dev.get_status())
+
+    asyncio.run(main())
+
+The liquidctl drivers are synchronous, and their operations can take from a
+few milliseconds to several seconds.  To avoid blocking the event loop, each
+`AsyncDevice` runs the operations of its driver in a dedicated thread: calls
+to the same device run one at a time, in the order they were made, while calls
+to different devices can overlap.
+
+When an awaiting task is cancelled, an operation that has not started yet is
+dropped.  One that is already running is cancelled at its next USB or HID
+transfer, which raises `liquidctl.error.Timeout` in the worker thread; the
+device can then be used again.  Transfers that are already in progress at the
+USB level, and devices on other buses, finish normally.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from liquidctl.driver import find_liquidctl_devices as _find_liquidctl_devices
+from liquidctl.driver.usb import cancel_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def find_liquidctl_devices(**kwargs):
+    """Find devices and return a list of `AsyncDevice` instances.
+
+    Accepts the same arguments as `liquidctl.find_liquidctl_devices`, and runs
+    it in the default executor of the event loop.
+    """
+
+    loop = asyncio.get_running_loop()
+    find = functools.partial(_find_liquidctl_devices, **kwargs)
+    devs = await loop.run_in_executor(None, lambda: list(find()))
+    return [AsyncDevice(dev) for dev in devs]
+
+
+class _Connection:
+    """Awaitable that can also be used as an async context manager."""
+
+    def __init__(self, device, kwargs):
+        self._device = device
+        self._kwargs = kwargs
+
+    def __await__(self):
+        return self._connect().__await__()
+
+    async def _connect(self):
+        await self._device._run("connect", **self._kwargs)
+        return self._device
+
+    async def __aenter__(self):
+        return await self._connect()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._device.disconnect()
+
+
+class AsyncDevice:
+    """Run the operations of a liquidctl driver without blocking the event loop.
+
+    The synchronous driver is available as `driver`; it should not be used
+    directly while the asynchronous device is in use.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def description(self):
+        return self.driver.description
+
+    @property
+    def vendor_id(self):
+        return self.driver.vendor_id
+
+    @property
+    def product_id(self):
+        return self.driver.product_id
+
+    @property
+    def release_number(self):
+        return self.driver.release_number
+
+    @property
+    def serial_number(self):
+        return self.driver.serial_number
+
+    @property
+    def bus(self):
+        return self.driver.bus
+
+    @property
+    def address(self):
+        return self.driver.address
+
+    @property
+    def port(self):
+        return self.driver.port
+
+    def connect(self, **kwargs):
+        """Connect to the device.
+
+        Can be awaited, returning this device, or used as an async context
+        manager, which disconnects on exit:
+
+            async with dev.connect():
+                ...
+        """
+
+        return _Connection(self, kwargs)
+
+    async def disconnect(self, **kwargs):
+        """Disconnect from the device, then stop its worker thread."""
+
+        try:
+            await self._run("disconnect", **kwargs)
+        finally:
+            with self._executor_lock:
+                executor, self._executor = self._executor, None
+            if executor:
+                executor.shutdown(wait=False)
+
+    async def initialize(self, **kwargs):
+        """Initialize the device and the driver."""
+
+        return await self._run("initialize", **kwargs)
+
+    async def get_status(self, **kwargs):
+        """Get a status report."""
+
+        return await self._run("get_status", **kwargs)
+
+    async def set_color(self, channel, mode, colors, **kwargs):
+        """Set the color mode for a specific channel."""
+
+        return await self._run("set_color", channel, mode, colors, **kwargs)
+
+    async def set_speed_profile(self, channel, profile, **kwargs):
+        """Set channel to follow a speed duty profile."""
+
+        return await self._run("set_speed_profile", channel, profile, **kwargs)
+
+    async def set_fixed_speed(self, channel, duty, **kwargs):
+        """Set channel to a fixed speed duty."""
+
+        return await self._run("set_fixed_speed", channel, duty, **kwargs)
+
+    async def set_screen(self, channel, mode, value, **kwargs):
+        """Set the screen mode and content."""
+
+        return await self._run("set_screen", channel, mode, value, **kwargs)
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="liquidctl-aio"
+                )
+            return self._executor
+
+    async def _run(self, method, *args, **kwargs):
+        cancelled = threading.Event()
+
+        def call():
+            with cancel_scope(cancelled):
+                return getattr(self.driver, method)(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), call)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            _LOGGER.debug("%s: cancelling %s", self.driver.description, method)
+            cancelled.set()
+            raise
@@ -0,0 +1,232 @@
+"""Apply a desired state to devices, skipping what has not changed.
+
+A spec lists the desired state of each device, in TOML or JSON:
+
+    [[devices]]
+    match = "kraken"
+    initialize = { pump_mode = "balanced" }
+    speed = { fan = [[20, 30], [40, 50], [50, 100]], pump = 70 }
+    color = { ring = { mode = "fading", colors = ["ff0000", "00ff00"], speed = "slower" } }
+    screen = { lcd = { mode = "static", value = "liquid" } }
+    options = { direct_access = true }
+
+Each device is selected with the usual filters (`match`, `vendor`, `product`,
+`release`, `serial`, `bus`, `address`, `usb_port` and `pick`).  `options` are
+passed to all driver calls, and the keys other than `mode` and `colors` (or
+`value`) in color and screen settings are passed to that call only.
+
+The inputs of each driver call are normalized and fingerprinted, and the
+fingerprints of the calls that succeeded are stored in `RuntimeStorage`.  On
+later runs, only the calls whose fingerprints changed are made again.  Since
+devices lose their state when powered off, the stored fingerprints are only
+valid until the system is rebooted or the device is enumerated again (e.g.
+when replugged); where the current boot cannot be identified (i.e. outside of
+Linux), all calls are always made.  If `initialize` needs to run, all other
+calls are made again as well.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import hashlib
+import json
+import logging
+import os
+from collections import namedtuple
+
+from liquidctl.keyval import RuntimeStorage, device_key
+from liquidctl.util import color_from_str
+
+_LOGGER = logging.getLogger(__name__)
+
+_FILTERS = ["match", "vendor", "product", "release", "serial", "bus", "address", "usb_port", "pick"]
+_SETTINGS = ["initialize", "speed", "color", "screen", "options"]
+
+Operation = namedtuple("Operation", ["key", "method", "args", "kwargs", "fingerprint"])
+Operation.__doc__ = """A driver call, and the fingerprint of its normalized inputs."""
+
+
+def load_spec(path):
+    """Load a TOML or JSON spec, and return its list of device entries.
+
+    Files whose names end in `.toml` are parsed as TOML, all others as JSON.
+    """
+
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ModuleNotFoundError:
+            try:
+                import tomli as tomllib
+            except ModuleNotFoundError:
+                raise ValueError("TOML specs require Python 3.11 or tomli") from None
+        with open(path, "rb") as f:
+            spec = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+
+    devices = spec.get("devices") if isinstance(spec, dict) else None
+    if not isinstance(devices, list) or not all(isinstance(x, dict) for x in devices):
+        raise ValueError("spec must contain a list of devices")
+    for num, entry in enumerate(devices):
+        unknown = set(entry) - set(_FILTERS) - set(_SETTINGS)
+        if unknown:
+            raise ValueError(f"device #{num}: unknown keys: {', '.join(sorted(unknown))}")
+    return devices
+
+
+def selection_filters(entry):
+    """Return the selection filters of a device entry, parsed like CLI options."""
+
+    filters = {}
+    for key in _FILTERS:
+        if key not in entry:
+            continue
+        value = entry[key]
+        if key in ["vendor", "product", "release"] and isinstance(value, str):
+            value = int(value, 16)
+        elif key == "usb_port" and isinstance(value, str):
+            value = tuple(map(int, value.split(".")))
+        elif key == "usb_port":
+            value = tuple(value)
+        elif key == "address":
+            value = str(value)
+        filters[key] = value
+    return filters
+
+
+def plan(entry):
+    """Return the operations that bring a device to the state in `entry`."""
+
+    options = dict(entry.get("options", {}))
+    ops = []
+
+    if "initialize" in entry and entry["initialize"] is not False:
+        init = entry["initialize"]
+        kwargs = {**options, **(init if isinstance(init, dict) else {})}
+        ops.append(_operation("initialize", "initialize", [], kwargs))
+
+    for channel, value in entry.get("speed", {}).items():
+        channel = channel.lower()
+        if isinstance(value, list):
+            profile = [[int(temp), int(duty)] for temp, duty in value]
+            ops.append(
+                _operation(f"speed_{channel}", "set_speed_profile", [channel, profile], options)
+            )
+        else:
+            ops.append(
+                _operation(f"speed_{channel}", "set_fixed_speed", [channel, int(value)], options)
+            )
+
+    for channel, value in entry.get("color", {}).items():
+        channel = channel.lower()
+        value = dict(value)
+        mode = value.pop("mode").lower()
+        colors = [
+            color_from_str(x) if isinstance(x, str) else list(x) for x in value.pop("colors", [])
+        ]
+        kwargs = {**options, **value}
+        ops.append(_operation(f"color_{channel}", "set_color", [channel, mode, colors], kwargs))
+
+    for channel, value in entry.get("screen", {}).items():
+        channel = channel.lower()
+        value = dict(value)
+        mode = value.pop("mode").lower()
+        content = value.pop("value", None)
+        kwargs = {**options, **value}
+        # the file behind a path can change without the path changing
+        extra = _file_digest(content) if isinstance(content, str) else None
+        ops.append(
+            _operation(f"screen_{channel}", "set_screen", [channel, mode, content], kwargs, extra)
+        )
+
+    return ops
+
+
+def pending(ops, fingerprints):
+    """Return the operations whose fingerprints differ from `fingerprints`."""
+
+    changed = [op for op in ops if fingerprints.get(op.key) != op.fingerprint]
+    if any(op.method == "initialize" for op in changed):
+        # initializing a device may reset everything else
+        return ops
+    return changed
+
+
+class AppliedState:
+    """The fingerprints of the last operations applied to a device.
+
+    Unstable API.
+    """
+
+    def __init__(self, dev, storage=None):
+        self._storage = storage or RuntimeStorage(key_prefixes=["apply", device_key(dev)])
+        self._boot_id = _boot_id()
+        self._instance = _device_instance(dev)
+
+    def load(self):
+        """Return the stored fingerprints, or an empty dict if they are stale."""
+
+        saved = self._storage.load("last_applied", of_type=dict, default={})
+        if not self._boot_id or saved.get("boot_id") != self._boot_id:
+            return {}
+        if saved.get("instance") != self._instance:
+            return {}
+        return saved.get("fingerprints", {})
+
+    def store(self, fingerprints):
+        self._storage.store(
+            "last_applied",
+            {
+                "boot_id": self._boot_id,
+                "instance": self._instance,
+                "fingerprints": dict(fingerprints),
+            },
+        )
+
+
+def _operation(key, method, args, kwargs, extra=None):
+    normalized = json.dumps([method, args, kwargs, extra], sort_keys=True, default=str)
+    fingerprint = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+    return Operation(key, method, args, kwargs, fingerprint)
+
+
+def _file_digest(path):
+    if not os.path.isfile(path):
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _device_instance(dev):
+    """Return what identifies the current enumeration of `dev`.
+
+    USB device addresses are not reused right away when a device is replugged
+    or power cycled, and device nodes (e.g. /dev/hidraw*) are recreated with
+    new inodes.
+    """
+
+    address = dev.address
+    inode = None
+    if isinstance(address, str) and address.startswith("/dev/"):
+        try:
+            inode = os.stat(address).st_ino
+        except OSError:
+            pass
+    return f"{dev.bus}:{address}:{inode}"
+
+
+def _boot_id():
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return None
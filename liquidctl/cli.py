@@ -8,6 +8,8 @@ Usage:
   liquidctl [options] set <channel> speed <percentage>
   liquidctl [options] set <channel> color <mode> [<color>] ...
   liquidctl [options] set <channel> screen <mode> [<value>]
+  liquidctl [options] batch [<file>]
+  liquidctl [options] apply <file>
   liquidctl --help
   liquidctl --version
 
@@ -46,6 +48,17 @@ Other interface options:
   -v, --verbose                      Output additional information
   -g, --debug                        Show debug information on stderr
   --json                             JSON output (list/initialization/status)
+  --format <format>                  Status output format: jsonl, csv or openmetrics
+  --no-cache                         Rebuild the device inventory instead of reusing it
+  --concurrent-buses                 Enumerate all buses at the same time
+  --daemon                           Access the devices through liquidctld
+  -j, --jobs <number>                Handle up to this many devices at the same time
+  --watch <interval>                 Continuously output the status (seconds between samples)
+  --status-ttl <seconds>             Reuse a status read by any process in the last seconds
+  --lock-timeout <seconds>           Wait this long for other programs to release a device
+  --force                            Apply all settings, even if unchanged since last applied
+  --record <file>                    Record the transfers of initialize and set to a file
+  --replay <file>                    Replay recorded transfers instead of running the drivers
   --version                          Display the version number
   --help                             Show this message
 
@@ -67,22 +80,22 @@ WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
 PARTICULAR PURPOSE.  See the GNU General Public License for more details.
 """
 
+# startup time matters for a CLI that is often run from scripts: modules that
+# are only needed for --version, --debug or colored output are imported later
+
 import datetime
 import errno
-import inspect
+import functools
 import json
-import locale
 import logging
 import os
-import platform
 import re
+import shlex
 import sys
-from importlib.metadata import distribution, version, PackageNotFoundError
-from numbers import Number
-from traceback import format_exception
+import time
+import unicodedata
 
-import colorlog
-from docopt import docopt
+from docopt import DocoptExit, docopt
 
 from liquidctl import __version__
 from liquidctl.driver import *
@@ -120,6 +133,7 @@ _PARSE_ARG = {
     '--legacy-690lc': bool,
     '--non-volatile': bool,
     '--direct-access': bool,
+    '--lock-timeout': float,
     '--fan-mode': lambda x: fan_mode_parser(x),
     '--unsafe': lambda x: x.lower().split(','),
     '--verbose': bool,
@@ -134,12 +148,31 @@ _FILTER_OPTIONS = [
     'serial',
     'bus',
     'address',
-    'usb-port',
+    'usb_port',
     'match',
     'pick',
     # --device generates no option
 ]
 
+# options that, in batch mode, can only be passed to the batch command itself
+_BATCH_ONLY_OPTIONS = [
+    '--verbose',
+    '--debug',
+    '--json',
+    '--format',
+    '--no-cache',
+    '--concurrent-buses',
+    '--daemon',
+    '--force',
+    '--record',
+    '--replay',
+    '--jobs',
+    '--status-ttl',
+    '--version',
+    '--help',
+    '--device',
+]
+
 # custom number formats for values of select units
 _VALUE_FORMATS = {
     '%': '.0f',
@@ -221,7 +254,7 @@ def _list_devices_human(devices, *, using_filters, device_id, verbose, debug, **
 
         print(f'└── Driver: {type(dev).__name__}')
         if debug:
-            driver_hier = (i.__name__ for i in inspect.getmro(type(dev)))
+            driver_hier = (i.__name__ for i in type(dev).__mro__)
             _LOGGER.debug('MRO: %s', ', '.join(driver_hier))
 
         for msg in warnings:
@@ -294,6 +327,382 @@ def _device_set_speed(dev, args, **opts):
         dev.set_fixed_speed(args['<channel>'].lower(), int(args['<percentage>'][0]), **opts)
 
 
+def _operation_key(args, opts):
+    # the command, and all options that are forwarded to the driver
+    command = {arg: val for arg, val in args.items() if not arg.startswith('-') and val}
+    options = {opt: val for opt, val in opts.items()
+               if opt not in _FILTER_OPTIONS and opt not in ['verbose', 'debug']}
+    return json.dumps([command, options], sort_keys=True, default=str)
+
+
+def _run_device_operation(dev, args, opts, transcript=None):
+    # screens are not recorded, as their contents can change without the arguments changing
+    if transcript and (args['initialize'] or (args['set'] and not args['screen'])):
+        return transcript.run(dev, _operation_key(args, opts),
+                              lambda: _run_device_operation(dev, args, opts),
+                              direct_access=opts.get('direct_access', False))
+    if args['initialize']:
+        return dev.initialize(**opts)
+    elif args['status']:
+        return _get_status(dev, args, opts)
+    elif args['set'] and args['speed']:
+        _device_set_speed(dev, args, **opts)
+    elif args['set'] and args['color']:
+        _device_set_color(dev, args, **opts)
+    elif args['set'] and args['screen']:
+        _device_set_screen(dev, args, **opts)
+    else:
+        assert False, 'unreachable'
+
+
+def _get_status(dev, args, opts):
+    if args['--status-ttl'] is not None:
+        from liquidctl import status_cache
+        return status_cache.get_status(dev, args['--status-ttl'], **opts)
+    return dev.get_status(**opts)
+
+
+def _output_status(dev, args, status, obj_buf, json_output):
+    if not (args['initialize'] or args['status']):
+        return
+    if json_output:
+        obj_buf.append(_dev_status_obj(dev, status))
+    else:
+        _print_dev_status(dev, status)
+
+
+def _run_device_jobs(job, devices, jobs):
+    """Run `job` for each device, and yield (device, result or exception) pairs.
+
+    With `jobs > 1`, up to `jobs` devices are handled at the same time, in a
+    thread pool, but the results are still yielded in the original order.
+    """
+
+    def run(dev):
+        _LOGGER.debug('device: %s', dev.description)
+        try:
+            return job(dev)
+        except Exception as err:
+            return err
+
+    if jobs <= 1 or len(devices) <= 1:
+        for dev in devices:
+            yield dev, run(dev)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='liquidctl-job') as executor:
+        futures = [executor.submit(run, dev) for dev in devices]
+        for dev, future in zip(devices, futures):
+            yield dev, future.result()
+
+
+def _print_json(obj):
+    # use __str__ for values that cannot be directly serialized to JSON
+    # (e.g. enums); flush, as the output may be streamed (--watch)
+    print(json.dumps(obj, ensure_ascii=(os.getenv('LANG', None) == 'C'),
+                     default=lambda x: str(x)), flush=True)
+
+
+# OpenMetrics base units, used as metric name suffixes
+_METRIC_UNITS = {
+    '°C': 'celsius',
+    '%': 'percent',
+    'A': 'amperes',
+    'V': 'volts',
+    'W': 'watts',
+    's': 'seconds',
+    'dB': 'decibels',
+    'dL/h': 'deciliters_per_hour',
+}
+
+
+def _sensor_id(key):
+    """Sanitize a status key into a stable identifier (e.g. 'fan_1_speed')."""
+    key = unicodedata.normalize('NFKD', key).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')
+
+
+def _status_items(status):
+    for key, value, unit in status or []:
+        if isinstance(value, datetime.timedelta):
+            value, unit = value.total_seconds(), 's'
+        yield _sensor_id(key), key, value, unit
+
+
+class _JsonLinesWriter:
+    """Write one JSON object per device (and sample, with --watch)."""
+
+    def __init__(self, timestamps):
+        self._timestamps = timestamps
+
+    def write(self, dev, status, timestamp=None):
+        obj = {
+            'bus': dev.bus,
+            'address': dev.address,
+            'description': dev.description,
+            'status': [{'id': id_, 'key': key, 'value': value, 'unit': unit}
+                       for id_, key, value, unit in _status_items(status)],
+        }
+        if self._timestamps:
+            obj = {'timestamp': timestamp, **obj}
+        _print_json(obj)
+
+    def close(self):
+        pass
+
+
+class _CsvWriter:
+    """Write one CSV row per device and status item."""
+
+    _COLUMNS = ['bus', 'address', 'description', 'id', 'key', 'value', 'unit']
+
+    def __init__(self, timestamps):
+        import csv
+        self._timestamps = timestamps
+        self._writer = csv.writer(sys.stdout, lineterminator='\n')
+        self._writer.writerow((['timestamp'] if timestamps else []) + self._COLUMNS)
+
+    def write(self, dev, status, timestamp=None):
+        prefix = [timestamp] if self._timestamps else []
+        for id_, key, value, unit in _status_items(status):
+            self._writer.writerow(prefix + [dev.bus, dev.address, dev.description, id_, key,
+                                            value, unit])
+        sys.stdout.flush()
+
+    def close(self):
+        pass
+
+
+class _OpenMetricsWriter:
+    """Write an OpenMetrics exposition, once all devices have been read.
+
+    The samples of each metric must be grouped together, so, unlike the other
+    formats, the output cannot be streamed per device.  Numeric values become
+    gauges, and others become `_info` gauges with a `value` label.
+    """
+
+    def __init__(self, timestamps):
+        self._families = {}
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def write(self, dev, status, timestamp=None):
+        labels = (f'device="{self._escape(dev.description)}",bus="{self._escape(dev.bus)}",'
+                  f'address="{self._escape(dev.address)}"')
+        for id_, key, value, unit in _status_items(status):
+            if value is None:
+                continue
+            if isinstance(value, (bool, int, float)):
+                metric_unit = _METRIC_UNITS.get(unit, _sensor_id(unit))
+                name = f'liquidctl_{id_}'
+                if metric_unit and not name.endswith(f'_{metric_unit}'):
+                    name += f'_{metric_unit}'
+                number = int(value) if isinstance(value, (bool, int)) else float(value)
+                sample = f'{name}{{{labels}}} {number!r}'
+            else:
+                metric_unit = None
+                name = f'liquidctl_{id_}_info'
+                sample = f'{name}{{{labels},value="{self._escape(value)}"}} 1'
+            family = self._families.setdefault(name, (metric_unit, key, []))
+            family[2].append(sample)
+
+    def close(self):
+        lines = []
+        for name, (unit, help_text, samples) in self._families.items():
+            lines.append(f'# TYPE {name} gauge')
+            if unit:
+                lines.append(f'# UNIT {name} {unit}')
+            lines.append(f'# HELP {name} {self._escape(help_text)}')
+            lines.extend(samples)
+        lines.append('# EOF')
+        print('\n'.join(lines), flush=True)
+
+
+_STATUS_WRITERS = {
+    'jsonl': _JsonLinesWriter,
+    'csv': _CsvWriter,
+    'openmetrics': _OpenMetricsWriter,
+}
+
+
+def _select_devices(devices, opts):
+    """Apply the selection options in `opts` to already found `devices`."""
+
+    def match_texts(dev):
+        # same texts as when matching on the bus (e.g. aliases of some drivers)
+        texts = getattr(type(dev), '_match_texts', None)
+        return texts(dev.description) if texts else [dev.description.lower()]
+
+    def matches(dev):
+        if 'vendor' in opts and dev.vendor_id != opts['vendor']:
+            return False
+        if 'product' in opts and dev.product_id != opts['product']:
+            return False
+        if 'release' in opts and dev.release_number != opts['release']:
+            return False
+        if 'bus' in opts and dev.bus != opts['bus']:
+            return False
+        if 'address' in opts and str(dev.address).lower() != opts['address'].lower():
+            return False
+        if 'usb_port' in opts and dev.port != opts['usb_port']:
+            return False
+        if 'match' in opts and not any(opts['match'].lower() in text
+                                       for text in match_texts(dev)):
+            return False
+        if 'serial' in opts:
+            try:
+                return dev.serial_number == opts['serial']
+            except Exception:
+                return False
+        return True
+
+    selected = [dev for dev in devices if matches(dev)]
+    if 'pick' in opts:
+        selected = selected[opts['pick']:opts['pick'] + 1]
+    return selected
+
+
+def _read_batch(args, errors):
+    """Read and parse the batch commands, returning (line number, args, opts) tuples."""
+
+    path = args['<file>']
+    try:
+        if not path or path == '-':
+            text = sys.stdin.read()
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+    except OSError as err:
+        errors.log(f'could not read {path}', err=err, show_err=True)
+        return []
+
+    commands = []
+    for num, line in enumerate(text.splitlines(), start=1):
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as err:
+            errors.log(f'line {num}: {err}')
+            continue
+        if argv and argv[0] == 'liquidctl':
+            argv = argv[1:]
+        if not argv:
+            continue
+        try:
+            line_args = docopt(__doc__, argv=argv, help=False)
+        except DocoptExit:
+            errors.log(f'line {num}: invalid command: {line.strip()}')
+            continue
+        if line_args['batch'] or line_args['list'] or line_args['apply']:
+            errors.log(f'line {num}: command not supported in batch mode')
+            continue
+        if line_args['--watch']:
+            errors.log(f'line {num}: --watch is not supported in batch mode')
+            continue
+        unsupported = [opt for opt in _BATCH_ONLY_OPTIONS if line_args[opt]]
+        if unsupported:
+            errors.log(f'line {num}: {unsupported[0]} can only be passed to the batch command')
+            continue
+        # unset flags are also parsed, as False; they must not override the batch options
+        line_opts = {opt: val for opt, val in _make_opts(line_args).items() if val is not False}
+        commands.append((num, line_args, line_opts))
+    return commands
+
+
+def _run_batch(args, opts, find_devices, jobs, errors, transcript=None):
+    """Run many commands, but only enumerate and connect to each device once."""
+
+    commands = _read_batch(args, errors)
+    if not errors.is_empty():
+        # don't touch any device if some command is invalid
+        return errors.exit_code()
+
+    # the options of the batch command itself apply to all devices and commands
+    devices = list(find_devices(**opts))
+    connected = []
+    failed = set()
+    obj_buf = []
+
+    try:
+        for num, line_args, line_opts in commands:
+            # batch-only options that also affect the commands themselves
+            line_args = {**line_args, '--status-ttl': args['--status-ttl']}
+            filters = {opt: val for opt, val in line_opts.items() if opt in _FILTER_OPTIONS}
+            cmd_opts = {**opts, **line_opts}
+            selected = _select_devices(devices, filters)
+
+            if len(selected) > 1 and not (line_args['status'] or line_args['all']):
+                errors.log(f'line {num}: multiple devices available, use filters to select one')
+                continue
+            elif len(selected) == 0:
+                errors.log(f'line {num}: no device matches available drivers and selection '
+                           'criteria')
+                continue
+
+            for dev in selected:
+                if id(dev) in failed:
+                    errors.log(f'line {num}: {dev.description}: skipped, could not connect')
+            selected = [dev for dev in selected if id(dev) not in failed]
+
+            def job(dev):
+                if not any(dev is x for x in connected):
+                    try:
+                        dev.connect(**cmd_opts)
+                    except Exception:
+                        failed.add(id(dev))
+                        raise
+                    connected.append(dev)
+                return _run_device_operation(dev, line_args, cmd_opts, transcript)
+
+            for dev, result in _run_device_jobs(job, selected, jobs):
+                if isinstance(result, Exception):
+                    _log_device_error(errors, dev, result)
+                else:
+                    _output_status(dev, line_args, result, obj_buf, json_output=args['--json'])
+    finally:
+        for dev in reversed(connected):
+            try:
+                dev.disconnect(**opts)
+            except Exception as err:
+                _log_device_error(errors, dev, err)
+
+    _save_transcript(transcript, args, errors)
+
+    if errors.is_empty() and args['--json']:
+        _print_json(obj_buf)
+
+    return errors.exit_code()
+
+
+def _load_transcript(args, errors):
+    from liquidctl.replay import Transcript
+
+    record = bool(args['--record'])
+    path = args['--replay']
+    if not path:
+        return Transcript(record=record)
+    try:
+        return Transcript.load(path, record=record)
+    except FileNotFoundError:
+        # e.g. before the first recording, when --record and --replay are the same file
+        _LOGGER.warning('%s does not exist, nothing to replay', path)
+        return Transcript(record=record)
+    except (OSError, KeyError, ValueError) as err:
+        errors.log(f'could not load {path}', err=err, show_err=True)
+        return None
+
+
+def _save_transcript(transcript, args, errors):
+    if not (transcript and args['--record']):
+        return
+    try:
+        transcript.save(args['--record'])
+    except OSError as err:
+        errors.log(f'could not save {args["--record"]}', err=err, show_err=True)
+
+
 def _make_opts(args):
     opts = {}
     for arg, val in args.items():
@@ -304,6 +713,11 @@ def _make_opts(args):
 
 
 def _log_env_infos():
+    import locale
+    import platform
+    import re
+    from importlib.metadata import PackageNotFoundError, distribution, version
+
     _LOGGER.debug('script: %s', sys.argv[0])
     _LOGGER.debug('version: %s', __version__)
     _LOGGER.debug('platform: %s', platform.platform())
@@ -325,6 +739,33 @@ def _log_env_infos():
             _LOGGER.debug('with %s: version n/a (%s)', name, err)
 
 
+def _make_log_formatter(log_fmt, stream):
+    # same conditions as colorlog, but without importing it when colors aren't used
+    if 'FORCE_COLOR' not in os.environ and ('NO_COLOR' in os.environ or not stream.isatty()):
+        return logging.Formatter(fmt=log_fmt.replace('%(log_color)s', ''))
+
+    import colorlog
+
+    if sys.platform == 'win32':
+        log_colors = {
+            'DEBUG': f'bold_blue',
+            'INFO': f'bold_purple',
+            'WARNING': 'yellow,bold',
+            'ERROR': 'red,bold',
+            'CRITICAL': 'red,bold,bg_white',
+        }
+    else:
+        log_colors = {
+            'DEBUG': f'blue',
+            'INFO': f'purple',
+            'WARNING': 'yellow,bold',
+            'ERROR': 'red,bold',
+            'CRITICAL': 'red,bold,bg_white',
+        }
+
+    return colorlog.TTYColoredFormatter(fmt=log_fmt, stream=stream, log_colors=log_colors)
+
+
 class _ErrorAcc:
     __slots__ = ['_errors']
 
@@ -337,7 +778,7 @@ class _ErrorAcc:
             # log the err with traceback before reporting it properly, this time
             # without traceback; this puts error messages are at the bottom of the
             # output, where most users first look for them
-            _LOGGER.info('detailed error: %s: %r', msg, err, *args, exc_info=True)
+            _LOGGER.info('detailed error: %s: %r', msg, err, *args, exc_info=err)
 
         if show_err and err:
             _LOGGER.error('%s: %r', msg, err, *args)
@@ -351,11 +792,211 @@ class _ErrorAcc:
         return not bool(self._errors)
 
 
+def _run_apply(args, opts, find_devices, errors):
+    """Apply a spec of desired device states, skipping unchanged settings."""
+    from liquidctl import apply
+
+    path = args['<file>']
+    try:
+        entries = apply.load_spec(path)
+        plans = [(apply.selection_filters(entry), entry.get('options', {}), apply.plan(entry))
+                 for entry in entries]
+    except (OSError, KeyError, TypeError, ValueError) as err:
+        errors.log(f'could not load {path}', err=err, show_err=True)
+        return errors.exit_code()
+
+    devices = list(find_devices(**opts))
+    obj_buf = []
+
+    for num, (filters, options, ops) in enumerate(plans):
+        selected = _select_devices(devices, filters)
+        if len(selected) != 1:
+            what = 'no device matches' if not selected else 'multiple devices match'
+            errors.log(f'spec device #{num}: {what} the selection criteria')
+            continue
+        dev = selected[0]
+
+        state = apply.AppliedState(dev)
+        last = {} if args['--force'] else state.load()
+        todo = apply.pending(ops, last)
+        # also forget about settings that have been removed from the spec
+        fingerprints = {op.key: op.fingerprint for op in ops if op not in todo}
+        applied = []
+
+        if todo:
+            _LOGGER.debug('device: %s', dev.description)
+            try:
+                with dev.connect(**{**opts, **options}):
+                    for op in todo:
+                        _LOGGER.info('%s: applying %s', dev.description, op.key)
+                        getattr(dev, op.method)(*op.args, **{**opts, **op.kwargs})
+                        fingerprints[op.key] = op.fingerprint
+                        applied.append(op.key)
+            except Exception as err:
+                _log_device_error(errors, dev, err)
+        else:
+            _LOGGER.info('%s: already up to date', dev.description)
+
+        if fingerprints != last:
+            try:
+                state.store(fingerprints)
+            except OSError as err:
+                _LOGGER.warning('%s: could not store the applied state: %r', dev.description, err)
+
+        obj_buf.append({
+            'bus': dev.bus,
+            'address': dev.address,
+            'description': dev.description,
+            'applied': applied,
+            'unchanged': [op.key for op in ops if op not in todo],
+        })
+
+    if errors.is_empty() and args['--json']:
+        _print_json(obj_buf)
+
+    return errors.exit_code()
+
+
+def _device_identity(dev):
+    """Identify a device across reconnections, which can change its address."""
+    try:
+        serial_number = dev.serial_number
+    except Exception:
+        serial_number = None
+    location = serial_number or dev.port or dev.address
+    return (type(dev), dev.vendor_id, dev.product_id, location)
+
+
+def _watch_status(selected, interval, args, opts, find_devices, jobs, errors,
+                  status_writer=None):
+    """Keep `selected` devices connected and output their status every `interval` seconds.
+
+    Samples are taken on a fixed schedule, which does not drift with the time
+    each sample takes; ticks that cannot be kept up with are skipped.  Devices
+    that fail (e.g. because they were unplugged) are disconnected, and searched
+    for again on every tick until they can be reconnected.
+
+    Runs until interrupted.
+    """
+
+    devices = list(selected)
+    connected = set()
+
+    def job(dev):
+        if dev not in connected:
+            dev.connect(**opts)
+            connected.add(dev)
+        timestamp = time.monotonic()
+        return timestamp, _get_status(dev, args, opts)
+
+    def rediscover():
+        found = {_device_identity(dev): dev
+                 for dev in find_devices(**opts)}
+        for i in sorted(lost):
+            dev = found.get(_device_identity(devices[i]))
+            if dev:
+                _LOGGER.info('%s: found again, reconnecting', dev.description)
+                devices[i] = dev
+                lost.discard(i)
+
+    lost = set()
+    start = time.monotonic()
+    tick = 0
+    try:
+        while True:
+            if lost:
+                rediscover()
+            present = [i for i in range(len(devices)) if i not in lost]
+            results = _run_device_jobs(job, [devices[i] for i in present], jobs)
+            for i, (dev, result) in zip(present, results):
+                if isinstance(result, Exception):
+                    _log_device_error(errors, dev, result)
+                    lost.add(i)
+                    if dev in connected:
+                        connected.discard(dev)
+                        try:
+                            dev.disconnect(**opts)
+                        except Exception as err:
+                            _LOGGER.debug('%s: failed to disconnect: %r', dev.description, err)
+                    continue
+                timestamp, status = result
+                if status_writer:
+                    status_writer.write(dev, status, timestamp)
+                elif args['--json']:
+                    _print_json({'timestamp': timestamp, **_dev_status_obj(dev, status)})
+                else:
+                    _print_dev_status(dev, status)
+            sys.stdout.flush()
+
+            tick += 1
+            now = time.monotonic()
+            if now > start + tick * interval:
+                skip = int((now - start) / interval) + 1
+                _LOGGER.debug('sampling took too long, skipping %d ticks', skip - tick)
+                tick = skip
+            time.sleep(start + tick * interval - now)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for dev in connected:
+            try:
+                dev.disconnect(**opts)
+            except Exception as err:
+                _log_device_error(errors, dev, err)
+
+    return errors.exit_code()
+
+
+def _connect_to_daemon(errors):
+    """Return a function to find devices through liquidctld, or None on errors."""
+    from liquidctl.daemon import DaemonClient
+    try:
+        client = DaemonClient()
+    except OSError as err:
+        errors.log('could not connect to liquidctld', err=err, show_err=True)
+        return None
+
+    def find_devices(**opts):
+        filters = {opt: val for opt, val in opts.items() if opt in _FILTER_OPTIONS}
+        return iter(_select_devices(client.find_devices(), filters))
+
+    return find_devices
+
+
+def _log_device_error(errors, dev, err):
+    if isinstance(err, LiquidctlError):
+        errors.log(f'{dev.description}: {err}', err=err)
+    elif isinstance(err, OSError):
+        # each backend API returns a different subtype of OSError (OSError,
+        # usb.core.USBError or PermissionError) for permission issues
+        if err.errno in [errno.EACCES, errno.EPERM]:
+            errors.log(f'{dev.description}: insufficient permissions', err=err)
+        elif err.args == ('open failed', ):
+            errors.log(
+                f'{dev.description}: could not open, possibly due to insufficient permissions',
+                err=err
+            )
+        else:
+            errors.log(f'{dev.description}: unexpected OS error', err=err, show_err=True)
+    else:
+        errors.log(f'{dev.description}: unexpected error', err=err, show_err=True)
+
+
+def _print_version():
+    import platform
+    print(f'liquidctl v{__version__} ({platform.platform()})')
+
+
 def main():
+    if sys.argv[1:] == ['--version']:
+        # parsing the usage takes longer than everything else --version does
+        _print_version()
+        sys.exit(0)
+
     args = docopt(__doc__)
 
     if args['--version']:
-        print(f'liquidctl v{__version__} ({platform.platform()})')
+        _print_version()
         sys.exit(0)
 
     if args['--debug']:
@@ -370,31 +1011,12 @@ def main():
         log_level = logging.WARNING
         sys.tracebacklimit = 0
 
-    if sys.platform == 'win32':
-        log_colors = {
-            'DEBUG': f'bold_blue',
-            'INFO': f'bold_purple',
-            'WARNING': 'yellow,bold',
-            'ERROR': 'red,bold',
-            'CRITICAL': 'red,bold,bg_white',
-        }
-    else:
-        log_colors = {
-            'DEBUG': f'blue',
-            'INFO': f'purple',
-            'WARNING': 'yellow,bold',
-            'ERROR': 'red,bold',
-            'CRITICAL': 'red,bold,bg_white',
-        }
-
-    log_fmtter = colorlog.TTYColoredFormatter(fmt=log_fmt, stream=sys.stderr,
-                                              log_colors=log_colors)
-
     log_handler = logging.StreamHandler()
-    log_handler.setFormatter(log_fmtter)
+    log_handler.setFormatter(_make_log_formatter(log_fmt, log_handler.stream))
     logging.basicConfig(level=log_level, handlers=[log_handler])
 
-    _log_env_infos()
+    if args['--debug']:
+        _log_env_infos()
 
     if __name__ == '__main__':
         _LOGGER.warning('python -m liquidctl.cli is deprecated, prefer python -m liquidctl')
@@ -411,19 +1033,97 @@ def main():
     filter_count = sum(1 for opt in opts if opt in _FILTER_OPTIONS)
     device_id = None
 
+    # reuse the saved device inventory when nothing has been plugged or
+    # unplugged; --no-cache discards and rebuilds it
+    find_opts = {
+        'use_cache': True,
+        'refresh_cache': args['--no-cache'],
+        'concurrent': args['--concurrent-buses'],
+    }
+
+    try:
+        jobs = int(args['--jobs'] or 1)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        errors.log('--jobs must be a number of at least 1')
+        return errors.exit_code()
+
+    interval = None
+    if args['--watch']:
+        try:
+            interval = float(args['--watch'])
+        except ValueError:
+            interval = 0
+        if not args['status'] or not interval > 0:
+            errors.log('--watch requires status and a positive interval')
+            return errors.exit_code()
+
+    if args['--status-ttl']:
+        # parsed once, here, and used by every status read
+        try:
+            args['--status-ttl'] = float(args['--status-ttl'])
+        except ValueError:
+            args['--status-ttl'] = -1
+        if not args['--status-ttl'] >= 0:
+            errors.log('--status-ttl must be a number of seconds, and not negative')
+            return errors.exit_code()
+
+    status_writer = None
+    if args['--format']:
+        fmt = args['--format'].lower()
+        if not args['status'] or fmt not in _STATUS_WRITERS:
+            errors.log(f'--format requires status and one of: {", ".join(_STATUS_WRITERS)}')
+            return errors.exit_code()
+        if args['--json']:
+            errors.log('--format cannot be combined with --json')
+            return errors.exit_code()
+        if args['--watch'] and fmt == 'openmetrics':
+            errors.log('--format openmetrics cannot be combined with --watch')
+            return errors.exit_code()
+        status_writer = _STATUS_WRITERS[fmt](timestamps=bool(args['--watch']))
+
+    if args['--daemon']:
+        find_devices = _connect_to_daemon(errors)
+        if not find_devices:
+            return errors.exit_code()
+    else:
+        find_devices = functools.partial(find_liquidctl_devices, **find_opts)
+
+    transcript = None
+    if args['--record'] or args['--replay']:
+        if not (args['initialize'] or args['set'] or args['batch']):
+            errors.log('--record and --replay require initialize, set or batch')
+            return errors.exit_code()
+        if args['--daemon']:
+            errors.log('--record and --replay are not supported with --daemon')
+            return errors.exit_code()
+        transcript = _load_transcript(args, errors)
+        if not transcript:
+            return errors.exit_code()
+
+    if args['batch']:
+        if args['--device']:
+            errors.log('-d/--device is not supported in batch mode, prefer --match')
+            return errors.exit_code()
+        return _run_batch(args, opts, find_devices, jobs, errors, transcript)
+
+    if args['apply']:
+        return _run_apply(args, opts, find_devices, errors)
+
     if not args['--device']:
-        selected = list(find_liquidctl_devices(**opts))
+        selected = list(find_devices(**opts))
     else:
         _LOGGER.warning('-d/--device is deprecated, prefer --match or other selection options')
         device_id = int(args['--device'])
         no_filters = {opt: val for opt, val in opts.items() if opt not in _FILTER_OPTIONS}
-        compat = list(find_liquidctl_devices(**no_filters))
+        compat = list(find_devices(**no_filters))
         if device_id < 0 or device_id >= len(compat):
             errors.log('device index out of bounds')
             return errors.exit_code()
         if filter_count:
             # check that --device matches other filter criteria
-            matched_devs = [dev.device for dev in find_liquidctl_devices(**opts)]
+            matched_devs = [dev.device for dev in find_devices(**opts)]
             if compat[device_id].device not in matched_devs:
                 errors.log('device index does not match remaining selection criteria')
                 return errors.exit_code()
@@ -447,55 +1147,32 @@ def main():
         errors.log('no device matches available drivers and selection criteria')
         return errors.exit_code()
 
+    if args['--watch']:
+        return _watch_status(selected, interval, args, opts, find_devices, jobs, errors,
+                             status_writer)
+
     # for json
     obj_buf = []
 
-    for dev in selected:
-        _LOGGER.debug('device: %s', dev.description)
-        try:
-            with dev.connect(**opts):
-                if args['initialize']:
-                    status = dev.initialize(**opts)
-                    if args['--json']:
-                        obj_buf.append(_dev_status_obj(dev, status))
-                    else:
-                        _print_dev_status(dev, status)
-                elif args['status']:
-                    status = dev.get_status(**opts)
-                    if args['--json']:
-                        obj_buf.append(_dev_status_obj(dev, status))
-                    else:
-                        _print_dev_status(dev, status)
-                elif args['set'] and args['speed']:
-                    _device_set_speed(dev, args, **opts)
-                elif args['set'] and args['color']:
-                    _device_set_color(dev, args, **opts)
-                elif args['set'] and args['screen']:
-                    _device_set_screen(dev, args, **opts)
-                else:
-                    assert False, 'unreachable'
-        except LiquidctlError as err:
-            errors.log(f'{dev.description}: {err}', err=err)
-        except OSError as err:
-            # each backend API returns a different subtype of OSError (OSError,
-            # usb.core.USBError or PermissionError) for permission issues
-            if err.errno in [errno.EACCES, errno.EPERM]:
-                errors.log(f'{dev.description}: insufficient permissions', err=err)
-            elif err.args == ('open failed', ):
-                errors.log(
-                    f'{dev.description}: could not open, possibly due to insufficient permissions',
-                    err=err
-                )
-            else:
-                errors.log(f'{dev.description}: unexpected OS error', err=err, show_err=True)
-        except Exception as err:
-            errors.log(f'{dev.description}: unexpected error', err=err, show_err=True)
+    def job(dev):
+        with dev.connect(**opts):
+            return _run_device_operation(dev, args, opts, transcript)
+
+    for dev, result in _run_device_jobs(job, selected, jobs):
+        if isinstance(result, Exception):
+            _log_device_error(errors, dev, result)
+        elif status_writer:
+            status_writer.write(dev, result)
+        else:
+            _output_status(dev, args, result, obj_buf, json_output=args['--json'])
+
+    if status_writer:
+        status_writer.close()
+
+    _save_transcript(transcript, args, errors)
 
     if errors.is_empty() and args['--json']:
-        # use __str__ for values that cannot be directly serialized to JSON
-        # (e.g. enums)
-        print(json.dumps(obj_buf, ensure_ascii=(os.getenv('LANG', None) == 'C'),
-                         default=lambda x: str(x)))
+        _print_json(obj_buf)
 
     return errors.exit_code()
 
@@ -0,0 +1,579 @@
+"""liquidctld – share liquidctl devices between programs.
+
+Usage:
+  liquidctld [options]
+  liquidctld --help
+  liquidctld --version
+
+Options:
+  --socket <path>              Listen on this Unix socket (see: FILES)
+  --status-ttl <seconds>       Reuse a device status for this long [default: 1]
+  -m, --match <substring>      Only manage devices whose description matches
+  -v, --verbose                Output additional information
+  -g, --debug                  Show debug information on stderr
+  --version                    Display the version number
+  --help                       Show this message
+
+Most devices cannot be safely accessed by more than one program at a time,
+since their replies can be consumed by the wrong program.  liquidctld owns
+the devices and serializes all operations on each of them, while other
+programs, including `liquidctl --daemon`, talk to it through a Unix socket.
+
+The protocol is JSON-RPC 2.0, with one request or response per line.  The
+methods are `list`, which returns the managed devices, and the `initialize`,
+`get_status` and `set_*` driver methods, which take the `device` id from
+`list`, positional `args` and keyword `kwargs`.  `get_status` also accepts a
+`max_age` in seconds, which overrides `--status-ttl`; status reads are
+answered from a cache, which any other operation on the device invalidates.
+
+Devices are connected to on first use, and remain connected.  Devices that
+are plugged or unplugged while the daemon is running are picked up.
+
+Files:
+  The socket is created in the first runtime directory used by liquidctl
+  (e.g. $XDG_RUNTIME_DIR/liquidctl/liquidctld.sock), unless --socket or the
+  LIQUIDCTLD_SOCKET environment variable are set.  Anyone who can connect to
+  it can control all managed devices.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import contextlib
+import datetime
+import errno
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from functools import lru_cache
+
+from liquidctl.driver.base import BaseDriver
+from liquidctl.error import LiquidctlError
+from liquidctl.keyval import get_runtime_dirs
+
+_LOGGER = logging.getLogger(__name__)
+
+_SOCKET_NAME = "liquidctld.sock"
+
+_DEVICE_METHODS = [
+    "initialize",
+    "get_status",
+    "set_fixed_speed",
+    "set_speed_profile",
+    "set_color",
+    "set_screen",
+]
+
+# JSON-RPC 2.0 error codes
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+_DEVICE_ERROR = -32000
+_NO_SUCH_DEVICE = -32001
+
+
+class RemoteError(LiquidctlError):
+    """An operation failed in liquidctld.
+
+    Unstable API.
+    """
+
+    def __init__(self, message, error_type=None):
+        self.message = message
+        self.error_type = error_type
+
+    def __str__(self):
+        return self.message
+
+
+def socket_paths():
+    """Return the candidate paths for the daemon socket, in order of preference."""
+
+    env = os.getenv("LIQUIDCTLD_SOCKET")
+    if env:
+        return [env]
+    return [os.path.join(base, _SOCKET_NAME) for base in get_runtime_dirs()]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.timedelta):
+        return {"timedelta": value.total_seconds()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "timedelta" in value:
+        return datetime.timedelta(seconds=value["timedelta"])
+    return value
+
+
+def _dumps(obj):
+    # use __str__ for values that cannot be directly serialized (e.g. enums)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+class _ManagedDevice:
+    __slots__ = ["device", "lock", "connected", "removed", "statuses"]
+
+    def __init__(self, device):
+        self.device = device
+        self.lock = threading.Lock()
+        self.connected = False
+        self.removed = False
+        self.statuses = {}
+
+
+class DeviceServer:
+    """Own devices and handle JSON-RPC requests for them.
+
+    Transport agnostic; see `serve` for the Unix socket server.
+
+    Unstable API.
+    """
+
+    def __init__(self, status_ttl=1.0):
+        self._status_ttl = status_ttl
+        self._devices = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add_device(self, dev):
+        """Start managing `dev`, and return its id."""
+
+        with self._lock:
+            dev_id = self._next_id
+            self._next_id += 1
+            self._devices[dev_id] = _ManagedDevice(dev)
+        _LOGGER.info("managing #%d: %s", dev_id, dev.description)
+        return dev_id
+
+    def remove_device(self, dev):
+        """Stop managing `dev`, disconnecting from it if necessary."""
+
+        with self._lock:
+            found = [(k, v) for k, v in self._devices.items() if v.device is dev]
+            for dev_id, _ in found:
+                del self._devices[dev_id]
+        for dev_id, managed in found:
+            _LOGGER.info("no longer managing #%d: %s", dev_id, dev.description)
+            with managed.lock:
+                managed.removed = True
+                self._disconnect(managed)
+
+    def close(self):
+        """Disconnect from all devices."""
+
+        with self._lock:
+            managed = list(self._devices.values())
+            self._devices.clear()
+        for item in managed:
+            with item.lock:
+                item.removed = True
+                self._disconnect(item)
+
+    def handle_line(self, line):
+        """Handle a request line and return the response line."""
+
+        try:
+            request = json.loads(line)
+        except ValueError as err:
+            return _dumps(_error_response(None, _PARSE_ERROR, f"parse error: {err}"))
+        return _dumps(self.handle(request))
+
+    def handle(self, request):
+        """Handle a decoded request and return the response object."""
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, _INVALID_REQUEST, "invalid request")
+        req_id = request.get("id")
+        method = request["method"]
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            return _error_response(req_id, _INVALID_PARAMS, "params must be an object")
+
+        if method == "list":
+            return {"jsonrpc": "2.0", "id": req_id, "result": self._list()}
+        if method not in _DEVICE_METHODS:
+            return _error_response(req_id, _METHOD_NOT_FOUND, f"method not found: {method}")
+
+        dev_id = params.get("device")
+        managed = self._devices.get(dev_id) if isinstance(dev_id, int) else None
+        if managed is None:
+            return _error_response(req_id, _NO_SUCH_DEVICE, "no such device")
+        args = params.get("args", [])
+        kwargs = params.get("kwargs", {})
+        max_age = params.get("max_age")
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            message = "args and kwargs must be a list and an object"
+            return _error_response(req_id, _INVALID_PARAMS, message)
+
+        try:
+            result = self._call(managed, method, args, kwargs, max_age)
+        except Exception as err:
+            _LOGGER.info("%s failed: %r", method, err, exc_info=err)
+            data = {"type": type(err).__name__}
+            if isinstance(err, OSError) and err.errno is not None:
+                data["errno"] = err.errno
+            return _error_response(req_id, _DEVICE_ERROR, str(err) or repr(err), data)
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    def _list(self):
+        with self._lock:
+            items = list(self._devices.items())
+        infos = []
+        for dev_id, managed in items:
+            dev = managed.device
+            try:
+                serial_number = dev.serial_number
+            except Exception:
+                serial_number = None
+            infos.append(
+                {
+                    "device": dev_id,
+                    "description": dev.description,
+                    "vendor_id": dev.vendor_id,
+                    "product_id": dev.product_id,
+                    "release_number": dev.release_number,
+                    "serial_number": serial_number,
+                    "bus": dev.bus,
+                    "address": dev.address,
+                    "port": dev.port,
+                    "driver": type(dev).__name__,
+                }
+            )
+        return infos
+
+    def _call(self, managed, method, args, kwargs, max_age):
+        # only one operation at a time on each device
+        with managed.lock:
+            if managed.removed:
+                raise OSError(errno.ENODEV, "device has been removed")
+            if not managed.connected:
+                managed.device.connect(**kwargs)
+                managed.connected = True
+
+            if method == "get_status":
+                key = json.dumps(kwargs, sort_keys=True, default=str)
+                max_age = self._status_ttl if max_age is None else max_age
+                cached = managed.statuses.get(key)
+                if cached and time.monotonic() - cached[0] <= max_age:
+                    return cached[1]
+                status = self._encode_status(managed.device.get_status(max_age=max_age, **kwargs))
+                managed.statuses[key] = (time.monotonic(), status)
+                return status
+
+            # any other operation can change the status
+            managed.statuses.clear()
+            result = getattr(managed.device, method)(*args, **kwargs)
+            if method == "initialize":
+                return self._encode_status(result)
+            return None
+
+    @staticmethod
+    def _encode_status(status):
+        if not status:
+            return []
+        return [[key, _encode_value(value), unit] for key, value, unit in status]
+
+    @staticmethod
+    def _disconnect(managed):
+        if not managed.connected:
+            return
+        managed.connected = False
+        try:
+            managed.device.disconnect()
+        except Exception as err:
+            _LOGGER.warning("%s: failed to disconnect: %r", managed.device.description, err)
+
+
+def _error_response(req_id, code, message, data=None):
+    error = {"code": code, "message": message}
+    if data:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": req_id, "error": error}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.wfile.write(self.server.device_server.handle_line(line))
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(device_server, path):
+    """Create a server for `device_server` listening on the Unix socket `path`.
+
+    Remove `path` first if it is a stale socket.  The caller is responsible
+    for calling `serve_forever` and, later, `shutdown` and `server_close`.
+    """
+
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            _LOGGER.debug("removing stale socket %s", path)
+            os.unlink(path)
+        else:
+            raise OSError(f"liquidctld is already listening on {path}")
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    server = _UnixServer(path, _RequestHandler)
+    server.device_server = device_server
+    return server
+
+
+class DeviceProxy(BaseDriver):
+    """A device managed by liquidctld.
+
+    Unstable API.
+    """
+
+    def __init__(self, client, info):
+        self._client = client
+        self._info = info
+        # the "handle" of a proxy is the id of the device in liquidctld
+        self.device = info["device"]
+
+    def connect(self, **kwargs):
+        # liquidctld connects to devices on first use, and keeps them connected
+        return self
+
+    def disconnect(self, **kwargs):
+        pass
+
+    def initialize(self, **kwargs):
+        status = self._call("initialize", [], kwargs)
+        return [(key, _decode_value(value), unit) for key, value, unit in status]
+
+    def get_status(self, max_age=None, **kwargs):
+        status = self._client.call("get_status", device=self.device, kwargs=kwargs, max_age=max_age)
+        return [(key, _decode_value(value), unit) for key, value, unit in status]
+
+    def set_fixed_speed(self, channel, duty, **kwargs):
+        self._call("set_fixed_speed", [channel, duty], kwargs)
+
+    def set_speed_profile(self, channel, profile, **kwargs):
+        self._call("set_speed_profile", [channel, [list(x) for x in profile]], kwargs)
+
+    def set_color(self, channel, mode, colors, **kwargs):
+        self._call("set_color", [channel, mode, [list(x) for x in colors]], kwargs)
+
+    def set_screen(self, channel, mode, value, **kwargs):
+        self._call("set_screen", [channel, mode, value], kwargs)
+
+    def _call(self, method, args, kwargs):
+        return self._client.call(method, device=self.device, args=args, kwargs=kwargs)
+
+    @property
+    def description(self):
+        return self._info["description"]
+
+    @property
+    def vendor_id(self):
+        return self._info["vendor_id"]
+
+    @property
+    def product_id(self):
+        return self._info["product_id"]
+
+    @property
+    def release_number(self):
+        return self._info["release_number"]
+
+    @property
+    def serial_number(self):
+        return self._info["serial_number"]
+
+    @property
+    def bus(self):
+        return self._info["bus"]
+
+    @property
+    def address(self):
+        return self._info["address"]
+
+    @property
+    def port(self):
+        port = self._info["port"]
+        return tuple(port) if port is not None else None
+
+
+@lru_cache(maxsize=None)
+def _proxy_class(driver):
+    # named after the real driver, so that proxies are listed like the devices
+    return type(driver, (DeviceProxy,), {"__module__": __name__})
+
+
+class DaemonClient:
+    """Client for liquidctld.
+
+    Can be shared between threads, but requests are sent one at a time.
+
+    Unstable API.
+    """
+
+    def __init__(self, path=None, timeout=None):
+        paths = [path] if path else socket_paths()
+        err = None
+        for candidate in paths:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(candidate)
+            except OSError as e:
+                sock.close()
+                err = e
+                continue
+            _LOGGER.debug("connected to liquidctld at %s", candidate)
+            self._sock = sock
+            self._file = sock.makefile("rwb")
+            self._lock = threading.Lock()
+            self._next_id = 0
+            return
+        raise err
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def call(self, method, **params):
+        """Call `method` and return its result, or raise the corresponding error."""
+
+        with self._lock:
+            self._next_id += 1
+            req_id = self._next_id
+            request = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
+            self._file.write(_dumps(request))
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("liquidctld closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            _raise_remote(response["error"])
+        return response["result"]
+
+    def find_devices(self):
+        """Return a `DeviceProxy` for each device managed by liquidctld."""
+
+        return [_proxy_class(info["driver"])(self, info) for info in self.call("list")]
+
+
+def _raise_remote(error):
+    data = error.get("data", {})
+    if error["code"] == _NO_SUCH_DEVICE:
+        raise OSError(errno.ENODEV, error["message"])
+    if "errno" in data:
+        # keep the CLI able to tell permission errors apart
+        raise OSError(data["errno"], error["message"])
+    raise RemoteError(error["message"], error_type=data.get("type"))
+
+
+def _watch_devices(device_server, watcher):
+    from liquidctl.driver.watcher import ADDED
+
+    try:
+        for action, dev in watcher:
+            if action == ADDED:
+                device_server.add_device(dev)
+            else:
+                device_server.remove_device(dev)
+    except Exception as err:
+        _LOGGER.error("stopped watching for devices: %r", err, exc_info=err)
+
+
+def main():
+    from docopt import docopt
+
+    from liquidctl import __version__
+    from liquidctl.driver.watcher import DeviceWatcher
+
+    args = docopt(__doc__)
+
+    if args["--version"]:
+        print(f"liquidctld v{__version__}")
+        return 0
+
+    if args["--debug"]:
+        log_fmt = "[%(levelname)s] (%(module)s) (%(funcName)s): %(message)s"
+        log_level = logging.DEBUG
+    elif args["--verbose"]:
+        log_fmt = "%(levelname)s: %(message)s"
+        log_level = logging.INFO
+    else:
+        log_fmt = "%(levelname)s: %(message)s"
+        log_level = logging.WARNING
+    logging.basicConfig(level=log_level, format=log_fmt)
+
+    if not hasattr(socket, "AF_UNIX"):
+        _LOGGER.error("liquidctld requires Unix domain sockets")
+        return 1
+
+    try:
+        status_ttl = float(args["--status-ttl"])
+        if not status_ttl >= 0:
+            raise ValueError()
+    except ValueError:
+        _LOGGER.error("invalid --status-ttl: %s", args["--status-ttl"])
+        return 1
+
+    path = args["--socket"] or socket_paths()[0]
+    device_server = DeviceServer(status_ttl=status_ttl)
+    filters = {"match": args["--match"]} if args["--match"] else {}
+
+    watcher = DeviceWatcher(**filters)
+    for _, dev in watcher.poll():
+        device_server.add_device(dev)
+    threading.Thread(
+        target=_watch_devices, args=(device_server, watcher), name="liquidctld-watcher", daemon=True
+    ).start()
+
+    try:
+        server = serve(device_server, path)
+    except OSError as err:
+        _LOGGER.error("cannot listen on %s: %s", path, err)
+        device_server.close()
+        return 1
+
+    # also clean up when stopped by a service manager
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    _LOGGER.info("listening on %s", path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        device_server.close()
+        # may have been removed already, e.g. as a stale socket by another instance
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
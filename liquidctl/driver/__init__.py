@@ -18,42 +18,33 @@ Copyright Jonas Malaco and contributors
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
+import importlib
 import sys
+from importlib.util import spec_from_loader
 
 from liquidctl.driver.base import BaseBus, find_all_subclasses
+from liquidctl.driver.inventory import DeviceInventory
 
-# automatically enabled drivers
-from liquidctl.driver import aquacomputer
-from liquidctl.driver import asetek
-from liquidctl.driver import asetek_pro
-from liquidctl.driver import asus_ryujin
-from liquidctl.driver import asus_ryuo
-from liquidctl.driver import aura_led
-from liquidctl.driver import commander_core
-from liquidctl.driver import commander_pro
-from liquidctl.driver import control_hub
-from liquidctl.driver import coolit
-from liquidctl.driver import corsair_hid_psu
-from liquidctl.driver import hydro_platinum
-from liquidctl.driver import kraken2
-from liquidctl.driver import kraken3
-from liquidctl.driver import lianli_uni
-from liquidctl.driver import msi
-from liquidctl.driver import nzxt_epsu
-from liquidctl.driver import rgb_fusion2
-from liquidctl.driver import smart_device
-from liquidctl.driver import ga2_lcd
-
-if sys.platform == 'linux':
-    from liquidctl.driver import ddr4
-    from liquidctl.driver import nvidia
-
-
-def find_liquidctl_devices(pick=None, **kwargs):
+# driver modules are only imported once a device they can handle is found, or
+# when explicitly requested; see liquidctl.driver.registry
+_BUS_MODULES = ['usb', 'smbus'] if sys.platform == 'linux' else ['usb']
+
+# old module names that continue to work for backward compatibility
+_LEGACY_ALIASES = {
+    'kraken_two': 'kraken2',
+    'nzxt_smart_device': 'smart_device',
+    'seasonic': 'nzxt_epsu',
+}
+
+
+def find_liquidctl_devices(pick=None, use_cache=False, refresh_cache=False, concurrent=False,
+                           **kwargs):
     """Find devices and instantiate corresponding liquidctl drivers.
 
-    Probes all buses and drivers that have been loaded at the time of the call
-    and yields driver instances.
+    Probes all buses and drivers that have been loaded at the time of the call,
+    as well as the drivers that ship with liquidctl, and yields driver
+    instances.  Driver modules are only imported once a device they can handle
+    is found.
 
     Filter conditions can be passed through to the buses and drivers via
     `**kwargs`.  A driver instance will be yielded for each compatible device
@@ -61,28 +52,107 @@ def find_liquidctl_devices(pick=None, **kwargs):
 
     If `pick` is passed, only the driver instance for the `(pick + 1)`-th
     matched device will be yielded.
+
+    If `use_cache` is set, buses that support it will reuse a persistent
+    inventory of their devices, as long as no device has been added or removed
+    since it was saved.  Pass `refresh_cache` to discard and rebuild that
+    inventory (unstable).
+
+    If `concurrent` is set, all buses are enumerated at the same time in a
+    thread pool, but devices are still yielded in the same order as they would
+    have been otherwise; with `pick`, the remaining buses are still enumerated
+    (unstable).
     """
-    buses = sorted(find_all_subclasses(BaseBus),
-                   key=lambda x: (x.__module__, x.__name__))
-    num = 0
-    for bus_cls in buses:
-        for dev in bus_cls().find_devices(**kwargs):
-            if pick is not None:
-                if num == pick:
-                    yield dev
-                    return
-                num += 1
+    buses = _find_buses()
+    inventory = DeviceInventory() if use_cache else None
+
+    # the USB buses and the drivers that look up additional USB devices share
+    # a single libusb enumeration (per thread)
+    from liquidctl.driver.usb import _single_usb_enumeration
+
+    def find_devices(bus_cls):
+        bus = bus_cls()
+        with _single_usb_enumeration():
+            if inventory and inventory.supports(bus):
+                yield from inventory.find_devices(bus, refresh=refresh_cache, **kwargs)
             else:
-                yield dev
+                yield from bus.find_devices(**kwargs)
+
+    with _single_usb_enumeration():
+        if concurrent:
+            results = _find_concurrently(find_devices, buses)
+        else:
+            results = map(find_devices, buses)
+        num = 0
+        for devs in results:
+            for dev in devs:
+                if pick is not None:
+                    if num == pick:
+                        yield dev
+                        return
+                    num += 1
+                else:
+                    yield dev
 
 
 __all__ = [
     'find_liquidctl_devices',
 ]
 
-# allow old driver imports to continue to work by manually placing these into
-# the module cache, so import liquidctl.driver.foo does not need to
-# check the filesystem for foo
-sys.modules['liquidctl.driver.kraken_two'] = kraken2
-sys.modules['liquidctl.driver.nzxt_smart_device'] = smart_device
-sys.modules['liquidctl.driver.seasonic'] = nzxt_epsu
+
+def _find_buses():
+    """Import the bus modules and return all buses, in a stable order."""
+    for name in _BUS_MODULES:
+        importlib.import_module(f'{__name__}.{name}')
+    return sorted(find_all_subclasses(BaseBus),
+                  key=lambda x: (x.__module__, x.__name__))
+
+
+def _find_concurrently(find_devices, buses):
+    """Enumerate `buses` in a thread pool, but yield their results in order."""
+    from concurrent.futures import ThreadPoolExecutor
+    if not buses:
+        return
+    with ThreadPoolExecutor(max_workers=len(buses),
+                            thread_name_prefix='liquidctl-bus') as executor:
+        futures = [executor.submit(lambda x: list(find_devices(x)), bus) for bus in buses]
+        for future in futures:
+            yield future.result()
+
+
+def __getattr__(name):
+    # lazily import submodules accessed as attributes of this package, as
+    # they were all eagerly imported before liquidctl 1.17
+    fullname = f'{__name__}.{name}'
+    try:
+        return importlib.import_module(fullname)
+    except ModuleNotFoundError as err:
+        if err.name != fullname:
+            raise
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+
+class _LegacyAliasFinder:
+    """Allow old driver imports to continue to work, without eager imports.
+
+    Implements the finder and loader protocols without inheriting from
+    importlib.abc, which is slow to import.
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        package, _, name = fullname.rpartition('.')
+        if package != __name__ or name not in _LEGACY_ALIASES:
+            return None
+        return spec_from_loader(fullname, self)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        # the import system returns whatever ends up in sys.modules
+        name = module.__name__.rpartition('.')[2]
+        target = importlib.import_module(f'{__name__}.{_LEGACY_ALIASES[name]}')
+        sys.modules[module.__name__] = target
+
+
+sys.meta_path.append(_LegacyAliasFinder())
@@ -0,0 +1,116 @@
+"""Table of the drivers that ship with liquidctl.
+
+Automatically generated by extra/generate-driver-registry.py; do not edit.
+See liquidctl.driver.registry for how this table is used.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# (module, class, bus, vendor id, product id, description, match aliases)
+DRIVERS = [
+    ("aquacomputer", "Aquacomputer", "hid", 0x0c70, 0xf00e, "Aquacomputer D5 Next", ()),
+    ("aquacomputer", "Aquacomputer", "hid", 0x0c70, 0xf00a, "Aquacomputer Farbwerk", ()),
+    ("aquacomputer", "Aquacomputer", "hid", 0x0c70, 0xf010, "Aquacomputer Farbwerk 360", ()),
+    ("aquacomputer", "Aquacomputer", "hid", 0x0c70, 0xf011, "Aquacomputer Octo", ()),
+    ("aquacomputer", "Aquacomputer", "hid", 0x0c70, 0xf00d, "Aquacomputer Quadro", ()),
+    ("asus_ryujin", "AsusRyujin", "hid", 0x0b05, 0x1988, "ASUS Ryujin II 360", ()),
+    ("asus_ryujin", "AsusRyujin", "hid", 0x0b05, 0x1bcb, "ASUS Ryujin III Extreme", ()),
+    ("asus_ryujin", "AsusRyujin", "hid", 0x0b05, 0x1aa2, "ASUS Ryujin III 360", ()),
+    ("asus_ryujin", "AsusRyujin", "hid", 0x0b05, 0x1ade, "ASUS Ryujin III EVA", ()),
+    ("asus_ryujin", "AsusRyujin", "hid", 0x0b05, 0x1ada, "ASUS Ryujin III White", ()),
+    ("asus_ryuo", "AsusRyuo", "hid", 0x0b05, 0x1887, "ASUS Ryuo I 240", ()),
+    ("aura_led", "AuraLed", "hid", 0x0b05, 0x19af, "ASUS Aura LED Controller", ()),
+    ("aura_led", "AuraLed", "hid", 0x0b05, 0x1939, "ASUS Aura LED Controller", ()),
+    ("aura_led", "AuraLed", "hid", 0x0b05, 0x18f3, "ASUS Aura LED Controller", ()),
+    ("commander_core", "CommanderCore", "hid", 0x1b1c, 0x0c1c, "Corsair Commander Core (broken)", ()),
+    ("commander_core", "CommanderCore", "hid", 0x1b1c, 0x0c2a, "Corsair Commander Core XT (broken)", ()),
+    ("commander_core", "CommanderCore", "hid", 0x1b1c, 0x0c32, "Corsair Commander ST (broken)", ()),
+    ("commander_pro", "CommanderPro", "hid", 0x1b1c, 0x0c10, "Corsair Commander Pro", ()),
+    ("commander_pro", "CommanderPro", "hid", 0x1b1c, 0x0c0b, "Corsair Lighting Node Pro", ()),
+    ("commander_pro", "CommanderPro", "hid", 0x1b1c, 0x0c1a, "Corsair Lighting Node Core", ()),
+    ("commander_pro", "CommanderPro", "hid", 0x1b1c, 0x1d00, "Corsair Obsidian 1000D", ()),
+    ("control_hub", "ControlHub", "hid", 0x1e71, 0x2022, "NZXT Control Hub", ()),
+    ("coolit", "Coolit", "hid", 0x1b1c, 0x0c04, "Corsair H110i GT", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c05, "Corsair HX750i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c06, "Corsair HX850i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c07, "Corsair HX1000i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c08, "Corsair HX1200i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c23, "Corsair HX1200i ATX 3.1", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c27, "Corsair HX1200i ATX 3.1 #2", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c0a, "Corsair RM650i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c0b, "Corsair RM750i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c0c, "Corsair RM850i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c0d, "Corsair RM1000i", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c1e, "Corsair HX1000i (2022)", ()),
+    ("corsair_hid_psu", "CorsairHidPsu", "hid", 0x1b1c, 0x1c1f, "Corsair HX1500i", ()),
+    ("ga2_lcd", "GA2LCD", "hid", 0x0416, 0x7395, "Lian Li GA II LCD", ()),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c18, "Corsair Hydro H100i Platinum", ("corsair h100i platinum",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c19, "Corsair Hydro H100i Platinum SE", ("corsair h100i platinum se",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c17, "Corsair Hydro H115i Platinum", ("corsair h115i platinum",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c29, "Corsair Hydro H60i Pro XT", ("corsair h60i pro xt",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c20, "Corsair Hydro H100i Pro XT", ("corsair h100i pro xt",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c21, "Corsair Hydro H115i Pro XT", ("corsair h115i pro xt",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c22, "Corsair Hydro H150i Pro XT", ("corsair h150i pro xt",)),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c35, "Corsair iCUE H100i Elite RGB", ()),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c36, "Corsair iCUE H115i Elite RGB", ()),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c37, "Corsair iCUE H150i Elite RGB", ()),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c40, "Corsair iCUE H100i Elite RGB (White)", ()),
+    ("hydro_platinum", "HydroPlatinum", "hid", 0x1b1c, 0x0c41, "Corsair iCUE H150i Elite RGB (White)", ()),
+    ("kraken2", "Kraken2", "hid", 0x1e71, 0x170e, "NZXT Kraken X (X42, X52, X62 or X72)", ()),
+    ("kraken2", "Kraken2", "hid", 0x1e71, 0x1715, "NZXT Kraken M22", ()),
+    ("kraken3", "KrakenX3", "hid", 0x1e71, 0x2007, "NZXT Kraken X (X53, X63 or X73)", ()),
+    ("kraken3", "KrakenX3", "hid", 0x1e71, 0x2014, "NZXT Kraken X (X53, X63 or X73)", ()),
+    ("kraken3", "KrakenZ3", "hid", 0x1e71, 0x3008, "NZXT Kraken Z (Z53, Z63 or Z73)", ()),
+    ("kraken3", "KrakenZ3", "hid", 0x1e71, 0x300c, "NZXT Kraken 2023 Elite (broken)", ()),
+    ("kraken3", "KrakenZ3", "hid", 0x1e71, 0x300e, "NZXT Kraken 2023", ()),
+    ("kraken3", "KrakenZ3", "hid", 0x1e71, 0x3012, "NZXT Kraken 2024 Elite RGB", ()),
+    ("kraken3", "KrakenZ3", "hid", 0x1e71, 0x3014, "NZXT Kraken 2024 Plus", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0x7750, "Lian Li Uni SL", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa100, "Lian Li Uni SL", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa101, "Lian Li Uni AL", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa102, "Lian Li Uni SL-Infinity", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa103, "Lian Li Uni SL V2", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa104, "Lian Li Uni AL V2", ()),
+    ("lianli_uni", "LianLiUni", "hid", 0x0cf2, 0xa105, "Lian Li Uni SL V2", ()),
+    ("msi", "MpgCooler", "hid", 0x0db0, 0xb130, "MSI MPG Coreliquid K360", ()),
+    ("msi", "MpgCooler", "hid", 0x0db0, 0xca00, "Suspected MSI MPG Coreliquid", ()),
+    ("msi", "MpgCooler", "hid", 0x0db0, 0xca02, "Suspected MSI MPG Coreliquid", ()),
+    ("nzxt_epsu", "NzxtEPsu", "hid", 0x7793, 0x5911, "NZXT E500", ()),
+    ("nzxt_epsu", "NzxtEPsu", "hid", 0x7793, 0x5912, "NZXT E650", ()),
+    ("nzxt_epsu", "NzxtEPsu", "hid", 0x7793, 0x2500, "NZXT E850", ()),
+    ("rgb_fusion2", "RgbFusion2", "hid", 0x048d, 0x5702, "Gigabyte RGB Fusion 2.0 5702 Controller", ()),
+    ("rgb_fusion2", "RgbFusion2", "hid", 0x048d, 0x8297, "Gigabyte RGB Fusion 2.0 8297 Controller", ()),
+    ("smart_device", "H1V2", "hid", 0x1e71, 0x2015, "NZXT H1 V2", ()),
+    ("smart_device", "Nzxt2023RgbController", "hid", 0x1e71, 0x2012, "NZXT 2023 RGB Controller", ()),
+    ("smart_device", "Nzxt2023RgbController", "hid", 0x1e71, 0x2021, "NZXT 2023 RGB Controller", ()),
+    ("smart_device", "SmartDevice", "hid", 0x1e71, 0x1714, "NZXT Smart Device (V1)", ()),
+    ("smart_device", "SmartDevice", "hid", 0x1e71, 0x1711, "NZXT Grid+ V3", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2006, "NZXT Smart Device V2", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x200d, "NZXT Smart Device V2", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x200f, "NZXT Smart Device V2", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2001, "NZXT HUE 2", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2002, "NZXT HUE 2 Ambient", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2009, "NZXT RGB & Fan Controller", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x200e, "NZXT RGB & Fan Controller", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2010, "NZXT RGB & Fan Controller", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2011, "NZXT RGB & Fan Controller (3+6 channels)", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2019, "NZXT RGB & Fan Controller (3+6 channels)", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x201f, "NZXT RGB & Fan Controller (3+6 channels)", ()),
+    ("smart_device", "SmartDevice2", "hid", 0x1e71, 0x2020, "NZXT RGB & Fan Controller (3+6 channels)", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c02, "Corsair Hydro H80i GT", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c03, "Corsair Hydro H100i GTX", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c07, "Corsair Hydro H110i GTX", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c08, "Corsair Hydro H80i v2", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c09, "Corsair Hydro H100i v2", ()),
+    ("asetek", "Hydro690Lc", "usb", 0x1b1c, 0x0c0a, "Corsair Hydro H115i", ()),
+    ("asetek", "Legacy690Lc", "usb", 0x2433, 0xb200, "Asetek 690LC (assuming NZXT Kraken X)", ()),
+    ("asetek", "Modern690Lc", "usb", 0x2433, 0xb200, "Asetek 690LC (assuming EVGA CLC)", ()),
+    ("asetek_pro", "HydroPro", "usb", 0x1b1c, 0x0c12, "Corsair Hydro H150i Pro", ()),
+    ("asetek_pro", "HydroPro", "usb", 0x1b1c, 0x0c13, "Corsair Hydro H115i Pro", ()),
+    ("asetek_pro", "HydroPro", "usb", 0x1b1c, 0x0c15, "Corsair Hydro H100i Pro", ()),
+    ("ddr4", "Ddr4Temperature", "smbus", None, None, None, ()),
+    ("ddr4", "VengeanceRgb", "smbus", None, None, None, ()),
+    ("nvidia", "EvgaPascal", "smbus", None, None, None, ()),
+    ("nvidia", "RogTuring", "smbus", None, None, None, ()),
+]
@@ -59,7 +59,7 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 # uses the psf/black style
 
-import logging, time, errno
+import logging, math, time, errno
 
 from liquidctl.driver.usb import UsbHidDriver
 from liquidctl.error import NotSupportedByDriver, NotSupportedByDevice
@@ -212,6 +212,10 @@ class Aquacomputer(UsbHidDriver):
 
         self._device_info = device_info
 
+        # all input reports are status reports, with the same report ID
+        self._DISPATCH_REPORT_LENGTH = device_info["status_report_length"]
+        self._DISPATCH_KEY_LENGTH = 1
+
     def initialize(self, **kwargs):
         """Initialize the device and the driver.
 
@@ -229,7 +233,7 @@ class Aquacomputer(UsbHidDriver):
 
         return [("Firmware version", fw, ""), ("Serial number", serial_number, "")]
 
-    def _get_status_directly(self):
+    def _get_status_directly(self, max_age=None):
         def _read_temp_sensors(offsets_key, labels_key):
             for idx, temp_sensor_offset in enumerate(self._device_info.get(offsets_key, [])):
                 temp_sensor_value = u16be_from(msg, temp_sensor_offset)
@@ -241,7 +245,7 @@ class Aquacomputer(UsbHidDriver):
                     )
                     sensor_readings.append(temp_sensor_reading)
 
-        msg = self._read()
+        msg = self._read(max_age=max_age)
 
         sensor_readings = []
 
@@ -399,10 +403,12 @@ class Aquacomputer(UsbHidDriver):
 
         return sensor_readings
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         """Get a status report.
 
-        Returns a list of `(property, value, unit)` tuples.
+        Returns a list of `(property, value, unit)` tuples.  If `max_age` is
+        passed, a status report that the device pushed up to `max_age` seconds
+        ago can be used.
         """
 
         if self._hwmon and not direct_access:
@@ -414,7 +420,7 @@ class Aquacomputer(UsbHidDriver):
                 "directly reading the status despite %s kernel driver", self._hwmon.driver
             )
 
-        return self._get_status_directly()
+        return self._get_status_directly(max_age)
 
     def set_speed_profile(self, channel, profile, **kwargs):
         if (
@@ -539,7 +545,14 @@ class Aquacomputer(UsbHidDriver):
         self._read_device_statics()
         return self._serial
 
-    def _read(self, clear_first=True):
+    def _read(self, clear_first=True, max_age=None):
+        if max_age is not None:
+            self._start_dispatcher()
+        if self._dispatcher():
+            # any report will do if not clearing first, e.g. for the device statics
+            return self._read_pushed_report(
+                bytes([0x01]), max_age if clear_first else math.inf
+            )
         if clear_first:
             self.device.clear_enqueued_reports()
         msg = self.device.read(self._device_info["status_report_length"])
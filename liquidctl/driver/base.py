@@ -83,6 +83,10 @@ class BaseDriver:
         """Get a status report.
 
         Returns a list of `(property, value, unit)` tuples.
+
+        Drivers for devices that periodically push their status may also accept
+        `max_age`, in seconds, and return a pushed status that is at most that
+        old instead of waiting for the next one.
         """
 
         raise NotImplementedError()
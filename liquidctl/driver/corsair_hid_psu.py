@@ -19,7 +19,7 @@ import logging
 from datetime import timedelta
 from enum import Enum
 
-from liquidctl.driver.usb import UsbHidDriver
+from liquidctl.driver.usb import ReportBuffer, UsbHidDriver
 from liquidctl.error import NotSupportedByDevice
 from liquidctl.pmbus import CommandCode as CMD
 from liquidctl.pmbus import WriteBit, linear_to_float
@@ -144,6 +144,7 @@ class CorsairHidPsu(UsbHidDriver):
         super().__init__(*args, **kwargs)
         self.fpowin115 = fpowin115
         self.fpowin230 = fpowin230
+        self._out = ReportBuffer(1 + _REPORT_LENGTH)
 
     def initialize(self, single_12v_ocp=False, direct_access=False, **kwargs):
         """Initialize the device and the driver.
@@ -300,9 +301,7 @@ class CorsairHidPsu(UsbHidDriver):
 
     def _write(self, data):
         assert len(data) <= _REPORT_LENGTH
-        packet = bytearray(1 + _REPORT_LENGTH)
-        packet[1: 1 + len(data)] = data  # device doesn't use numbered reports
-        self.device.write(packet)
+        self.device.write(self._out.fill(data, offset=1))  # device doesn't use numbered reports
 
     def _read(self):
         return self.device.read(_REPORT_LENGTH)
@@ -6,11 +6,14 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 import itertools
 import logging
+import re
 from collections import namedtuple
 from enum import Enum, unique
+from functools import lru_cache
 
 from liquidctl.driver.smbus import SmbusDriver
 from liquidctl.error import ExpectationNotMet, NotSupportedByDevice, NotSupportedByDriver
+from liquidctl.keyval import RuntimeStorage
 from liquidctl.util import RelaxedNamesEnum, check_unsafe, clamp
 
 _LOGGER = logging.getLogger(__name__)
@@ -122,6 +125,127 @@ class Ddr4Spd:
         return self._JEP106[bank][mid]
 
 
+class _SpdSummary:
+    """The parts of a DDR4 SPD used to identify a module.
+
+    Mirrors the corresponding properties of Ddr4Spd, including raising on
+    fields that could not be decoded, but can be cached in RuntimeStorage.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    @classmethod
+    def from_spd(cls, spd):
+        def decode(get):
+            try:
+                return get()
+            except Exception:
+                return None
+
+        return cls({
+            'dram_device_type': decode(lambda: spd.dram_device_type.value),
+            'module_type': decode(lambda: spd.module_type[0].value),
+            'module_thermal_sensor': decode(lambda: spd.module_thermal_sensor),
+            'module_manufacturer': decode(lambda: spd.module_manufacturer),
+            'module_part_number': decode(lambda: spd.module_part_number),
+        })
+
+    @property
+    def dram_device_type(self):
+        return Ddr4Spd.DramDeviceType(self._get('dram_device_type'))
+
+    @property
+    def module_type(self):
+        return (Ddr4Spd.BaseModuleType(self._get('module_type')), None)
+
+    @property
+    def module_thermal_sensor(self):
+        return self._get('module_thermal_sensor')
+
+    @property
+    def module_manufacturer(self):
+        return self._get('module_manufacturer')
+
+    @property
+    def module_part_number(self):
+        return self._get('module_part_number')
+
+    def _get(self, field):
+        value = self.values[field]
+        if value is None:
+            raise ValueError(f'{field} not available')
+        return value
+
+
+def _boot_id():
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _spd_storage():
+    return RuntimeStorage(key_prefixes=['ddr4'])
+
+
+def _read_spd_summary(smbus, address):
+    eeprom = smbus.load_eeprom(address)
+    if not eeprom or eeprom.name != 'ee1004':
+        return None
+    try:
+        return _SpdSummary.from_spd(Ddr4Spd(eeprom.data)).values
+    except Exception:
+        return None
+
+
+def _load_spd_summaries(smbus, addresses):
+    """Load the summaries of the SPD EEPROMs at `addresses`.
+
+    The contents of SPD EEPROMs cannot change without a reboot, so the
+    summaries for each adapter are cached until the kernel boot id changes.
+    Only summaries that were successfully read are cached: an EEPROM can be
+    missing or unreadable because its driver is not bound yet, or because of
+    permissions, so misses are read again every time.  Returns a dict mapping
+    each address to a summary, or to None.
+    """
+
+    boot_id = _boot_id()
+    key = 'spd_' + re.sub(r'\W', '_', smbus.name)
+    cached = {}
+
+    if boot_id:
+        try:
+            saved = _spd_storage().load(key, of_type=dict)
+        except OSError as err:
+            _LOGGER.debug('could not load cached SPD summaries: %r', err)
+            saved = None
+        if saved and saved.get('boot_id') == boot_id:
+            cached = saved['summaries']
+
+    summaries = {}
+    for address in addresses:
+        if address in cached:
+            summaries[address] = cached[address]
+        else:
+            _LOGGER.debug('reading SPD EEPROM at address: %x', address)
+            summaries[address] = _read_spd_summary(smbus, address)
+
+    read = {address: values for address, values in summaries.items()
+            if values and address not in cached}
+    if boot_id and read:
+        try:
+            _spd_storage().store(key, {'boot_id': boot_id,
+                                       'summaries': {**cached, **read}})
+        except OSError as err:
+            _LOGGER.debug('could not cache SPD summaries: %r', err)
+
+    return {address: _SpdSummary(values) if values else None
+            for address, values in summaries.items()}
+
+
 class Ddr4Temperature(SmbusDriver):
     """DDR4 module with TSE2004-compatible SPD EEPROM and temperature sensor."""
 
@@ -133,32 +257,37 @@ class Ddr4Temperature(SmbusDriver):
 
     _UNSAFE = ['smbus', 'ddr4_temperature']
 
+    # FIXME support mainstream AMD chipsets on Linux; note that unlike
+    # i801_smbus, piix4_smbus does not enumerate and register the available
+    # SPD EEPROMs with i2c_register_spd
+    _SMBUS_DRIVERS = ['i801_smbus']
+
+    @classmethod
+    def probe_adapters(cls):
+        """Return the I²C adapters this driver should probe."""
+        return cls._SMBUS_DRIVERS
+
     @classmethod
     def probe(cls, smbus, vendor=None, product=None, address=None, match=None,
               release=None, serial=None, **kwargs):
 
-        # FIXME support mainstream AMD chipsets on Linux; note that unlike
-        # i801_smbus, piix4_smbus does not enumerate and register the available
-        # SPD EEPROMs with i2c_register_spd
-
-        _SMBUS_DRIVERS = ['i801_smbus']
-
-        if smbus.parent_driver not in _SMBUS_DRIVERS \
+        if smbus.parent_driver not in cls._SMBUS_DRIVERS \
                 or any([vendor, product, release, serial]):  # wont match, always None
             return
 
+        spds = _load_spd_summaries(smbus, [cls._SPD_DTIC | dimm
+                                           for dimm in range(cls._SA_MASK + 1)])
+
         for dimm in range(cls._SA_MASK + 1):
             spd_addr = cls._SPD_DTIC | dimm
             _LOGGER.debug('%s checking address: %x', cls.__name__, spd_addr)
 
-            eeprom = smbus.load_eeprom(spd_addr)
+            spd = spds[spd_addr]
 
-            if not eeprom or eeprom.name != 'ee1004':
+            if not spd:
                 continue
 
             try:
-                spd = Ddr4Spd(eeprom.data)
-
                 if spd.dram_device_type != Ddr4Spd.DramDeviceType.DDR4_SDRAM:
                     continue
 
@@ -182,6 +311,21 @@ class Ddr4Temperature(SmbusDriver):
             _LOGGER.debug('%s identified: %s', cls.__name__, desc)
             yield dev
 
+    @classmethod
+    def can_match(cls, vendor=None, product=None, address=None, match=None,
+                  release=None, serial=None, **kwargs):
+        """Check whether the selection filters in `kwargs` can match a device."""
+        if any([vendor, product, release, serial]):  # wont match, always None
+            return False
+        if address:
+            try:
+                dimm = int(address, base=16) ^ cls._SPD_DTIC
+            except ValueError:
+                return False
+            if dimm & ~cls._SA_MASK:
+                return False
+        return True
+
     @classmethod
     def _match(cls, spd):
         if not spd.module_thermal_sensor:
@@ -311,6 +455,14 @@ class VengeanceRgb(Ddr4Temperature):
         super().__init__(*args, **kwargs)
         self._rgb_address = None
 
+    @classmethod
+    def can_match(cls, match=None, **kwargs):
+        """Check whether the selection filters in `kwargs` can match a device."""
+        if match and not any(match.lower() in f'corsair vengeance rgb dimm{dimm + 1}'
+                             for dimm in range(cls._SA_MASK + 1)):
+            return False
+        return super().can_match(**kwargs)
+
     @classmethod
     def _match(cls, spd):
         if spd.module_type != (Ddr4Spd.BaseModuleType.UDIMM, None) \
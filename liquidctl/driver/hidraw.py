@@ -0,0 +1,234 @@
+"""Native access to Linux hidraw devices, without hidapi.
+
+Implements the subset of the cython-hidapi API that `HidapiDevice` uses, so
+that this module can take the place of `hid`: `enumerate` finds devices
+through the uevent files in sysfs, and `device` returns an object that reads
+and writes the /dev/hidraw* nodes directly.  Reads wait with poll(2) and go
+into a buffer allocated once per device, and feature and input reports use
+the HIDIOC* ioctls.
+
+Select it with LIQUIDCTL_HID_BACKEND=hidraw (see: liquidctl.driver.usb).
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import fcntl
+import logging
+import os
+import select
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+_SYSFS_HIDRAW = Path("/sys/class/hidraw")
+
+# HID_MAX_BUFFER_SIZE in the kernel; hidraw never returns more than this
+_MAX_REPORT_LENGTH = 16384
+
+_BUS_USB = 0x03
+
+# from linux/hidraw.h and asm-generic/ioctl.h
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _hidioc(nr, length):
+    return ((_IOC_WRITE | _IOC_READ) << 30) | (length << 16) | (ord("H") << 8) | nr
+
+
+def HIDIOCSFEATURE(length):
+    return _hidioc(0x06, length)
+
+
+def HIDIOCGFEATURE(length):
+    return _hidioc(0x07, length)
+
+
+def HIDIOCGINPUT(length):
+    return _hidioc(0x0A, length)
+
+
+def _read_attr(path, default=None):
+    try:
+        return path.read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+
+def _parse_uevent(text):
+    return dict(line.split("=", maxsplit=1) for line in text.splitlines() if "=" in line)
+
+
+def _parse_usage(descriptor):
+    """Return the usage page and usage of the first top-level collection."""
+
+    usage_page = usage = 0
+    i = 0
+    while i < len(descriptor):
+        prefix = descriptor[i]
+        if prefix == 0xFE:
+            # long item: data size, long item tag, data
+            i += 3 + (descriptor[i + 1] if i + 1 < len(descriptor) else 0)
+            continue
+        size = (0, 1, 2, 4)[prefix & 0x03]
+        value = int.from_bytes(descriptor[i + 1 : i + 1 + size], "little")
+        tag = prefix & 0xFC
+        if tag == 0x04:  # Usage Page
+            usage_page = value
+        elif tag == 0x08:  # Usage
+            if size == 4:
+                usage_page, usage = value >> 16, value & 0xFFFF
+            else:
+                usage = value
+        elif tag == 0xA0:  # Collection
+            break
+        i += 1 + size
+    return usage_page, usage
+
+
+def _device_info(class_dir):
+    hid_dir = (class_dir / "device").resolve()
+    uevent = _parse_uevent(_read_attr(hid_dir / "uevent", ""))
+    try:
+        bus_type, vendor_id, product_id = (int(x, 16) for x in uevent["HID_ID"].split(":"))
+    except (KeyError, ValueError):
+        _LOGGER.debug("ignoring %s: no valid HID_ID in uevent", class_dir.name)
+        return None
+
+    info = {
+        "path": f"/dev/{class_dir.name}".encode(),
+        "vendor_id": vendor_id,
+        "product_id": product_id,
+        "serial_number": uevent.get("HID_UNIQ", ""),
+        "release_number": 0,
+        "manufacturer_string": "",
+        "product_string": uevent.get("HID_NAME", ""),
+        "usage_page": 0,
+        "usage": 0,
+        "interface_number": -1,
+    }
+
+    try:
+        descriptor = (hid_dir / "report_descriptor").read_bytes()
+        info["usage_page"], info["usage"] = _parse_usage(descriptor)
+    except OSError:
+        pass
+
+    if bus_type == _BUS_USB:
+        # the parents of the HID device are the USB interface and the USB device
+        intf_dir = hid_dir.parent
+        usb_dir = intf_dir.parent
+        info["interface_number"] = int(_read_attr(intf_dir / "bInterfaceNumber", "-1"), 16)
+        info["release_number"] = int(_read_attr(usb_dir / "bcdDevice", "0"), 16)
+        info["manufacturer_string"] = _read_attr(usb_dir / "manufacturer", "")
+        info["product_string"] = _read_attr(usb_dir / "product", info["product_string"])
+        info["serial_number"] = _read_attr(usb_dir / "serial", info["serial_number"])
+
+    return info
+
+
+def enumerate(vendor_id=0, product_id=0):
+    """Return the info dicts of the hidraw devices, like `hid.enumerate`."""
+
+    if not _SYSFS_HIDRAW.is_dir():
+        return []
+    infos = []
+    for class_dir in sorted(_SYSFS_HIDRAW.iterdir(), key=lambda x: (len(x.name), x.name)):
+        info = _device_info(class_dir)
+        if not info:
+            continue
+        if (vendor_id and info["vendor_id"] != vendor_id) or (
+            product_id and info["product_id"] != product_id
+        ):
+            continue
+        infos.append(info)
+    return infos
+
+
+class HidrawDevice:
+    """A /dev/hidraw* node, with the same methods as `hid.device`."""
+
+    def __init__(self):
+        self._fd = None
+        self._poll = None
+        self._nonblocking = False
+        # reads may happen in a background thread (see: HidapiReportDispatcher),
+        # so do not share their buffer with the ioctls
+        self._read_buf = memoryview(bytearray(_MAX_REPORT_LENGTH))
+        self._ioctl_buf = memoryview(bytearray(_MAX_REPORT_LENGTH))
+
+    def open_path(self, path):
+        self._attach(os.open(path, os.O_RDWR | os.O_CLOEXEC))
+
+    def _attach(self, fd):
+        self._fd = fd
+        self._poll = select.poll()
+        self._poll.register(fd, select.POLLIN)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._poll = None
+
+    def set_nonblocking(self, value):
+        self._nonblocking = bool(value)
+        return 0
+
+    def read(self, max_length, timeout_ms=0):
+        """Read an input report, waiting up to `timeout_ms`.
+
+        Like cython-hidapi, a `timeout_ms` of zero waits forever unless the
+        device is in non-blocking mode.  Returns an empty list on timeout.
+        """
+
+        if timeout_ms:
+            wait = timeout_ms
+        else:
+            wait = 0 if self._nonblocking else None
+        events = self._poll.poll(wait)
+        if not events:
+            return []
+        if events[0][1] & (select.POLLERR | select.POLLHUP | select.POLLNVAL):
+            raise OSError("read error")
+        try:
+            count = os.readv(self._fd, [self._read_buf[: min(max_length, _MAX_REPORT_LENGTH)]])
+        except BlockingIOError:
+            return []
+        return list(self._read_buf[:count])
+
+    def write(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        return os.write(self._fd, data)
+
+    def _ioctl(self, request_fn, buf):
+        return fcntl.ioctl(self._fd, request_fn(len(buf)), buf, True)
+
+    def get_feature_report(self, report_id, max_length):
+        buf = self._ioctl_buf[:max_length]
+        buf[0] = report_id
+        count = self._ioctl(HIDIOCGFEATURE, buf)
+        return list(buf[:count])
+
+    def get_input_report(self, report_id, max_length):
+        buf = self._ioctl_buf[:max_length]
+        buf[0] = report_id
+        count = self._ioctl(HIDIOCGINPUT, buf)
+        return list(buf[:count])
+
+    def send_feature_report(self, data):
+        buf = self._ioctl_buf[: len(data)]
+        buf[:] = bytes(data)
+        return self._ioctl(HIDIOCSFEATURE, buf)
+
+
+def device():
+    """Return a new, unopened `HidrawDevice`, like `hid.device()`."""
+
+    return HidrawDevice()
@@ -142,33 +142,14 @@ class HydroPlatinum(UsbHidDriver):
     ]
 
     @classmethod
-    def probe(cls, handle, vendor=None, product=None, release=None,
-              serial=None, match=None, **kwargs):
-        """Probe `handle` and yield corresponding driver instances."""
-
-        # this is modified from BaseUsbDriver.probe to match regardless of
-        # presence of "Hydro", for backward compatibility with 1.5.0 and
-        # previous versions
-
-        for vid, pid, desc, devargs in cls._MATCHES:
-            if (vendor and vendor != vid) or handle.vendor_id != vid:
-                continue
-            if (product and product != pid) or handle.product_id != pid:
-                continue
-            if release and handle.release_number != release:
-                continue
-            if serial and handle.serial_number != serial:
-                continue
-            if match:
-                match = match.lower()
-                descr = desc.lower()
-                if not (match in descr or match in descr.replace('hydro ', '')):
-                    continue
-            consargs = devargs.copy()
-            consargs.update(kwargs)
-            dev = cls(handle, desc, **consargs)
-            _LOGGER.debug('%s identified: %s', cls.__name__, desc)
-            yield dev
+    def _match_texts(cls, description):
+        """Return the lowercase texts that a `match` filter is compared to.
+
+        For backward compatibility with 1.5.0 and previous versions, match
+        descriptions regardless of the presence of "Hydro".
+        """
+        text = description.lower()
+        return [text, text.replace('hydro ', '')]
 
     def __init__(self, device, description, fan_count, fan_leds, **kwargs):
         super().__init__(device, description, **kwargs)
@@ -0,0 +1,147 @@
+"""Persistent inventory of devices found on each bus.
+
+Enumerating a bus and probing every driver against every handle is often the
+most expensive step of a short-lived liquidctl invocation.  Buses that support
+it can instead save, per bus, the handle information and the candidate driver
+classes for each relevant handle, and later rebuild the driver instances from
+that inventory without enumerating the bus again.
+
+A saved inventory is only reused while a cheap fingerprint of the relevant
+sysfs directories remains the same.  Because that fingerprint is only
+available on Linux, on other platforms buses are always enumerated.
+
+Buses opt into the inventory by implementing:
+
+- `_INVENTORY_PATHS`: sysfs directories (relative to `/sys`) whose entries
+  change when devices on that bus are added or removed;
+- `_inventory_drivers()`: names that identify the drivers probed by the bus;
+- `_inventory_entries()`: a full enumeration, returning a list of entries
+  that can be serialized with `repr` and restored with `ast.literal_eval`;
+- `_find_devices_in_inventory(entries, **kwargs)`: like `find_devices`, but
+  using the handles saved in `entries`;
+- `_inventory_select(**kwargs)` (optional): whether any device on the bus can
+  match the selection filters; if not, the bus is skipped without loading or
+  refreshing its inventory.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import hashlib
+import logging
+import os
+
+from liquidctl.keyval import RuntimeStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+_SYSFS_ROOT = "/sys"
+
+
+def sysfs_fingerprint(paths, sysfs_root=_SYSFS_ROOT):
+    """Compute a fingerprint of the entries in sysfs `paths`.
+
+    The fingerprint covers the name of each entry and the inode of the sysfs
+    node it refers to.  Since sysfs nodes get new inodes when they are
+    recreated, this also changes when a device is unplugged and plugged back
+    into the same port.
+
+    Returns None if sysfs is not available.
+    """
+
+    if not os.path.isdir(sysfs_root):
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    for rel in paths:
+        path = os.path.join(sysfs_root, rel)
+        digest.update(rel.encode())
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            digest.update(b"\0n/a")
+            continue
+        for name in names:
+            try:
+                ino = os.stat(os.path.join(path, name)).st_ino
+            except OSError:
+                ino = 0
+            digest.update(f"\0{name}\0{ino}".encode())
+    return digest.hexdigest()
+
+
+def driver_name(cls):
+    """Return the fully qualified name of a driver class."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class DeviceInventory:
+    """Persistent inventory of the devices on each supported bus.
+
+    Unstable API.
+    """
+
+    def __init__(self, storage=None, sysfs_root=_SYSFS_ROOT):
+        self._storage = storage
+        self._sysfs_root = sysfs_root
+
+    @staticmethod
+    def supports(root_bus):
+        """Check whether `root_bus` implements the inventory protocol."""
+        return hasattr(root_bus, "_find_devices_in_inventory")
+
+    def find_devices(self, root_bus, /, refresh=False, **kwargs):
+        """Find compatible devices on `root_bus`, reusing its inventory if possible.
+
+        If `refresh` is set, the saved inventory is ignored and replaced.
+        """
+
+        bus_name = type(root_bus).__name__
+
+        select = getattr(root_bus, "_inventory_select", None)
+        if select and not select(**kwargs):
+            return
+
+        fingerprint = sysfs_fingerprint(root_bus._INVENTORY_PATHS, sysfs_root=self._sysfs_root)
+
+        if fingerprint is None:
+            _LOGGER.debug("inventory not available for %s: no sysfs", bus_name)
+            yield from root_bus.find_devices(**kwargs)
+            return
+
+        drivers = root_bus._inventory_drivers()
+        saved = None if refresh else self._load(bus_name)
+
+        if saved and saved["fingerprint"] == fingerprint and saved["drivers"] == drivers:
+            _LOGGER.debug("using saved inventory for %s", bus_name)
+            entries = saved["entries"]
+        else:
+            _LOGGER.debug("refreshing inventory for %s", bus_name)
+            entries = root_bus._inventory_entries()
+            self._store(
+                bus_name, {"fingerprint": fingerprint, "drivers": drivers, "entries": entries}
+            )
+
+        yield from root_bus._find_devices_in_inventory(entries, **kwargs)
+
+    def _get_storage(self):
+        if not self._storage:
+            self._storage = RuntimeStorage(key_prefixes=["inventory"])
+        return self._storage
+
+    def _load(self, bus_name):
+        try:
+            return self._get_storage().load(bus_name, of_type=dict)
+        except OSError as err:
+            _LOGGER.debug("could not load inventory for %s: %r", bus_name, err)
+            return None
+
+    def _store(self, bus_name, value):
+        try:
+            self._get_storage().store(bus_name, value)
+        except OSError as err:
+            _LOGGER.debug("could not store inventory for %s: %r", bus_name, err)
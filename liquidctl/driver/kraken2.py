@@ -23,6 +23,7 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 import itertools
 import logging
+import math
 
 from liquidctl.driver.usb import UsbHidDriver
 from liquidctl.error import NotSupportedByDevice
@@ -107,6 +108,10 @@ class Kraken2(UsbHidDriver):
         }),
     ]
 
+    # all reports are status reports, with the same report ID
+    _DISPATCH_REPORT_LENGTH = _READ_LENGTH
+    _DISPATCH_KEY_LENGTH = 1
+
     def __init__(self, device, description, device_type=DEVICE_KRAKENX, **kwargs):
         super().__init__(device, description)
         self.device_type = device_type
@@ -142,8 +147,8 @@ class Kraken2(UsbHidDriver):
         fw_human = f'{fw[0]}.{fw[3]}' if fw[0] >= 5 else f'{fw[0]}.{fw[2]}.{fw[3]}'
         return [('Firmware version', fw_human, '')]
 
-    def _get_status_directly(self):
-        msg = self._read()
+    def _get_status_directly(self, max_age=None):
+        msg = self._read(max_age=max_age)
 
         return [
             (_STATUS_TEMPERATURE, msg[1] + msg[2]/10, '°C'),
@@ -158,10 +163,12 @@ class Kraken2(UsbHidDriver):
             (_STATUS_PUMP_SPEED, self._hwmon.read_int('fan2_input'), 'rpm'),
         ]
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         """Get a status report.
 
-        Returns a list of `(property, value, unit)` tuples.
+        Returns a list of `(property, value, unit)` tuples.  If `max_age` is
+        passed, a status report that the device pushed up to `max_age` seconds
+        ago can be used.
         """
 
         if self.device_type == self.DEVICE_KRAKENM:
@@ -175,7 +182,7 @@ class Kraken2(UsbHidDriver):
             _LOGGER.warning('directly reading the status despite %s kernel driver',
                             self._hwmon.driver)
 
-        return self._get_status_directly()
+        return self._get_status_directly(max_age)
 
     def set_color(self, channel, mode, colors, speed='normal', direction='forward', **kwargs):
         """Set the color mode for a specific channel."""
@@ -280,10 +287,16 @@ class Kraken2(UsbHidDriver):
             _ = self._read(clear_first=False)
         return self._firmware_version
 
-    def _read(self, clear_first=True):
-        if clear_first:
-            self.device.clear_enqueued_reports()
-        msg = self.device.read(_READ_LENGTH)
+    def _read(self, clear_first=True, max_age=None):
+        if max_age is not None:
+            self._start_dispatcher()
+        if self._dispatcher():
+            # any report will do if not clearing first, e.g. for the firmware version
+            msg = self._read_pushed_report(b'\x04', max_age if clear_first else math.inf)
+        else:
+            if clear_first:
+                self.device.clear_enqueued_reports()
+            msg = self.device.read(_READ_LENGTH)
         self._firmware_version = tuple(msg[0xb:0xf])
         return msg
 
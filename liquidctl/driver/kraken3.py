@@ -25,7 +25,7 @@ from PIL import Image, ImageSequence
 if sys.platform == "win32":
     from winusbcdc import WinUsbPy
 
-from liquidctl.driver.usb import PyUsbDevice, UsbHidDriver
+from liquidctl.driver.usb import PyUsbDevice, ReportBuffer, UsbHidDriver
 from liquidctl.error import NotSupportedByDevice, NotSupportedByDriver
 from liquidctl.util import (
     LazyHexRepr,
@@ -206,6 +206,8 @@ class KrakenX3(UsbHidDriver):
         ),
     ]
 
+    _DISPATCH_REPORT_LENGTH = _READ_LENGTH
+
     def __init__(
         self, device, description, speed_channels, color_channels, hwmon_ctrl_mapping, **kwargs
     ):
@@ -214,6 +216,7 @@ class KrakenX3(UsbHidDriver):
         self._color_channels = color_channels
         self._hwmon_ctrl_mapping = hwmon_ctrl_mapping
         self._fw = None
+        self._out = ReportBuffer(_WRITE_LENGTH)
 
     def initialize(self, direct_access=False, **kwargs):
         """Initialize the device and the driver.
@@ -228,6 +231,7 @@ class KrakenX3(UsbHidDriver):
         """
 
         self.device.clear_enqueued_reports()
+        mark = self._dispatch_mark()
         # request static infos
         self._write([0x10, 0x01])  # firmware info
         self._write([0x20, 0x03])  # lighting info
@@ -248,7 +252,9 @@ class KrakenX3(UsbHidDriver):
 
         self._status = []
 
-        self._read_until({b"\x11\x01": self.parse_firm_info, b"\x21\x03": self.parse_led_info})
+        self._read_until(
+            {b"\x11\x01": self.parse_firm_info, b"\x21\x03": self.parse_led_info}, after=mark
+        )
         self._status.append(("Firmware version", f"{self._fw[0]}.{self._fw[1]}.{self._fw[2]}", ""))
         return sorted(self._status)
 
@@ -279,9 +285,15 @@ class KrakenX3(UsbHidDriver):
             self._status.append(("Pump Logo LEDs", "detected" if found_logo else "missing", ""))
             assert found_ring and found_logo, "Pump ring and/or logo were not detected"
 
-    def _get_status_directly(self):
-        self.device.clear_enqueued_reports()
-        msg = self._read()
+    def _get_status_directly(self, max_age=None):
+        if max_age is not None:
+            self._start_dispatcher()
+        if self._dispatcher():
+            # status reports are pushed every 0.5 seconds after initialization
+            msg = self._read_pushed_report(b"\x75\x02", max_age)
+        else:
+            self.device.clear_enqueued_reports()
+            msg = self._read()
         if msg[15:17] == [0xFF, 0xFF]:
             _LOGGER.warning("unexpected temperature reading, possible firmware fault;")
             _LOGGER.warning("try resetting the device or updating the firmware")
@@ -308,10 +320,12 @@ class KrakenX3(UsbHidDriver):
 
         return status_readings
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         """Get a status report.
 
-        Returns a list of `(property, value, unit)` tuples.
+        Returns a list of `(property, value, unit)` tuples.  If `max_age` is
+        passed, a status report that the device pushed up to `max_age` seconds
+        ago can be used.
         """
 
         if self._hwmon and not direct_access:
@@ -323,7 +337,7 @@ class KrakenX3(UsbHidDriver):
                 "directly reading the status despite %s kernel driver", self._hwmon.driver
             )
 
-        return self._get_status_directly()
+        return self._get_status_directly(max_age)
 
     def set_color(self, channel, mode, colors, speed="normal", direction="forward", **kwargs):
         """Set the color mode for a specific channel."""
@@ -461,7 +475,14 @@ class KrakenX3(UsbHidDriver):
         data = self.device.read(_READ_LENGTH)
         return data
 
-    def _read_until(self, parsers):
+    def _read_until(self, parsers, after=None):
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            # wait for each reply without discarding other reports
+            while parsers:
+                msg = dispatcher.read(parsers.keys(), after=after)
+                parsers.pop(bytes(msg[0:2]))(msg)
+            return
         for _ in range(_MAX_READ_ATTEMPTS):
             msg = self._read()
             prefix = bytes(msg[0:2])
@@ -473,8 +494,7 @@ class KrakenX3(UsbHidDriver):
         assert False, f"missing messages (attempts={_MAX_READ_ATTEMPTS}, missing={len(parsers)})"
 
     def _write(self, data):
-        padding = [0x0] * (_WRITE_LENGTH - len(data))
-        self.device.write(data + padding)
+        self.device.write(self._out.fill(data))
 
     def _write_colors(self, cid, mode, colors, sval, direction):
         mval, size_variant, speed_scale, mincolors, maxcolors = _COLOR_MODES[mode]
@@ -678,8 +698,9 @@ class KrakenZ3(KrakenX3):
 
         if clear_reports:
             self.device.clear_enqueued_reports()
+        mark = self._dispatch_mark()
         self._write([0x10, 0x01])  # firmware info
-        self._read_until({b"\x11\x01": self.parse_firm_info})
+        self._read_until({b"\x11\x01": self.parse_firm_info}, after=mark)
 
     def initialize(self, direct_access=False, **kwargs):
         """Initialize the device and the driver.
@@ -716,12 +737,14 @@ class KrakenZ3(KrakenX3):
         self._get_fw_version(clear_reports=False)
         self._status.append(("Firmware version", f"{self._fw[0]}.{self._fw[1]}.{self._fw[2]}", ""))
 
+        mark = self._dispatch_mark()
         self._write([0x30, 0x01])  # lcd info
-        self._read_until({b"\x31\x01": self.parse_lcd_info})
+        self._read_until({b"\x31\x01": self.parse_lcd_info}, after=mark)
 
         if len(self._color_channels) > 0:
+            mark = self._dispatch_mark()
             self._write([0x20, 0x03])  # lighting info
-            self._read_until({b"\x21\x03": self.parse_led_info})
+            self._read_until({b"\x21\x03": self.parse_led_info}, after=mark)
 
         return sorted(self._status)
 
@@ -731,10 +754,21 @@ class KrakenZ3(KrakenX3):
         self._status.append(("LCD Brightness", self.brightness, "%"))
         self._status.append(("LCD Orientation", self.orientation * 90, "°"))
 
-    def _get_status_directly(self):
-        self.device.clear_enqueued_reports()
-        self._write([0x74, 0x01])
-        msg = self._read()
+    def _get_status_directly(self, max_age=None):
+        if max_age is not None:
+            self._start_dispatcher()
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            # the device also pushes status reports after initialization
+            msg = max_age is not None and dispatcher.latest(b"\x75\x01", max_age)
+            if not msg:
+                mark = dispatcher.mark()
+                self._write([0x74, 0x01])
+                msg = dispatcher.read([b"\x75\x01"], after=mark)
+        else:
+            self.device.clear_enqueued_reports()
+            self._write([0x74, 0x01])
+            msg = self._read()
         if msg[15:17] == [0xFF, 0xFF]:
             _LOGGER.warning("unexpected temperature reading, possible firmware fault;")
             _LOGGER.warning("try resetting the device or updating the firmware")
@@ -755,7 +789,11 @@ class KrakenZ3(KrakenX3):
             (_STATUS_FAN_DUTY, self._hwmon.read_int("pwm2") * 100.0 / 255, "%"),
         ]
 
-    def _read_until_first_match(self, parsers):
+    def _read_until_first_match(self, parsers, after=None):
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            msg = dispatcher.read(parsers.keys(), after=after)
+            return parsers[bytes(msg[0:2])](msg)
         for _ in range(_MAX_READ_ATTEMPTS):
             msg = self._read()
             prefix = bytes(msg[0:2])
@@ -799,6 +837,7 @@ class KrakenZ3(KrakenX3):
             assert value != None, f"Mode: {mode} needs a value"
 
         # get orientation and brightness
+        mark = self._dispatch_mark()
         self._write([0x30, 0x01])
 
         def parse_lcd_info(msg):
@@ -812,7 +851,7 @@ class KrakenZ3(KrakenX3):
                 return self._fw[0] == 2
             return False
 
-        self._read_until({b"\x31\x01": parse_lcd_info})
+        self._read_until({b"\x31\x01": parse_lcd_info}, after=mark)
 
         if mode == "brightness":
             value_int = int(value)
@@ -966,8 +1005,9 @@ class KrakenZ3(KrakenX3):
         ] + bulkInfo
         self._bulk_write(header)
 
-        for i in range(0, len(data), self.bulk_buffer_size):  # start sending data in chunks
-            self._bulk_write(list(data[i : i + self.bulk_buffer_size]))
+        view = memoryview(data if isinstance(data, (bytes, bytearray)) else bytes(data))
+        for i in range(0, len(view), self.bulk_buffer_size):  # start sending data in chunks
+            self._bulk_write(view[i : i + self.bulk_buffer_size])
 
         self._write_then_read([0x36, 0x02])  # end data transfer
 
@@ -1028,8 +1068,9 @@ class KrakenZ3(KrakenX3):
         self._write_then_read([0x36, 0x01, bucketIndex])  # start data transfer
         self._bulk_write(header)
 
-        for i in range(0, len(data), self.bulk_buffer_size):  # start sending data in chunks
-            self._bulk_write(list(data[i : i + self.bulk_buffer_size]))
+        view = memoryview(data if isinstance(data, (bytes, bytearray)) else bytes(data))
+        for i in range(0, len(view), self.bulk_buffer_size):  # start sending data in chunks
+            self._bulk_write(view[i : i + self.bulk_buffer_size])
 
         self._write([0x36, 0x02])  # end data transfer
         # switch to newly written bucket
@@ -1138,12 +1179,13 @@ class KrakenZ3(KrakenX3):
         """
         deletes bucket, returns true if successful, false otherwise
         """
+        mark = self._dispatch_mark()
         self._write([0x32, 0x2, bucketIndex])
 
         def parse_delete_result(msg):
             return msg[14] == 0x1
 
-        return self._read_until_first_match({b"\x33\x02": parse_delete_result})
+        return self._read_until_first_match({b"\x33\x02": parse_delete_result}, after=mark)
 
     def _delete_all_buckets(self):
         """
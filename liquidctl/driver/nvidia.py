@@ -134,6 +134,27 @@ class _NvidiaI2CDriver():
     _ADDRESSES = []
     _MATCHES = []
 
+    @classmethod
+    def pre_can_match(cls, vendor=None, product=None, address=None, match=None,
+                      release=None, serial=None, **kwargs):
+        """Check whether the selection filters in `kwargs` can match a device."""
+        if (vendor and vendor != cls._VENDOR) or release or serial:
+            return False
+        if address:
+            try:
+                if int(address, base=16) not in cls._ADDRESSES:
+                    return False
+            except ValueError:
+                return False
+        return any((not product or product == sub_dev_id)
+                   and (not match or match.lower() in desc.lower())
+                   for _, sub_dev_id, desc in cls._MATCHES)
+
+    @classmethod
+    def pre_probe_adapters(cls):
+        """Return the I²C adapters this driver should probe."""
+        return sorted({(NVIDIA, dev_id) for dev_id, _, _ in cls._MATCHES})
+
     @classmethod
     def pre_probe(cls, smbus, vendor=None, product=None, address=None, match=None,
               release=None, serial=None, **kwargs):
@@ -188,6 +209,14 @@ class EvgaPascal(SmbusDriver, _NvidiaI2CDriver):
         RAINBOW = (0x02, 0)
         BREATHING = (0x05, 1)
 
+    @classmethod
+    def can_match(cls, **kwargs):
+        return cls.pre_can_match(**kwargs)
+
+    @classmethod
+    def probe_adapters(cls):
+        return cls.pre_probe_adapters()
+
     @classmethod
     def probe(cls, smbus, vendor=None, product=None, address=None, match=None,
               release=None, serial=None, **kwargs):
@@ -382,6 +411,14 @@ class RogTuring(SmbusDriver, _NvidiaI2CDriver):
         FLASH = (0x03, 1)
         RAINBOW = (0x04, 0)
 
+    @classmethod
+    def can_match(cls, **kwargs):
+        return cls.pre_can_match(**kwargs)
+
+    @classmethod
+    def probe_adapters(cls):
+        return cls.pre_probe_adapters()
+
     @classmethod
     def probe(cls, smbus, vendor=None, product=None, address=None, match=None,
               release=None, serial=None, **kwargs):
@@ -0,0 +1,163 @@
+"""Registry of the drivers that ship with liquidctl.
+
+Importing every driver module, together with their dependencies, is a
+significant part of the startup time of short-lived liquidctl invocations.
+Instead, the buses look up the devices they find in a static table of the
+drivers that ship with liquidctl, and only import the modules of the drivers
+that can handle those devices.
+
+That table lives in `liquidctl.driver._registry_table`.  It is generated from
+the drivers themselves by `extra/generate-driver-registry.py`, and must not
+import any driver module.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import hashlib
+import importlib
+import logging
+import pkgutil
+import sys
+from functools import lru_cache
+
+from liquidctl.driver._registry_table import DRIVERS
+
+_LOGGER = logging.getLogger(__name__)
+
+_PACKAGE = "liquidctl.driver"
+
+# modules in liquidctl.driver that do not implement any device driver
+_NOT_DRIVERS = {
+    "base",
+    "hidraw",
+    "hwmon",
+    "inventory",
+    "registry",
+    "smbus",
+    "usb",
+    "watcher",
+    "_registry_table",
+}
+
+
+def can_match(bus, vendor=None, product=None, match=None):
+    """Check whether any registered driver for `bus` can match the filters.
+
+    `match`, if passed, must already be in lowercase.
+    """
+
+    for _, _, row_bus, vid, pid, desc, aliases in DRIVERS:
+        if row_bus != bus:
+            continue
+        if vendor and vid is not None and vid != vendor:
+            continue
+        if product and pid is not None and pid != product:
+            continue
+        if match and desc is not None:
+            if not any(match in text for text in (desc.lower(),) + aliases):
+                continue
+        return True
+    return False
+
+
+def load_drivers(bus, ids=None):
+    """Import the modules of the registered drivers for `bus`.
+
+    If `ids` is passed, only import the modules of drivers that can handle one
+    of those (vendor id, product id) pairs.
+    """
+
+    modules = _modules_by_ids(bus)
+    if ids is None:
+        names = set().union(*modules.values())
+    else:
+        names = set().union(*(modules.get(x, ()) for x in ids), modules.get((None, None), ()))
+    for name in sorted(names):
+        _import(name)
+
+
+def load_all_drivers():
+    """Import the modules of all registered drivers."""
+
+    for name in sorted({row[0] for row in DRIVERS}):
+        _import(name)
+
+
+def is_registered(cls):
+    """Check whether a driver class is part of the registry."""
+
+    return (cls.__module__, cls.__qualname__) in _registered_classes()
+
+
+@lru_cache(maxsize=None)
+def signature():
+    """Return a digest of the registry that changes whenever the table does."""
+
+    return hashlib.blake2b(repr(DRIVERS).encode(), digest_size=16).hexdigest()
+
+
+def build_table():
+    """Build the registry table from the driver modules themselves.
+
+    Imports every module in `liquidctl.driver`; only meant for generating and
+    checking `liquidctl.driver._registry_table`.
+    """
+
+    from liquidctl.driver.base import find_all_subclasses
+    from liquidctl.driver.smbus import SmbusDriver
+    from liquidctl.driver.usb import UsbDriver, UsbHidDriver
+
+    package = importlib.import_module(_PACKAGE)
+    for info in pkgutil.iter_modules(package.__path__):
+        if info.name not in _NOT_DRIVERS:
+            _import(info.name)
+
+    rows = []
+    for bus, base in [("hid", UsbHidDriver), ("usb", UsbDriver), ("smbus", SmbusDriver)]:
+        drivers = [x for x in find_all_subclasses(base) if x.__module__.startswith(f"{_PACKAGE}.")]
+        for cls in sorted(drivers, key=lambda x: (x.__module__, x.__qualname__)):
+            rows.extend(_driver_rows(bus, cls))
+    return rows
+
+
+def _driver_rows(bus, cls):
+    module = cls.__module__[len(_PACKAGE) + 1 :]
+    if bus == "smbus":
+        # SMBus drivers are always probed, and handle their own selection filters
+        return [(module, cls.__qualname__, bus, None, None, None, ())]
+
+    ids = {(vid, pid) for vid, pid, _, _ in cls._MATCHES}
+    if set(cls.probe_ids()) != ids:
+        raise ValueError(f"{cls.__qualname__}: cannot register ids not listed in _MATCHES")
+
+    rows = []
+    for vid, pid, desc, _ in cls._MATCHES:
+        aliases = tuple(x for x in cls._match_texts(desc) if x != desc.lower())
+        rows.append((module, cls.__qualname__, bus, vid, pid, desc, aliases))
+    return rows
+
+
+@lru_cache(maxsize=None)
+def _modules_by_ids(bus):
+    modules = {}
+    for module, _, row_bus, vid, pid, _, _ in DRIVERS:
+        if row_bus == bus:
+            modules.setdefault((vid, pid), set()).add(module)
+    return modules
+
+
+@lru_cache(maxsize=None)
+def _registered_classes():
+    return {(f"{_PACKAGE}.{module}", cls) for module, cls, *_ in DRIVERS}
+
+
+def _import(name):
+    fullname = f"{_PACKAGE}.{name}"
+    if fullname not in sys.modules:
+        _LOGGER.debug("loading %s", fullname)
+    return importlib.import_module(fullname)
@@ -222,6 +222,7 @@ class SmartDevice(_BaseSmartDevice):
 
     _READ_LENGTH = 21
     _WRITE_LENGTH = 65
+    _DISPATCH_REPORT_LENGTH = _READ_LENGTH
 
     _COLOR_MODES = {
         # (byte2/mode, byte3/variant, byte4/size, min colors, max colors)
@@ -307,13 +308,26 @@ class SmartDevice(_BaseSmartDevice):
 
         return ret
 
-    def _get_status_directly(self):
+    def _dispatch_key(self, report):
+        # the device cycles through one status report for each fan
+        if len(report) < 16:
+            return bytes(report[:1])
+        return bytes([report[0], report[15] >> 4])
+
+    def _get_status_directly(self, max_age=None):
         fans = [None] * len(self._speed_channels)
         noise = []
 
-        self.device.clear_enqueued_reports()
+        if max_age is not None:
+            self._start_dispatcher()
+        dispatcher = self._dispatcher()
+        if not dispatcher:
+            self.device.clear_enqueued_reports()
         for i, _ in enumerate(fans):
-            msg = self.device.read(self._READ_LENGTH)
+            if dispatcher:
+                msg = self._read_pushed_report(bytes([0x04, i]), max_age)
+            else:
+                msg = self.device.read(self._READ_LENGTH)
             num = (msg[15] >> 4) + 1
             state = msg[15] & 0x3
 
@@ -352,10 +366,12 @@ class SmartDevice(_BaseSmartDevice):
 
         return ret
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         """Get a status report.
 
-        Returns a list of `(property, value, unit)` tuples.
+        Returns a list of `(property, value, unit)` tuples.  If `max_age` is
+        passed, status reports that the device pushed up to `max_age` seconds
+        ago can be used.
         """
 
         if self._hwmon and not direct_access:
@@ -366,7 +382,7 @@ class SmartDevice(_BaseSmartDevice):
             _LOGGER.warning('directly reading the status despite %s kernel driver',
                             self._hwmon.driver)
 
-        return self._get_status_directly()
+        return self._get_status_directly(max_age)
 
     def _write_colors(self, cid, mode, colors, sval, direction='forward'):
         mval, mod3, mod4, _, _ = self._COLOR_MODES[mode]
@@ -449,6 +465,7 @@ class SmartDevice2(_BaseSmartDevice):
     _MAX_READ_ATTEMPTS = 12
     _READ_LENGTH = 64
     _WRITE_LENGTH = 64
+    _DISPATCH_REPORT_LENGTH = _READ_LENGTH
 
     _COLOR_MODES = {
         # (mode, size/variant, moving, min colors, max colors)
@@ -536,6 +553,7 @@ class SmartDevice2(_BaseSmartDevice):
                 self._write([0x60, 0x03])
 
         # request static infos
+        mark = self._dispatch_mark()
         self._write([0x10, 0x01])  # firmware info
         self._write([0x20, 0x03])  # lighting info
         ret = []
@@ -558,10 +576,10 @@ class SmartDevice2(_BaseSmartDevice):
         parsers = {b'\x11\x01': parse_firm_info}
         if self._color_channels:
             parsers[b'\x21\x03'] = parse_led_info
-        self._read_until(parsers)
+        self._read_until(parsers, after=mark)
         return sorted(ret)
 
-    def _get_status_directly(self):
+    def _get_status_directly(self, max_age=None):
         ret = []
 
         def parse_fan_info(msg):
@@ -579,8 +597,7 @@ class SmartDevice2(_BaseSmartDevice):
                 rpm_offset += 2
             ret.append(('Noise level', msg[noise_offset], 'dB'))
 
-        self.device.clear_enqueued_reports()
-        self._read_until({b'\x67\x02': parse_fan_info})
+        self._read_status(b'\x67\x02', parse_fan_info, max_age)
         return sorted(ret)
 
     def _get_status_from_hwmon(self):
@@ -596,10 +613,12 @@ class SmartDevice2(_BaseSmartDevice):
 
         return sorted(ret)
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         """Get a status report.
 
-        Returns a list of `(property, value, unit)` tuples.
+        Returns a list of `(property, value, unit)` tuples.  If `max_age` is
+        passed, status reports that the device pushed up to `max_age` seconds
+        ago can be used.
         """
 
         if not self._speed_channels:
@@ -613,9 +632,16 @@ class SmartDevice2(_BaseSmartDevice):
             _LOGGER.warning('directly reading the status despite %s kernel driver',
                             self._hwmon.driver)
 
-        return self._get_status_directly()
+        return self._get_status_directly(max_age)
 
-    def _read_until(self, parsers):
+    def _read_until(self, parsers, after=None):
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            # wait for each reply without discarding other reports
+            while parsers:
+                msg = dispatcher.read(parsers.keys(), after=after)
+                parsers.pop(bytes(msg[0:2]))(msg)
+            return
         for _ in range(self._MAX_READ_ATTEMPTS):
             msg = self.device.read(self._READ_LENGTH)
             prefix = bytes(msg[0:2])
@@ -626,6 +652,16 @@ class SmartDevice2(_BaseSmartDevice):
                 return
         assert False, f'missing messages (attempts={self._MAX_READ_ATTEMPTS}, missing={len(parsers)})'
 
+    def _read_status(self, prefix, parser, max_age=None):
+        if max_age is not None:
+            self._start_dispatcher()
+        if self._dispatcher():
+            # status reports are pushed every 0.5 seconds after initialization
+            parser(self._read_pushed_report(prefix, max_age))
+        else:
+            self.device.clear_enqueued_reports()
+            self._read_until({prefix: parser})
+
     def _write_colors(self, cid, mode, colors, sval, direction='forward',):
         mval, mod3, mod4, mincolors, maxcolors = self._COLOR_MODES[mode]
 
@@ -677,7 +713,7 @@ class H1V2(SmartDevice2):
         }),
     ]
 
-    def get_status(self, direct_access=False, **kwargs):
+    def get_status(self, direct_access=False, max_age=None, **kwargs):
         ret = []
 
         def parse_fan_info(msg):
@@ -697,8 +733,7 @@ class H1V2(SmartDevice2):
             ret.append(('Pump speed', msg[pump_offset] << 8 | msg[pump_offset - 1], 'rpm'))
 
         # parse fans and pump status
-        self.device.clear_enqueued_reports()
-        self._read_until({b'\x75\x02': parse_fan_info})
+        self._read_status(b'\x75\x02', parse_fan_info, max_age)
         return sorted(ret)
 
 
@@ -717,6 +752,7 @@ class Nzxt2023RgbController(_BaseSmartDevice):
     _MAX_READ_ATTEMPTS = 12
     _READ_LENGTH = 64
     _WRITE_LENGTH = 64
+    _DISPATCH_REPORT_LENGTH = _READ_LENGTH
 
     _COLOR_MODES = {
         'off':              (0x00, 0x00, 0x00, 0, 0),
@@ -777,6 +813,7 @@ class Nzxt2023RgbController(_BaseSmartDevice):
         """
 
         self.device.clear_enqueued_reports()
+        mark = self._dispatch_mark()
 
         # request static infos
         self._write([0x10, 0x01])  # firmware info
@@ -800,7 +837,7 @@ class Nzxt2023RgbController(_BaseSmartDevice):
         parsers = {b'\x11\x01': parse_firm_info}
         if self._color_channels:
             parsers[b'\x21\x03'] = parse_led_info
-        self._read_until(parsers)
+        self._read_until(parsers, after=mark)
         return sorted(ret)
 
     def get_status(self, direct_access=False, **kwargs):
@@ -813,7 +850,14 @@ class Nzxt2023RgbController(_BaseSmartDevice):
         ret.append((f'ARGB Channels: {len(self._color_channels)-1}', '', ''))
         return sorted(ret)
 
-    def _read_until(self, parsers):
+    def _read_until(self, parsers, after=None):
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            # wait for each reply without discarding other reports
+            while parsers:
+                msg = dispatcher.read(parsers.keys(), after=after)
+                parsers.pop(bytes(msg[0:2]))(msg)
+            return
         for _ in range(self._MAX_READ_ATTEMPTS):
             msg = self.device.read(self._READ_LENGTH)
             prefix = bytes(msg[0:2])
@@ -10,8 +10,10 @@ import logging
 import os
 import sys
 from collections import namedtuple
+from functools import cached_property
 from pathlib import Path
 
+from liquidctl.driver import registry
 from liquidctl.driver.base import BaseDriver, BaseBus, find_all_subclasses
 from liquidctl.util import check_unsafe, LazyHexRepr
 
@@ -37,19 +39,26 @@ if sys.platform == 'linux':
         def find_devices(self, bus=None, usb_port=None, **kwargs):
             """Find compatible SMBus devices."""
 
-            if usb_port:
+            if usb_port or (bus and not bus.startswith('i2c-')):
                 # a usb_port filter implies an USB bus
                 return
 
+            # resolve the remaining selection filters before touching sysfs
+            registry.load_drivers('smbus')
+            drivers = sorted(filter(lambda x: x.can_match(**kwargs),
+                                    find_all_subclasses(SmbusDriver)),
+                             key=lambda x: x.__name__)
+            if not drivers:
+                _LOGGER.debug('skipping %s, no driver can match the selection filters',
+                              self.__class__.__name__)
+                return
+
             devices = self._i2c_root.joinpath('devices')
             if not devices.exists():
                 _LOGGER.debug('skipping %s, %s not available',
                               self.__class__.__name__, devices)
                 return
 
-            drivers = sorted(find_all_subclasses(SmbusDriver),
-                             key=lambda x: x.__name__)
-
             _LOGGER.debug('searching %s', self.__class__.__name__)
             _LOGGER.debug(
                 '%s drivers: %s',
@@ -57,6 +66,8 @@ if sys.platform == 'linux':
                 ', '.join(map(lambda x: x.__name__, drivers))
             )
 
+            index = _AdapterIndex(drivers)
+
             for i2c_dev in devices.iterdir():
                 try:
                     i2c_bus = LinuxI2cBus(i2c_dev)
@@ -67,8 +78,13 @@ if sys.platform == 'linux':
                 if bus and bus != i2c_bus.name:
                     continue
 
+                candidates = index.candidates(i2c_bus)
+                if not candidates:
+                    _LOGGER.debug('I²C adapter: %s skipped: no candidate drivers', i2c_bus.name)
+                    continue
+
                 _LOGGER.debug('I²C adapter: %s (%s)', i2c_bus.name, i2c_bus.description or "N/A")
-                yield from i2c_bus.find_devices(drivers, **kwargs)
+                yield from i2c_bus.find_devices(candidates, **kwargs)
 
     class LinuxI2cBus:
         """A Linux I²C device, which is itself an I²C bus.
@@ -184,27 +200,30 @@ if sys.platform == 'linux':
         def name(self):
             return self._i2c_dev.name
 
-        @property
+        # the attributes of an adapter and of its parent device cannot change
+        # while it exists, so each is read from sysfs at most once
+
+        @cached_property
         def description(self):
             return self._try_sysfs_read('name')
 
-        @property
+        @cached_property
         def parent_vendor(self):
             return self._try_sysfs_read_hex('device/vendor')
 
-        @property
+        @cached_property
         def parent_device(self):
             return self._try_sysfs_read_hex('device/device')
 
-        @property
+        @cached_property
         def parent_subsystem_vendor(self):
             return self._try_sysfs_read_hex('device/subsystem_vendor')
 
-        @property
+        @cached_property
         def parent_subsystem_device(self):
             return self._try_sysfs_read_hex('device/subsystem_device')
 
-        @property
+        @cached_property
         def parent_driver(self):
             try:
                 return Path(os.readlink(self._i2c_dev.joinpath('device/driver'))).name
@@ -242,13 +261,60 @@ if sys.platform == 'linux':
                 return default
 
 
+class _AdapterIndex:
+    """Index of SMBus drivers by the I²C adapters they should probe."""
+
+    def __init__(self, drivers):
+        self._drivers = drivers
+        self._any = set()
+        self._by_key = {}
+        for drv in drivers:
+            keys = drv.probe_adapters()
+            if keys is None:
+                self._any.add(drv)
+                continue
+            for key in keys:
+                self._by_key.setdefault(key, set()).add(drv)
+
+    def candidates(self, smbus):
+        """Return the drivers that should probe `smbus`, in their original order."""
+        found = set(self._any)
+        if self._by_key:
+            found.update(self._by_key.get((smbus.parent_vendor, smbus.parent_device), ()))
+            found.update(self._by_key.get(smbus.parent_driver, ()))
+        return [drv for drv in self._drivers if drv in found]
+
+
 class SmbusDriver(BaseDriver):
     """Base driver class for SMBus devices."""
 
+    @classmethod
+    def probe_adapters(cls):
+        """Return the I²C adapters this driver should probe.
+
+        Each item is either a (vendor id, device id) pair of PCI IDs of the
+        adapter's parent device, or the name of the kernel driver bound to that
+        parent device (e.g. 'i801_smbus').  The bus only calls `probe` with
+        adapters that match at least one of these.
+
+        Returns None by default, meaning that every adapter should be probed.
+        """
+        return None
+
     @classmethod
     def probe(cls, smbus, **kwargs):
         raise NotImplementedError()
 
+    @classmethod
+    def can_match(cls, **kwargs):
+        """Check whether the selection filters in `kwargs` can match a device.
+
+        Called before any bus is probed, allowing the bus to skip drivers, or
+        even all adapters, when the filters rule out every device this driver
+        could find.  Drivers should only return False when certain.
+        """
+        return True
+
     @classmethod
     def find_supported_devices(cls, root_bus=None, **kwargs):
         """Find devices specifically compatible with this driver."""
@@ -16,7 +16,7 @@ BaseUsbDriver
 UsbHidDriver
 ├── extends: BaseUsbDriver
 └── device: HidapiDevice
-    ├── uses hidapi
+    ├── uses hidapi, or liquidctl.driver.hidraw if selected on Linux
     └── backed by
         ├── hid.dll on Windows
         ├── hidraw on Linux if it was enabled during the build of hidapi
@@ -47,6 +47,23 @@ HidapiBus
 PyUsbBus
 └── drivers: all (recursive) subclasses of UsbDriver
 
+Every public operation of a BaseUsbDriver, like `connect`, `initialize` or
+`get_status`, is run while holding an advisory lock on its device, shared with
+other processes.  This keeps concurrent programs from interleaving their
+requests and replies.  The lock is reentrant, so operations can call each
+other, and the time to wait for it can be set with the `lock_timeout` keyword
+argument (in seconds, or None to wait forever).
+
+Callers that run operations in worker threads, like liquidctl.aio, can make
+them cancellable with `cancel_scope`: once cancelled, transfers that have not
+started yet, and HID reads still waiting for data, raise `Timeout`.
+
+Both buses only import the modules of the drivers that ship with liquidctl
+once a device they can handle is found (see: liquidctl.driver.registry).  The
+loaded drivers are then indexed by the (vendor id, product id) pairs returned
+by each driver's probe_ids, and a handle is only probed with the drivers
+indexed under its IDs.
+
 The subclass constructor can generally be kept unaware of the implementation
 details of the device parameter, and find_supported_devices already accepts
 keyword arguments and forwards them to the driver constructor.
@@ -55,8 +72,18 @@ Copyright Jonas Malaco and contributors
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
+import errno
+import hashlib
+import importlib
 import logging
+import os
+import re
 import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import cached_property, lru_cache, wraps
 
 import usb
 from usb.core import USBTimeoutError
@@ -72,9 +99,12 @@ try:
 except ModuleNotFoundError:
     libusb_package = None
 
+from liquidctl.driver import registry
 from liquidctl.driver.base import BaseDriver, BaseBus, find_all_subclasses
 from liquidctl.driver.hwmon import HwmonDevice
-from liquidctl.error import Timeout
+from liquidctl.driver.inventory import driver_name
+from liquidctl.error import DeviceBusy, Timeout
+from liquidctl.keyval import RuntimeStorage
 from liquidctl.util import LazyHexRepr
 
 # During initialization, SmartDevice2 devices take ~2.5 seconds to reply with
@@ -82,8 +112,152 @@ from liquidctl.util import LazyHexRepr
 # so set the timeout to double that value.
 _DEFAULT_TIMEOUT_MS = 5000
 
+# How often the background reader of a HidapiReportDispatcher checks whether
+# it should stop, in ms; this bounds the time it takes to disconnect
+_DISPATCH_POLL_MS = 25
+
+# Reports kept for each key by a HidapiReportDispatcher (like hidraw on Linux)
+_DISPATCH_MAX_QUEUED = 64
+
+# How often HID reads within a `cancel_scope` check whether they have been
+# cancelled, in ms
+_CANCEL_POLL_MS = 25
+
+# How long to wait for other programs to finish using a device, in seconds.
+# Setting a screen can take a while, so be generous.
+_DEFAULT_LOCK_TIMEOUT = 30
+
+# BaseUsbDriver methods that are automatically run while holding the device lock
+_LOCKED_OPERATIONS = [
+    'connect',
+    'disconnect',
+    'initialize',
+    'get_status',
+    'set_color',
+    'set_screen',
+    'set_speed_profile',
+    'set_fixed_speed',
+]
+
 _LOGGER = logging.getLogger(__name__)
 
+_enumeration_pass = threading.local()
+
+# Cancellation event of the current thread, see `cancel_scope`
+_cancellation = threading.local()
+
+
+@contextmanager
+def cancel_scope(event):
+    """Turn `event` into timeouts of the transfers made by the current thread.
+
+    Once the `threading.Event` is set, transfers that have not started yet, and
+    HID reads that are still waiting for data, raise `Timeout`.  Transfers that
+    are already in progress at the USB level are not interrupted.
+
+    Unstable API.
+    """
+    previous = getattr(_cancellation, 'event', None)
+    _cancellation.event = event
+    try:
+        yield
+    finally:
+        _cancellation.event = previous
+
+
+def _cancel_event():
+    return getattr(_cancellation, 'event', None)
+
+
+def _check_cancelled():
+    event = _cancel_event()
+    if event is not None and event.is_set():
+        _LOGGER.debug('operation cancelled')
+        raise Timeout()
+
+
+class _DeviceLock:
+    """Reentrant lock on a device, shared between threads and processes.
+
+    Threads are serialized with a `threading.RLock`, and processes with a file
+    lock that is held while any thread of this process holds the device.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _storage = None
+
+    @classmethod
+    def get(cls, name):
+        with cls._instances_lock:
+            if name not in cls._instances:
+                cls._instances[name] = cls(name)
+            return cls._instances[name]
+
+    @classmethod
+    def _get_storage(cls):
+        with cls._instances_lock:
+            if cls._storage is None:
+                try:
+                    cls._storage = RuntimeStorage(key_prefixes=['locks'])
+                except OSError as err:
+                    _LOGGER.warning('cannot lock devices, runtime directory unavailable: %s', err)
+                    cls._storage = False
+            return cls._storage
+
+    def __init__(self, name):
+        self._name = name
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._file_lock = None
+
+    @contextmanager
+    def hold(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._rlock.acquire(timeout=-1 if timeout is None else timeout):
+            raise DeviceBusy()
+        try:
+            if self._depth == 0:
+                self._acquire_file_lock(deadline)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._file_lock:
+                    self._file_lock.__exit__(None, None, None)
+                    self._file_lock = None
+        finally:
+            self._rlock.release()
+
+    def _acquire_file_lock(self, deadline):
+        storage = self._get_storage()
+        if not storage:
+            return
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        file_lock = storage.lock(self._name, timeout=timeout)
+        try:
+            file_lock.__enter__()
+        except TimeoutError:
+            raise DeviceBusy() from None
+        except OSError as err:
+            # e.g. a lock file left by another user; do not fail the operation
+            _LOGGER.warning('cannot lock device (%s): %s', self._name, err)
+            return
+        self._file_lock = file_lock
+
+
+def _device_locked(func):
+    """Run a BaseUsbDriver method while holding the lock on its device."""
+
+    @wraps(func)
+    def locked(self, *args, lock_timeout=_DEFAULT_LOCK_TIMEOUT, **kwargs):
+        with _DeviceLock.get(self._lock_name()).hold(lock_timeout):
+            return func(self, *args, **kwargs)
+
+    locked._device_locked = True
+    return locked
+
 
 class BaseUsbDriver(BaseDriver):
     """Base driver class for generic USB devices.
@@ -100,6 +274,35 @@ class BaseUsbDriver(BaseDriver):
 
     _MATCHES = []
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in _LOCKED_OPERATIONS:
+            func = cls.__dict__.get(name)
+            if callable(func) and not getattr(func, '_device_locked', False):
+                setattr(cls, name, _device_locked(func))
+
+    @classmethod
+    def probe_ids(cls, match=None):
+        """Return the (vendor id, product id) pairs this driver should probe.
+
+        The buses only call `probe` with handles that match one of these pairs.
+        A product id of None matches any device from that vendor.
+
+        If `match` is passed, only return the pairs of devices whose
+        descriptions can match that (lowercase) substring.
+
+        By default these are taken from `_MATCHES`; drivers that override
+        `probe` to match devices not listed in `_MATCHES` must also override
+        this method.
+        """
+        return [(vid, pid) for vid, pid, desc, _ in cls._MATCHES
+                if not match or any(match in text for text in cls._match_texts(desc))]
+
+    @classmethod
+    def _match_texts(cls, description):
+        """Return the lowercase texts that a `match` filter is compared to."""
+        return [description.lower()]
+
     @classmethod
     def probe(cls, handle, vendor=None, product=None, release=None,
               serial=None, match=None, **kwargs):
@@ -113,7 +316,7 @@ class BaseUsbDriver(BaseDriver):
                 continue
             if serial and handle.serial_number != serial:
                 continue
-            if match and match.lower() not in desc.lower():
+            if match and not any(match.lower() in text for text in cls._match_texts(desc)):
                 continue
             consargs = devargs.copy()
             consargs.update(kwargs)
@@ -125,15 +328,34 @@ class BaseUsbDriver(BaseDriver):
         self.device = device
         self._description = description
 
+    @_device_locked
     def connect(self, **kwargs):
         """Connect to the device."""
         self.device.open()
         return self
 
+    @_device_locked
     def disconnect(self, **kwargs):
         """Disconnect from the device."""
         self.device.close()
 
+    def _lock_name(self):
+        """Return the name of the lock on the device, based on its location."""
+        if self.port:
+            location = '.'.join(map(str, self.port))
+        else:
+            location = self.address
+        if location is None:
+            # only for handles that do not know where the device is (e.g. in
+            # tests); do not make all of them share a single lock
+            location = f'{id(self.device):x}'
+        name = re.sub(r'\W', '_', f'{self.bus}_{location}')
+        if len(name) > 64:
+            # e.g. Windows HID paths
+            digest = hashlib.sha1(name.encode()).hexdigest()
+            name = re.sub(r'\W', '_', f'{self.bus}_{digest}')
+        return name
+
     @property
     def description(self):
         """Human readable description of the corresponding device."""
@@ -187,14 +409,23 @@ class BaseUsbDriver(BaseDriver):
 class UsbHidDriver(BaseUsbDriver):
     """Base driver class for USB Human Interface Devices (HIDs)."""
 
+    # drivers that set this can read the reports of their device in the
+    # background, with reads of this length (see: _start_dispatcher)
+    _DISPATCH_REPORT_LENGTH = None
+
+    # number of leading bytes that the reports are routed by
+    _DISPATCH_KEY_LENGTH = 2
+
     @classmethod
     def find_supported_devices(cls, **kwargs):
         """Find devices specifically compatible with this driver."""
         devs = []
-        for vid, pid, _, _ in cls._MATCHES:
-            for dev in HidapiBus().find_devices(vendor=vid, product=pid, **kwargs):
-                if type(dev) == cls:
-                    devs.append(dev)
+        # some HID drivers also look up the same device on the USB bus
+        with _single_usb_enumeration():
+            for vid, pid, _, _ in cls._MATCHES:
+                for dev in HidapiBus().find_devices(vendor=vid, product=pid, **kwargs):
+                    if type(dev) == cls:
+                        devs.append(dev)
         return devs
 
     def __init__(self, device, description, **kwargs):
@@ -210,9 +441,67 @@ class UsbHidDriver(BaseUsbDriver):
             assert hidinfo, 'Could not find device in HID bus'
             device = HidapiDevice(hid, hidinfo)
         super().__init__(device, description, **kwargs)
-        self._hwmon = HwmonDevice.from_hidraw(device.path)
-        if self._hwmon:
-            _LOGGER.debug('has kernel driver: %s (%s)', self._hwmon.driver, self._hwmon.path)
+
+    def _dispatch_key(self, report):
+        """Return the key that `report` is routed by (see: HidapiReportDispatcher)."""
+        return bytes(report[:self._DISPATCH_KEY_LENGTH])
+
+    def _start_dispatcher(self):
+        """Start reading reports in the background, if supported by the driver.
+
+        The device is then polled until it is disconnected, so this is not
+        done on `connect`, but only once the reports the device pushes can be
+        reused, e.g. by `get_status(max_age=...)`.  Returns the running
+        HidapiReportDispatcher, or None.
+        """
+        if self._DISPATCH_REPORT_LENGTH and isinstance(self.device, HidapiDevice):
+            return self.device.start_dispatcher(self._DISPATCH_REPORT_LENGTH,
+                                                key=self._dispatch_key)
+        return None
+
+    def _dispatcher(self):
+        """Return the running HidapiReportDispatcher of the device, or None.
+
+        None is also returned when the device handle has been wrapped, e.g.
+        to record its transfers, since those should go through `read`.
+        """
+        if isinstance(self.device, HidapiDevice):
+            return self.device.dispatcher
+        return None
+
+    def _dispatch_mark(self):
+        """Return a marker for `HidapiReportDispatcher.read(after=...)`, or None.
+
+        Take it before writing a request, so that only replies received after
+        the request are read, and not stale ones (e.g. meant for another
+        process, since all open handles to a hidraw device receive every
+        report).
+        """
+        dispatcher = self._dispatcher()
+        if dispatcher:
+            return dispatcher.mark()
+        return None
+
+    def _read_pushed_report(self, key, max_age=None):
+        """Read a report that the device pushes periodically, like a status report.
+
+        Requires a running dispatcher.  Reuses the latest report with `key` if
+        it is not older than `max_age` seconds; otherwise, or if `max_age` is
+        None, waits for the next one.
+        """
+        dispatcher = self._dispatcher()
+        if max_age is not None:
+            return dispatcher.read_recent(key, max_age)
+        return dispatcher.read([key], after=dispatcher.mark())
+
+    @cached_property
+    def _hwmon(self):
+        # looked up on first use, as most instances (e.g. when listing or
+        # filtering devices) never need it, and the sysfs lookup is not free
+        hwmon = HwmonDevice.from_hidraw(self.device.path)
+        if hwmon:
+            _LOGGER.debug('has kernel driver: %s (%s)', hwmon.driver, hwmon.path)
+        return hwmon
 
 
 class UsbDriver(BaseUsbDriver):
@@ -225,10 +514,11 @@ class UsbDriver(BaseUsbDriver):
     def find_supported_devices(cls, **kwargs):
         """Find devices specifically compatible with this driver."""
         devs = []
-        for vid, pid, _, _ in cls._MATCHES:
-            for dev in PyUsbBus().find_devices(vendor=vid, product=pid, **kwargs):
-                if type(dev) == cls:
-                    devs.append(dev)
+        with _single_usb_enumeration():
+            for vid, pid, _, _ in cls._MATCHES:
+                for dev in PyUsbBus().find_devices(vendor=vid, product=pid, **kwargs):
+                    if type(dev) == cls:
+                        devs.append(dev)
         return devs
 
 
@@ -313,6 +603,7 @@ class PyUsbDevice:
 
     def read(self, endpoint, length, *, timeout=_DEFAULT_TIMEOUT_MS):
         """Read from endpoint."""
+        _check_cancelled()
         try:
             data = self.usbdev.read(endpoint, length, timeout=timeout)
         except USBTimeoutError:
@@ -322,7 +613,12 @@ class PyUsbDevice:
         return data
 
     def write(self, endpoint, data, *, timeout=_DEFAULT_TIMEOUT_MS):
-        """Write to endpoint."""
+        """Write to endpoint.
+
+        `data` can be a list of integers or any bytes-like object, including a
+        `memoryview` slice of a larger buffer; it is passed to PyUSB as-is.
+        """
+        _check_cancelled()
         _LOGGER.debug('writing %d bytes: %r', len(data), LazyHexRepr(data))
         try:
             return self.usbdev.write(endpoint, data, timeout=timeout)
@@ -332,6 +628,7 @@ class PyUsbDevice:
 
     def ctrl_transfer(self, *args, timeout=_DEFAULT_TIMEOUT_MS, **kwargs):
         """Submit a contrl transfer."""
+        _check_cancelled()
         _LOGGER.debug('sending control transfer with %r, %r', args, kwargs)
         try:
             return self.usbdev.ctrl_transfer(*args, **kwargs)
@@ -341,18 +638,15 @@ class PyUsbDevice:
 
     @classmethod
     def enumerate(cls, vid=None, pid=None):
-        args = {}
-        if vid:
-            args['idVendor'] = vid
-        if pid:
-            args['idProduct'] = pid
-        if libusb_package and (sys.platform == 'win32' or sys.platform == 'cygwin'):
-            _LOGGER.debug('using libusb_package.find')
-            find = libusb_package.find
-        else:
-            find = usb.core.find
-        for handle in find(find_all=True, **args):
-            yield cls(handle)
+        # filtering in Python is no slower than letting PyUSB do it, since it
+        # also has to read the descriptors of all devices; and it allows the
+        # enumeration to be shared between calls
+        for usbdev in _usb_core_devices():
+            if vid and usbdev.idVendor != vid:
+                continue
+            if pid and usbdev.idProduct != pid:
+                continue
+            yield cls(usbdev)
 
     @property
     def vendor_id(self):
@@ -386,6 +680,87 @@ class PyUsbDevice:
         return type(self) == type(other) and self.bus == other.bus and self.address == other.address
 
 
+class _InventoryUsbCoreDevice:
+    """Stand-in for a `usb.core.Device` restored from a device inventory.
+
+    The identifiers saved in the inventory are available immediately, while
+    the actual `usb.core.Device` is only looked up when something else is
+    needed from it (e.g. the serial number, or to connect to the device).
+    """
+
+    def __init__(self, info):
+        self.__dict__.update(info)
+        self._usbdev = None
+
+    def __getattr__(self, name):
+        if self._usbdev is None:
+            self._usbdev = usb.core.find(idVendor=self.idVendor, idProduct=self.idProduct,
+                                         bus=self.bus, address=self.address,
+                                         backend=_usb_backend())
+            if self._usbdev is None:
+                raise OSError(errno.ENODEV, 'device no longer available')
+        return getattr(self._usbdev, name)
+
+
+def _hid_backend():
+    """Return the name of the selected HID backend: hidapi, or hidraw."""
+    backend = os.getenv('LIQUIDCTL_HID_BACKEND', 'hidapi')
+    if backend == 'hidraw' and sys.platform == 'linux':
+        return backend
+    if backend != 'hidapi':
+        _LOGGER.warning('HID backend %s not available, using hidapi', backend)
+    return 'hidapi'
+
+
+def _hid_api():
+    """Return the HID API to use: hidapi, or the native hidraw backend if selected."""
+    if _hid_backend() == 'hidraw':
+        from liquidctl.driver import hidraw
+        return hidraw
+    return hid
+
+
+@lru_cache(maxsize=None)
+def _usb_backend():
+    """Return the PyUSB backend to use, selecting it only once per process."""
+    if libusb_package and (sys.platform == 'win32' or sys.platform == 'cygwin'):
+        _LOGGER.debug('using libusb_package backend')
+        return libusb_package.get_libusb1_backend()
+    # same order of preference as usb.core.find
+    for name in ['libusb1', 'libusb0', 'openusb']:
+        backend = importlib.import_module(f'usb.backend.{name}').get_backend()
+        if backend:
+            return backend
+    return None
+
+
+def _usb_core_devices():
+    """Enumerate all USB devices, or reuse the enumeration of the current pass."""
+    if getattr(_enumeration_pass, 'depth', 0) == 0:
+        return usb.core.find(find_all=True, backend=_usb_backend())
+    if _enumeration_pass.usbdevs is None:
+        _enumeration_pass.usbdevs = list(usb.core.find(find_all=True, backend=_usb_backend()))
+    return _enumeration_pass.usbdevs
+
+
+@contextmanager
+def _single_usb_enumeration():
+    """Share a single USB enumeration between all `PyUsbDevice.enumerate` calls.
+
+    Only affects the current thread; can be nested.
+    """
+    depth = getattr(_enumeration_pass, 'depth', 0)
+    if depth == 0:
+        _enumeration_pass.usbdevs = None
+    _enumeration_pass.depth = depth + 1
+    try:
+        yield
+    finally:
+        _enumeration_pass.depth = depth
+        if depth == 0:
+            _enumeration_pass.usbdevs = None
+
+
 class HidapiDevice:
     """A hidapi backed device.
 
@@ -402,6 +777,10 @@ class HidapiDevice:
     implementation; at the same time an alternate 'hidraw' module may also be
     provided.  The latter is prefered, when available.
 
+    On Linux, setting LIQUIDCTL_HID_BACKEND=hidraw replaces hidapi with
+    liquidctl's own implementation (see: liquidctl.driver.hidraw), which uses
+    the hidraw nodes directly and avoids the overhead of the hidapi bindings.
+
     Note: if a libusb-backed 'hid' is used on Linux (assuming default build
     options) it will detach the kernel driver, making hidraw and hwmon
     unavailable for that device.  To fix, rebind the device to usbhid with:
@@ -412,15 +791,36 @@ class HidapiDevice:
         self.api = hidapi
         self.hidinfo = hidapi_dev_info
         self.hiddev = self.api.device()
+        self.dispatcher = None
 
     def open(self):
         """Connect to the device."""
         self.hiddev.open_path(self.hidinfo['path'])
 
     def close(self):
-        """NOOP."""
+        """Disconnect from the device.
+
+        Also stops the background reader, if any, and waits for its thread to
+        finish.
+        """
+        if self.dispatcher:
+            self.dispatcher.stop()
+            self.dispatcher = None
         self.hiddev.close()
 
+    def start_dispatcher(self, length, key=None):
+        """Start reading reports of up to `length` bytes in the background.
+
+        Reports are routed by `key(report)`, by default their first two bytes.
+        Returns the `HidapiReportDispatcher`, which is also available as
+        `dispatcher` until the device is closed.  While it runs, `read` and
+        `clear_enqueued_reports` use it instead of reading from the device.
+        """
+        if not self.dispatcher:
+            self.dispatcher = HidapiReportDispatcher(self.hiddev, length, key)
+            self.dispatcher.start()
+        return self.dispatcher
+
     def clear_enqueued_reports(self):
         """Clear already enqueued incoming reports.
 
@@ -431,6 +831,9 @@ class HidapiDevice:
         This method quickly reads and discards any already enqueued reports,
         and is useful when later reads are not expected to return stale data.
         """
+        if self.dispatcher:
+            self.dispatcher.clear()
+            return
         if self.hiddev.set_nonblocking(True) == 0:
             timeout_ms = 0  # use hid_read; wont block because call succeeded
         else:
@@ -453,13 +856,29 @@ class HidapiDevice:
         Unlike the underlying cython-hidapi API this method wraps, pass
         `timeout=None` to disable the default timeout.
         """
+        _check_cancelled()
+        if self.dispatcher:
+            return self.dispatcher.read(timeout=timeout)[:length]
         self.hiddev.set_nonblocking(False)
-        if timeout is None:
-            timeout = 0  # cython-hidapi uses 0 for no timeout
-        elif timeout == 0:
-            timeout = 1  # smallest timeout forwarded to hid_read_timeout
-        data = self.hiddev.read(max_length=length, timeout_ms=timeout)
-        if timeout and not data:
+        cancel = _cancel_event()
+        remaining = timeout
+        while True:
+            step = remaining
+            if cancel is not None and (step is None or step > _CANCEL_POLL_MS):
+                step = _CANCEL_POLL_MS  # wait in small steps to notice cancellation
+            if step is None:
+                timeout_ms = 0  # cython-hidapi uses 0 for no timeout
+            else:
+                timeout_ms = max(step, 1)  # smallest timeout forwarded to hid_read_timeout
+            data = self.hiddev.read(max_length=length, timeout_ms=timeout_ms)
+            if data or step is None:
+                break
+            if remaining is not None:
+                remaining -= step
+                if remaining <= 0:
+                    break
+            _check_cancelled()
+        if timeout is not None and not data:
             _LOGGER.debug('failed to read, timed out after %d ms', timeout)
             raise Timeout()
         _LOGGER.debug('read %d bytes: %r', len(data), LazyHexRepr(data))
@@ -474,7 +893,11 @@ class HidapiDevice:
         > report number.  If the device does not use numbered reports, the
         > first byte should be set to 0. The report data itself should begin
         > at the second byte.
+
+        `data` can be a list of integers or any bytes-like object, like the
+        view returned by `ReportBuffer.fill`; it is passed to hidapi as-is.
         """
+        _check_cancelled()
         _LOGGER.debug('writing report 0x%02x with %d bytes: %r', data[0],
                       len(data) - 1, LazyHexRepr(data, start=1))
         res = self.hiddev.write(data)
@@ -494,6 +917,7 @@ class HidapiDevice:
         report ID (or 0), and the report data itself will being at the second
         byte.
         """
+        _check_cancelled()
         data = self.hiddev.get_input_report(report_id, length)
         _LOGGER.debug('got input report 0x%02x with %d bytes: %r', data[0],
                       len(data) - 1, LazyHexRepr(data, start=1))
@@ -509,6 +933,7 @@ class HidapiDevice:
         report ID (or 0), and the report data itself will being at the second
         byte.
         """
+        _check_cancelled()
         data = self.hiddev.get_feature_report(report_id, length)
         _LOGGER.debug('got feature report 0x%02x with %d bytes: %r', data[0],
                       len(data) - 1, LazyHexRepr(data, start=1))
@@ -524,6 +949,7 @@ class HidapiDevice:
         > first byte should be set to 0. The report data itself should begin
         > at the second byte.
         """
+        _check_cancelled()
         _LOGGER.debug('sending feature report 0x%02x with %d bytes: %r',
                       data[0], len(data) - 1, LazyHexRepr(data, start=1))
         res = self.hiddev.send_feature_report(data)
@@ -577,65 +1003,446 @@ class HidapiDevice:
         return type(self) == type(other) and self.bus == other.bus and self.address == other.address
 
 
-class HidapiBus(BaseBus):
-    def find_devices(self, vendor=None, product=None, bus=None, address=None,
-                     usb_port=None, **kwargs):
-        """Find compatible HID devices."""
-        handles = HidapiDevice.enumerate(hid, vendor, product)
-        drivers = sorted(find_all_subclasses(UsbHidDriver), key=lambda x: x.__name__)
-        _LOGGER.debug('searching %s', self.__class__.__name__)
-        _LOGGER.debug(
-            '%s drivers: %s',
-            self.__class__.__name__,
-            ', '.join(map(lambda x: x.__name__, drivers))
-        )
-        for handle in handles:
-            if bus and handle.bus != bus:
-                continue
-            if address and handle.address != address:
-                continue
-            if usb_port and handle.port != usb_port:
+class ReportBuffer:
+    """Preallocated buffer for outgoing reports of a fixed length.
+
+    Avoids building and padding a new list for every report:
+
+        self._out = ReportBuffer(64)
+        ...
+        self.device.write(self._out.fill([0x74, 0x01]))
+
+    The returned view is only valid until the next call to `fill`, so it
+    should not be kept after the write.
+
+    Unstable API.
+    """
+
+    def __init__(self, length):
+        self._buf = bytearray(length)
+        self._view = memoryview(self._buf)
+        self._zeros = memoryview(bytes(length))
+
+    def __len__(self):
+        return len(self._buf)
+
+    def fill(self, data, offset=0):
+        """Copy `data` to `offset`, zero the rest and return a view of the buffer."""
+        end = offset + len(data)
+        if end > len(self._buf):
+            raise ValueError(f'report too long: {end} bytes, maximum is {len(self._buf)}')
+        self._buf[:offset] = self._zeros[:offset]
+        self._buf[offset:end] = data
+        self._buf[end:] = self._zeros[end:]
+        return self._view
+
+
+class HidapiReportDispatcher:
+    """Read the reports of a hidapi device in the background, routing them by key.
+
+    Reports are queued by their keys, which by default are their first two
+    bytes: in many protocols, this prefix identifies the kind of message.  The
+    latest report with each key, and when it arrived, is also kept aside.
+    Drivers can then wait for a specific reply without discarding other
+    reports, like the status reports that some devices push periodically, and
+    reuse a recent status report instead of waiting for the next one.
+
+    Timeouts are in milliseconds, like in `HidapiDevice.read`.
+
+    Unstable API.
+    """
+
+    def __init__(self, hiddev, length, key=None):
+        self._hiddev = hiddev
+        self._length = length
+        self._key = key or (lambda data: bytes(data[:2]))
+        self._cond = threading.Condition()
+        self._queues = {}
+        self._latest = {}
+        self._seq = 0
+        self._error = None
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        """Start the background reader."""
+        self._thread = threading.Thread(target=self._run, name='liquidctl-hid-reader',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background reader and wait for it to finish."""
+        with self._cond:
+            self._stopping = True
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                data = self._hiddev.read(max_length=self._length, timeout_ms=_DISPATCH_POLL_MS)
+                if not data:
+                    continue
+                _LOGGER.debug('read %d bytes: %r', len(data), LazyHexRepr(data))
+                key = self._key(data)
+            except Exception as err:
+                # e.g. the device was disconnected, or sent an unexpected
+                # report; let the readers know instead of leaving them waiting
+                with self._cond:
+                    self._error = err
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._seq += 1
+                queue = self._queues.get(key)
+                if queue is None:
+                    queue = self._queues[key] = deque(maxlen=_DISPATCH_MAX_QUEUED)
+                queue.append((self._seq, data))
+                self._latest[key] = (time.monotonic(), data)
+                self._cond.notify_all()
+
+    def mark(self):
+        """Return a marker for reports received so far, for `read(after=...)`."""
+        with self._cond:
+            return self._seq
+
+    def clear(self):
+        """Discard all queued reports, but not the latest report with each key."""
+        with self._cond:
+            discarded = sum(len(queue) for queue in self._queues.values())
+            for queue in self._queues.values():
+                queue.clear()
+        _LOGGER.debug('discarded %d previously enqueued reports', discarded)
+
+    def read(self, keys=None, *, after=None, timeout=_DEFAULT_TIMEOUT_MS):
+        """Return the oldest queued report with one of `keys`.
+
+        Waits for one if necessary.  If `keys` is None, any report is
+        returned.  If `after` is passed, reports received before the
+        corresponding call to `mark` are discarded.  Reports with other keys
+        are kept in their queues.
+
+        Pass `timeout=None` to wait forever.  Raises `Timeout` if no report
+        arrives in time, or the error that stopped the background reader.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout / 1000
+        cancel = _cancel_event()
+        with self._cond:
+            while True:
+                data = self._pop(keys, after)
+                if data is not None:
+                    return data
+                if self._error:
+                    raise self._error
+                _check_cancelled()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    _LOGGER.debug('failed to read, timed out after %d ms', timeout)
+                    raise Timeout()
+                if cancel is not None and (remaining is None or remaining > _CANCEL_POLL_MS / 1000):
+                    remaining = _CANCEL_POLL_MS / 1000
+                self._cond.wait(remaining)
+
+    def latest(self, key, max_age):
+        """Return the latest report with `key`, or None if older than `max_age` seconds."""
+        with self._cond:
+            latest = self._latest.get(key)
+            if latest and time.monotonic() - latest[0] <= max_age:
+                return latest[1]
+            return None
+
+    def read_recent(self, key, max_age, *, timeout=_DEFAULT_TIMEOUT_MS):
+        """Return the latest report with `key`, unless older than `max_age` seconds.
+
+        Otherwise wait for the next report with that key.
+        """
+        with self._cond:
+            data = self.latest(key, max_age)
+            if data is not None:
+                return data
+            after = self._seq
+        return self.read([key], after=after, timeout=timeout)
+
+    def _pop(self, keys, after):
+        oldest = None
+        for key, queue in self._queues.items():
+            if keys is not None and key not in keys:
                 continue
-            # each handle is a HIDAPI hid_device, and that can either mean one
-            # entire HID interface, or one interface ⨯ usage page ⨯ usage id
-            # product, depending on the platform and backend; but, for brevity,
-            # refer them simply as "HID devices"
-            if 'usage' in handle.hidinfo and 'usage_page' in handle.hidinfo:
-                _LOGGER.debug(
-                    'HID device: %04x:%04x (usage_page=%#06x usage=%#06x)',
-                    handle.vendor_id,
-                    handle.product_id,
-                    handle.hidinfo['usage_page'],
-                    handle.hidinfo['usage'],
-                )
-            else:
-                _LOGGER.debug(
-                    'HID device: %04x:%04x (usage n/a)',
-                    handle.vendor_id,
-                    handle.product_id,
-                )
-            for drv in drivers:
-                yield from drv.probe(handle, vendor=vendor, product=product, **kwargs)
+            while queue and after is not None and queue[0][0] <= after:
+                queue.popleft()
+            if queue and (oldest is None or queue[0][0] < oldest[0][0]):
+                oldest = queue
+        return oldest.popleft()[1] if oldest else None
+
+
+class _DriverIndex:
+    """Index of USB drivers by the (vendor id, product id) pairs they probe.
 
+    Built once for each set of loaded drivers and `--match` filter, and used by
+    the buses to only probe each handle with its candidate drivers.
+    """
+
+    def __init__(self, drivers, match=None):
+        self._order = {drv: i for i, drv in enumerate(drivers)}
+        self._products = {}
+        self._vendors = {}
+        for drv in drivers:
+            for vid, pid in drv.probe_ids(match=match):
+                if pid is None:
+                    candidates = self._vendors.setdefault(vid, [])
+                else:
+                    candidates = self._products.setdefault((vid, pid), [])
+                if drv not in candidates:
+                    candidates.append(drv)
+
+    def candidates(self, vendor_id, product_id):
+        """Return the drivers to probe for a device, in the original order."""
+        exact = self._products.get((vendor_id, product_id), [])
+        any_product = self._vendors.get(vendor_id)
+        if not any_product:
+            return exact
+        return sorted(set(exact).union(any_product), key=self._order.get)
+
+    def can_match(self, vendor=None, product=None):
+        """Check whether any driver can match a device with these IDs."""
+        for vid, pid in self._products:
+            if (not vendor or vendor == vid) and (not product or product == pid):
+                return True
+        return any(not vendor or vendor == vid for vid in self._vendors)
+
+
+@lru_cache(maxsize=8)
+def _driver_index(drivers, match=None):
+    return _DriverIndex(drivers, match=match)
+
+
+class _UsbBusMixin:
+    """Shared implementation of HidapiBus and PyUsbBus.
+
+    Also implements the device inventory protocol (see:
+    liquidctl.driver.inventory).
+    """
+
+    def _drivers(self):
+        return sorted(find_all_subclasses(self._DRIVER_BASE), key=lambda x: x.__name__)
+
+    def _select(self, vendor=None, product=None, bus=None, usb_port=None, match=None):
+        """Check whether any device on this bus can match the selection filters.
+
+        Considers both the registered drivers, loaded or not, and any other
+        driver that has already been loaded.
+        """
+        if not self._can_match(bus, usb_port):
+            _LOGGER.debug('skipping %s, cannot match bus=%r or usb_port=%r',
+                          self.__class__.__name__, bus, usb_port)
+            return False
+        match = match.lower() if match else None
+        if not registry.can_match(self._REGISTRY_BUS, vendor, product, match) \
+                and not _driver_index(tuple(self._drivers()), match).can_match(vendor, product):
+            _LOGGER.debug('skipping %s, no driver can match vendor=%r, product=%r and match=%r',
+                          self.__class__.__name__, vendor, product, match)
+            return False
+        return True
+
+    def _load_drivers(self, handles):
+        """Load the registered drivers for `handles` and return all loaded drivers."""
+        ids = {(handle.vendor_id, handle.product_id) for handle in handles}
+        registry.load_drivers(self._REGISTRY_BUS, ids)
+        return self._drivers()
+
+    def _inventory_drivers(self):
+        # the registry stands for all drivers that ship with liquidctl, loaded or not
+        others = [driver_name(drv) for drv in self._drivers() if not registry.is_registered(drv)]
+        return [f'registry:{registry.signature()}'] + others
+
+    def _inventory_select(self, vendor=None, product=None, bus=None, usb_port=None,
+                          match=None, **kwargs):
+        return self._select(vendor, product, bus, usb_port, match)
+
+    def _inventory_entries(self):
+        handles = list(self._enumerate())
+        index = _driver_index(tuple(self._load_drivers(handles)))
+        entries = []
+        for handle in handles:
+            candidates = index.candidates(handle.vendor_id, handle.product_id)
+            if candidates:
+                names = [driver_name(drv) for drv in candidates]
+                entries.append((self._handle_info(handle), names))
+        return entries
+
+    def _find_devices_in_inventory(self, entries, vendor=None, product=None, bus=None,
+                                   address=None, usb_port=None, match=None, **kwargs):
+        if not self._select(vendor, product, bus, usb_port, match):
+            return
+        handles = []
+        for info, names in entries:
+            handle = self._handle_from_info(info)
+            if (vendor and handle.vendor_id != vendor) \
+                    or (product and handle.product_id != product):
+                continue
+            if self._accept(handle, bus, address, usb_port):
+                handles.append((handle, names))
+        drivers = self._load_drivers([handle for handle, _ in handles])
+        index = _driver_index(tuple(drivers), match.lower() if match else None)
+        for handle, names in handles:
+            for drv in index.candidates(handle.vendor_id, handle.product_id):
+                if driver_name(drv) in names:
+                    yield from drv.probe(handle, vendor=vendor, product=product, match=match,
+                                         **kwargs)
 
-class PyUsbBus(BaseBus):
     def find_devices(self, vendor=None, product=None, bus=None, address=None,
-                     usb_port=None, **kwargs):
-        """ Find compatible regular USB devices."""
-        drivers = sorted(find_all_subclasses(UsbDriver), key=lambda x: x.__name__)
+                     usb_port=None, match=None, **kwargs):
+        """Find compatible devices."""
+        if not self._select(vendor, product, bus, usb_port, match):
+            return
+        handles = [handle for handle in self._enumerate(vendor, product)
+                   if self._accept(handle, bus, address, usb_port)]
+        yield from self._probe_handles(handles, vendor=vendor, product=product, match=match,
+                                       **kwargs)
+
+    def _watch_handles(self, vendor=None, product=None, bus=None, address=None,
+                       usb_port=None, match=None, **kwargs):
+        """Return the handles that can match the selection filters, by key.
+
+        Keys change when a device is unplugged and plugged back in.  Used by
+        liquidctl.driver.watcher, together with _probe_handles.
+        """
+        if not self._select(vendor, product, bus, usb_port, match):
+            return {}
+        return {self._handle_key(handle): handle
+                for handle in self._enumerate(vendor, product)
+                if self._accept(handle, bus, address, usb_port)}
+
+    def _probe_handles(self, handles, vendor=None, product=None, match=None, **kwargs):
+        index = self._search(handles, match)
+        for handle in handles:
+            self._log_handle(handle)
+            for drv in index.candidates(handle.vendor_id, handle.product_id):
+                yield from drv.probe(handle, vendor=vendor, product=product, match=match,
+                                     **kwargs)
+
+    def _search(self, handles, match):
+        """Load the drivers for `handles` and return the resulting index."""
+        drivers = self._load_drivers(handles)
         _LOGGER.debug('searching %s', self.__class__.__name__)
         _LOGGER.debug(
             '%s drivers: %s',
             self.__class__.__name__,
             ', '.join(map(lambda x: x.__name__, drivers))
         )
-        for handle in PyUsbDevice.enumerate(vendor, product):
-            if bus and handle.bus != bus:
-                continue
-            if address and str(handle.address) != address:
-                continue
-            if usb_port and handle.port != usb_port:
-                continue
-            _LOGGER.debug('USB device: %04x:%04x', handle.vendor_id, handle.product_id)
-            for drv in drivers:
-                yield from drv.probe(handle, vendor=vendor, product=product, **kwargs)
+        return _driver_index(tuple(drivers), match.lower() if match else None)
+
+
+class HidapiBus(_UsbBusMixin, BaseBus):
+    _DRIVER_BASE = UsbHidDriver
+    _REGISTRY_BUS = 'hid'
+    _INVENTORY_PATHS = ['class/hidraw', 'bus/usb/devices']
+
+    @staticmethod
+    def _enumerate(vendor=None, product=None):
+        return HidapiDevice.enumerate(_hid_api(), vendor, product)
+
+    def _inventory_drivers(self):
+        # the backends do not enumerate devices in the same way
+        return super()._inventory_drivers() + [f'hid-backend:{_hid_backend()}']
+
+    @staticmethod
+    def _can_match(bus, usb_port):
+        # hidapi handles are always on the 'hid' bus and have no port numbers
+        return (not bus or bus == 'hid') and not usb_port
+
+    @staticmethod
+    def _accept(handle, bus, address, usb_port):
+        if bus and handle.bus != bus:
+            return False
+        if address and handle.address != address:
+            return False
+        if usb_port and handle.port != usb_port:
+            return False
+        return True
+
+    @staticmethod
+    def _handle_key(handle):
+        try:
+            # hidraw nodes are recreated, with new inodes, when replugged
+            ino = os.stat(handle.path).st_ino
+        except (OSError, TypeError, ValueError):
+            ino = None
+        return (handle.path, ino)
+
+    @staticmethod
+    def _log_handle(handle):
+        # each handle is a HIDAPI hid_device, and that can either mean one
+        # entire HID interface, or one interface ⨯ usage page ⨯ usage id
+        # product, depending on the platform and backend; but, for brevity,
+        # refer them simply as "HID devices"
+        if 'usage' in handle.hidinfo and 'usage_page' in handle.hidinfo:
+            _LOGGER.debug(
+                'HID device: %04x:%04x (usage_page=%#06x usage=%#06x)',
+                handle.vendor_id,
+                handle.product_id,
+                handle.hidinfo['usage_page'],
+                handle.hidinfo['usage'],
+            )
+        else:
+            _LOGGER.debug(
+                'HID device: %04x:%04x (usage n/a)',
+                handle.vendor_id,
+                handle.product_id,
+            )
+
+    @staticmethod
+    def _handle_info(handle):
+        return handle.hidinfo
+
+    @staticmethod
+    def _handle_from_info(info):
+        return HidapiDevice(_hid_api(), info)
+
+
+class PyUsbBus(_UsbBusMixin, BaseBus):
+    _DRIVER_BASE = UsbDriver
+    _REGISTRY_BUS = 'usb'
+    _INVENTORY_PATHS = ['bus/usb/devices']
+
+    @staticmethod
+    def _enumerate(vendor=None, product=None):
+        return PyUsbDevice.enumerate(vendor, product)
+
+    @staticmethod
+    def _can_match(bus, usb_port):
+        return not bus or bus.startswith('usb')
+
+    @staticmethod
+    def _accept(handle, bus, address, usb_port):
+        if bus and handle.bus != bus:
+            return False
+        if address and str(handle.address) != address:
+            return False
+        if usb_port and handle.port != usb_port:
+            return False
+        return True
+
+    @staticmethod
+    def _handle_key(handle):
+        # device addresses are not reused right away when a device is replugged
+        return (handle.bus, handle.address)
+
+    @staticmethod
+    def _log_handle(handle):
+        _LOGGER.debug('USB device: %04x:%04x', handle.vendor_id, handle.product_id)
+
+    @staticmethod
+    def _handle_info(handle):
+        usbdev = handle.usbdev
+        return {
+            'idVendor': usbdev.idVendor,
+            'idProduct': usbdev.idProduct,
+            'bcdDevice': usbdev.bcdDevice,
+            'bus': usbdev.bus,
+            'address': usbdev.address,
+            'port_numbers': usbdev.port_numbers,
+        }
+
+    @staticmethod
+    def _handle_from_info(info):
+        return PyUsbDevice(_InventoryUsbCoreDevice(info))
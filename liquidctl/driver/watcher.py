@@ -0,0 +1,270 @@
+"""Watch for devices being added or removed.
+
+Long running programs can use a `DeviceWatcher` to keep track of the devices
+that are connected, instead of either enumerating all buses once at startup,
+or periodically enumerating and probing them all again.
+
+    from liquidctl.driver.watcher import DeviceWatcher
+
+    with DeviceWatcher(match='kraken') as watcher:
+        for event in watcher:
+            print(event.action, event.device.description)
+
+The watcher keeps an inventory of the handles found on each bus.  When a
+change is detected, it only probes the handles that are new, and reports the
+devices of handles that have disappeared as removed.
+
+Changes are detected, in order of preference, through:
+
+- the kernel uevent netlink socket (Linux);
+- polling the relevant directories in `/sys` (Linux);
+- periodically enumerating, but not probing, the buses.
+
+Buses that do not support the watcher, like the I²C bus, are only searched
+once, when the watcher starts.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import logging
+import select
+import socket
+import time
+from collections import namedtuple
+
+from liquidctl.driver.inventory import sysfs_fingerprint
+
+_LOGGER = logging.getLogger(__name__)
+
+_NETLINK_KOBJECT_UEVENT = 15
+_KERNEL_EVENTS_GROUP = 1
+_UEVENT_SUBSYSTEMS = {"usb", "hid", "hidraw"}
+_UEVENT_ACTIONS = {"add", "remove", "bind", "unbind"}
+
+ADDED = "add"
+REMOVED = "remove"
+
+DeviceEvent = namedtuple("DeviceEvent", ["action", "device"])
+DeviceEvent.__doc__ = """A device was added or removed.
+
+`action` is either `ADDED` or `REMOVED`, and `device` is a driver instance.
+Added devices are ready to be connected to; for removed devices, callers are
+responsible for calling `disconnect` if they had connected to them.
+"""
+
+
+def parse_uevent(message):
+    """Parse a kernel uevent message into a dict of its properties."""
+
+    props = {}
+    for field in message.split(b"\0")[1:]:
+        key, sep, value = field.partition(b"=")
+        if sep:
+            props[key.decode(errors="replace")] = value.decode(errors="replace")
+    return props
+
+
+class DeviceWatcher:
+    """Watch for devices being added or removed.
+
+    Selection filters can be passed through `**kwargs`, like with
+    `find_liquidctl_devices`; `pick` is not supported.
+
+    Unstable API.
+    """
+
+    def __init__(self, poll_interval=2.0, settle_time=0.5, netlink=True, buses=None, **kwargs):
+        self._poll_interval = poll_interval
+        self._settle_time = settle_time
+        self._netlink = netlink
+        self._buses = buses
+        self._kwargs = kwargs
+        self._inventory = None
+        self._monitor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            yield from self.poll()
+
+    @property
+    def devices(self):
+        """Currently known devices, in the usual bus and enumeration order."""
+
+        if self._inventory is None:
+            return []
+        devices = []
+        for _, handles in self._inventory:
+            for devs in handles.values():
+                devices.extend(devs)
+        return devices
+
+    def poll(self, timeout=None):
+        """Wait for changes and return the resulting list of events.
+
+        The first call returns an `ADDED` event for each device that is already
+        connected.  Afterwards, waits up to `timeout` seconds (or indefinitely)
+        for a change, and returns an empty list if there was none.
+        """
+
+        if self._inventory is None:
+            return self._start()
+        if not self._monitor.wait(timeout):
+            return []
+        return self._rescan()
+
+    def close(self):
+        """Stop watching for changes."""
+
+        if self._monitor:
+            self._monitor.close()
+            self._monitor = None
+
+    def _start(self):
+        from liquidctl.driver import _find_buses
+
+        if self._buses is None:
+            self._buses = [bus_cls() for bus_cls in _find_buses()]
+
+        # start monitoring before the first scan, so that no change is missed
+        self._monitor = self._make_monitor()
+
+        self._inventory = []
+        events = []
+        for bus in self._buses:
+            if hasattr(bus, "_watch_handles"):
+                self._inventory.append((bus, {}))
+            else:
+                _LOGGER.debug("%s does not support watching, searching once", type(bus).__name__)
+                devs = list(bus.find_devices(**self._kwargs))
+                self._inventory.append((None, {None: devs}))
+                events.extend(DeviceEvent(ADDED, dev) for dev in devs)
+        return events + self._rescan()
+
+    def _rescan(self):
+        events = []
+        for bus, known in self._inventory:
+            if bus is None:
+                continue
+            current = bus._watch_handles(**self._kwargs)
+            for key in [key for key in known if key not in current]:
+                events.extend(DeviceEvent(REMOVED, dev) for dev in known.pop(key))
+            for key, handle in current.items():
+                if key in known:
+                    continue
+                # also remember handles without devices, to never probe them again
+                known[key] = list(bus._probe_handles([handle], **self._kwargs))
+                events.extend(DeviceEvent(ADDED, dev) for dev in known[key])
+        return events
+
+    def _make_monitor(self):
+        if self._netlink:
+            try:
+                return _NetlinkMonitor(self._settle_time)
+            except (AttributeError, OSError) as err:
+                _LOGGER.debug("uevent netlink socket not available: %r", err)
+        paths = sorted({x for bus in self._buses for x in getattr(bus, "_INVENTORY_PATHS", [])})
+        if paths and sysfs_fingerprint(paths) is not None:
+            return _SysfsMonitor(paths, self._poll_interval, self._settle_time)
+        return _PollingMonitor(self._poll_interval)
+
+
+class _NetlinkMonitor:
+    """Wait for kernel uevents of USB and HID devices."""
+
+    def __init__(self, settle_time):
+        self._settle_time = settle_time
+        self._relevant = False
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_KOBJECT_UEVENT)
+        try:
+            self._sock.bind((0, _KERNEL_EVENTS_GROUP))
+        except OSError:
+            self._sock.close()
+            raise
+        _LOGGER.debug("watching uevent netlink socket")
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            if not self._receive(remaining):
+                return False
+            if self._relevant:
+                # coalesce bursts of events, and give udev time to set permissions
+                self._relevant = False
+                while self._receive(self._settle_time):
+                    pass
+                return True
+
+    def close(self):
+        self._sock.close()
+
+    def _receive(self, timeout):
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if not ready:
+            return False
+        props = parse_uevent(self._sock.recv(65536))
+        if props.get("SUBSYSTEM") in _UEVENT_SUBSYSTEMS and props.get("ACTION") in _UEVENT_ACTIONS:
+            _LOGGER.debug("uevent: %s %s", props["ACTION"], props.get("DEVPATH"))
+            self._relevant = True
+        return True
+
+
+class _SysfsMonitor:
+    """Poll sysfs directories for changes."""
+
+    def __init__(self, paths, poll_interval, settle_time):
+        self._paths = paths
+        self._poll_interval = poll_interval
+        self._settle_time = settle_time
+        self._fingerprint = sysfs_fingerprint(paths)
+        _LOGGER.debug("polling %s", ", ".join(paths))
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining < self._poll_interval:
+                time.sleep(max(0, remaining))
+                return self._changed()
+            time.sleep(self._poll_interval)
+            if self._changed():
+                return True
+
+    def close(self):
+        pass
+
+    def _changed(self):
+        fingerprint = sysfs_fingerprint(self._paths)
+        if fingerprint == self._fingerprint:
+            return False
+        time.sleep(self._settle_time)
+        self._fingerprint = sysfs_fingerprint(self._paths)
+        return True
+
+
+class _PollingMonitor:
+    """Periodically report a possible change."""
+
+    def __init__(self, poll_interval):
+        self._poll_interval = poll_interval
+
+    def wait(self, timeout):
+        if timeout is not None and timeout < self._poll_interval:
+            time.sleep(timeout)
+            return False
+        time.sleep(self._poll_interval)
+        return True
+
+    def close(self):
+        pass
@@ -59,3 +59,13 @@ class Timeout(LiquidctlError):
 
     def __str__(self) -> str:
         return "operation timed out"
+
+
+class DeviceBusy(LiquidctlError):
+    """Device kept busy by another program for too long.
+
+    Unstable.
+    """
+
+    def __str__(self) -> str:
+        return "device busy, in use by another program"
@@ -6,9 +6,10 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
 import os
+import re
 import stat
 import sys
-import tempfile
+import time
 from ast import literal_eval
 from contextlib import contextmanager
 
@@ -48,8 +49,55 @@ def get_runtime_dirs(appname='liquidctl'):
     return dirs
 
 
+def device_key(dev):
+    """Return a key prefix that identifies `dev` across connections.
+
+    The key is based on the serial number of the device or, if that is not
+    available, on its location.
+
+    Unstable API.
+    """
+    try:
+        serial_number = dev.serial_number
+    except Exception:
+        serial_number = None
+    if serial_number:
+        location = serial_number
+    elif dev.port:
+        location = f'{dev.bus}_{".".join(map(str, dev.port))}'
+    else:
+        location = f'{dev.bus}_{dev.address}'
+    key = f'{type(dev).__name__}_{dev.vendor_id or 0:04x}_{dev.product_id or 0:04x}_{location}'
+    return re.sub(r'\W', '_', key)
+
+
+def _lock_file(f, shared, timeout):
+    if timeout is None:
+        if sys.platform == 'win32':
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        elif shared:
+            fcntl.flock(f, fcntl.LOCK_SH)
+        else:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        return
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if sys.platform == 'win32':
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+            return
+        except (BlockingIOError, PermissionError):
+            # msvcrt raises PermissionError (EACCES) when the region is locked
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'{f.name} still locked after {timeout} seconds') from None
+            time.sleep(0.01)
+
+
 @contextmanager
-def _open_with_lock(path, flags, *, shared=False):
+def _open_with_lock(path, flags, *, shared=False, timeout=None):
     # os.O_ACCMODE does not exist on Windows
     access = flags & (os.O_RDONLY | os.O_WRONLY | os.O_RDWR)
     if access == os.O_RDWR:
@@ -62,12 +110,7 @@ def _open_with_lock(path, flags, *, shared=False):
         raise ValueError(f'Invalid os.open() flags: {flags}')
 
     with os.fdopen(os.open(path, flags, 0o666), mode=write_mode) as f:
-        if sys.platform == 'win32':
-            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
-        elif shared:
-            fcntl.flock(f, fcntl.LOCK_SH)
-        else:
-            fcntl.flock(f, fcntl.LOCK_EX)
+        _lock_file(f, shared, timeout)
 
         yield f
 
@@ -216,6 +259,16 @@ class _FilesystemBackend:
 
         return (value, new_value)
 
+    @contextmanager
+    def lock(self, key, timeout):
+        path = os.path.join(self._write_dir, key)
+
+        with _open_with_lock(path, os.O_RDWR | os.O_CREAT, timeout=timeout):
+            _LOGGER.debug('locked %s', path)
+            yield
+
+        _LOGGER.debug('unlocked %s', path)
+
 
 class RuntimeStorage:
     """Unstable API."""
@@ -253,3 +306,14 @@ class RuntimeStorage:
         """Unstable API."""
         self._backend.store(key, value)
         return value
+
+    def lock(self, key, timeout=None):
+        """Hold an exclusive lock on `key`, shared with other processes.
+
+        Returns a context manager.  Waits up to `timeout` seconds, or forever
+        if `timeout` is None, and raises `TimeoutError` if the lock could not
+        be acquired by then.  The value of `key` is not changed.
+
+        Unstable API.
+        """
+        return self._backend.lock(key, timeout)
@@ -0,0 +1,343 @@
+"""Record device transactions, and replay them without the driver logic.
+
+Initializing and configuring a device sends the same bytes every time, given
+the same settings and firmware.  A `Transcript` records the transfers made by
+each operation (e.g. `initialize` or `set_color`), along with the headers of
+the replies that were read, and can later replay them directly through the
+`HidapiDevice` or `PyUsbDevice` handle:
+
+    transcript = Transcript.load("boot.transcript")
+    with dev.connect():
+        transcript.run(dev, "set fan speed 50", lambda: dev.set_fixed_speed("fan", 50))
+
+An operation is only replayed if it was recorded on the same device, with the
+same release number (which usually changes with the firmware version), and
+the same settings, as identified by the caller.  The replies read during the
+replay must also begin like the recorded ones.  Otherwise, the operation is
+run normally, and (optionally) recorded again.
+
+Replies that the driver read and discarded while waiting for the one it
+wanted, like unsolicited status reports, are tolerated.  Pauses longer than a
+few milliseconds between transfers are reproduced, since drivers use them to
+give devices time to process a command.  Changes the driver made to its
+`RuntimeStorage` are recorded and replayed as well, but not the state kept in
+the driver instance itself.
+
+Operations of devices accessed through a kernel driver (hwmon) are not
+recorded, unless direct access was requested, since part of what they do does
+not go through the handle.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from ast import literal_eval
+
+from liquidctl.driver.usb import BaseUsbDriver
+from liquidctl.error import LiquidctlError, Timeout
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+
+# the bytes of each reply that are checked during a replay
+_HEADER_LENGTH = 2
+
+# pauses between transfers that are kept, in seconds
+_MIN_DELAY = 0.005
+
+# unexpected replies tolerated while waiting for the expected one
+_MAX_EXTRA_READS = 8
+
+_READ_METHODS = ["read", "get_input_report", "get_feature_report"]
+_TRANSFER_METHODS = _READ_METHODS + [
+    "write",
+    "send_feature_report",
+    "ctrl_transfer",
+    "clear_enqueued_reports",
+]
+
+
+class ReplayMismatch(LiquidctlError):
+    """The device did not reply as it did when the transcript was recorded.
+
+    Unstable API.
+    """
+
+    def __init__(self, message):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class Transcript:
+    """Recorded device transactions, by device and operation.
+
+    Unstable API.
+    """
+
+    def __init__(self, devices=None, record=False):
+        self._recorded = devices or []
+        self._record = record
+        self._devices = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, record=False):
+        """Load a transcript from `path`."""
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != _FORMAT_VERSION:
+            raise ValueError("unsupported transcript version")
+        return cls(data["devices"], record=record)
+
+    def save(self, path):
+        """Save the operations replayed or recorded so far to `path`.
+
+        Operations loaded but not used are discarded.
+        """
+
+        with self._lock:
+            data = {"version": _FORMAT_VERSION, "devices": self._devices}
+            text = json.dumps(data, separators=(",", ":"))
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def run(self, dev, operation, func, direct_access=False):
+        """Replay `operation` on `dev`, or call `func` to run it normally.
+
+        `operation` is a string that identifies the operation and all of its
+        settings.  `dev` must already be connected.  Returns what `func`
+        returned, either now or when the operation was recorded.
+        """
+
+        recorded = self._find(self._recorded, dev)
+        entry = recorded and recorded["operations"].get(operation)
+        if entry and recorded["release_number"] != dev.release_number:
+            _LOGGER.info("%s: release number changed, not replaying", dev.description)
+        elif entry:
+            try:
+                result = _replay(dev, entry)
+            except ReplayMismatch as err:
+                _LOGGER.info("%s: %s, running normally", dev.description, err)
+            else:
+                _LOGGER.info("%s: replayed %s", dev.description, operation)
+                self._add(dev, operation, entry)
+                return result
+
+        if not self._record:
+            return func()
+        if not isinstance(dev, BaseUsbDriver):
+            _LOGGER.info("%s: cannot record, unsupported handle", dev.description)
+            return func()
+        if getattr(dev, "_hwmon", None) and not direct_access:
+            _LOGGER.info("%s: cannot record, kernel driver in use", dev.description)
+            return func()
+
+        result, transactions = _record(dev, func)
+        self._add(dev, operation, {"transactions": transactions, "result": _encode(result)})
+        return result
+
+    def _add(self, dev, operation, entry):
+        with self._lock:
+            recorded = self._find(self._devices, dev)
+            if not recorded:
+                recorded = {**_identity(dev), "operations": {}}
+                self._devices.append(recorded)
+            recorded["operations"][operation] = entry
+
+    @staticmethod
+    def _find(devices, dev):
+        identity = _identity(dev)
+        for recorded in devices:
+            if all(recorded.get(k) == v for k, v in identity.items() if k != "release_number"):
+                return recorded
+        return None
+
+
+def _identity(dev):
+    try:
+        serial_number = dev.serial_number
+    except Exception:
+        serial_number = None
+    return {
+        "driver": type(dev).__name__,
+        "vendor_id": dev.vendor_id,
+        "product_id": dev.product_id,
+        "release_number": dev.release_number,
+        "serial_number": serial_number,
+        # only distinguishes devices without serial numbers
+        "port": None if serial_number else list(dev.port or []),
+    }
+
+
+class _RecordingHandle:
+    """Pass calls through to a handle, recording its transfers."""
+
+    def __init__(self, handle, transactions):
+        self._handle = handle
+        self._transactions = transactions
+        self._last = time.perf_counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._handle, name)
+        if name not in _TRANSFER_METHODS:
+            return attr
+
+        def transfer(*args, **kwargs):
+            delay = time.perf_counter() - self._last
+            result = attr(*args, **kwargs)
+            self._last = time.perf_counter()
+            transaction = {"call": name, "args": [_encode_bytes(x) for x in args]}
+            if kwargs:
+                transaction["kwargs"] = {k: _encode_bytes(v) for k, v in kwargs.items()}
+            if not isinstance(result, int) and result is not None:
+                transaction["reply"] = bytes(result[:_HEADER_LENGTH]).hex()
+            if delay >= _MIN_DELAY:
+                transaction["delay"] = round(delay, 3)
+            self._transactions.append(transaction)
+            return result
+
+        return transfer
+
+
+class _RecordingStorage:
+    """Pass calls through to a `RuntimeStorage`, recording changes."""
+
+    def __init__(self, storage, transactions):
+        self._storage = storage
+        self._transactions = transactions
+
+    def __getattr__(self, name):
+        attr = getattr(self._storage, name)
+        if name not in ["store", "load_store"]:
+            return attr
+
+        def change(key, *args, **kwargs):
+            result = attr(key, *args, **kwargs)
+            value = self._storage.load(key)
+            self._transactions.append({"call": "store", "args": [key, repr(value)]})
+            return result
+
+        return change
+
+
+def _record(dev, func):
+    transactions = []
+    handle = dev.device
+    storage = getattr(dev, "_data", None)
+    dev.device = _RecordingHandle(handle, transactions)
+    if storage is not None:
+        dev._data = _RecordingStorage(storage, transactions)
+    try:
+        result = func()
+    finally:
+        dev.device = handle
+        if storage is not None:
+            dev._data = storage
+    return result, transactions
+
+
+def _replay(dev, entry):
+    transactions = entry["transactions"]
+    pos = 0
+    while pos < len(transactions):
+        transaction = transactions[pos]
+        call = transaction["call"]
+        args = [_decode_bytes(x) for x in transaction["args"]]
+        kwargs = {k: _decode_bytes(v) for k, v in transaction.get("kwargs", {}).items()}
+        if "delay" in transaction:
+            time.sleep(transaction["delay"])
+
+        if call == "store":
+            key, value = args
+            dev._data.store(key, literal_eval(value))
+        elif call == "read":
+            # drivers may read and discard other reports until they get the
+            # reply they want, which is the last in a run of reads
+            end = pos
+            while end + 1 < len(transactions) and transactions[end + 1]["call"] == "read":
+                end += 1
+            expected = transactions[end]["reply"]
+            for _ in range(end - pos + 1 + _MAX_EXTRA_READS):
+                reply = _read_reply(dev.device, args, kwargs)
+                if reply == expected:
+                    break
+            else:
+                raise ReplayMismatch(f"expected a reply starting with {expected}")
+            pos = end
+        else:
+            result = getattr(dev.device, call)(*args, **kwargs)
+            expected = transaction.get("reply")
+            if expected is not None:
+                reply = bytes(result[:_HEADER_LENGTH]).hex()
+                if reply != expected:
+                    raise ReplayMismatch(f"expected a reply starting with {expected}, got {reply}")
+        pos += 1
+    return _decode(entry["result"])
+
+
+def _read_reply(handle, args, kwargs):
+    try:
+        reply = handle.read(*args, **kwargs)
+    except Timeout:
+        reply = None
+    if not reply:
+        raise ReplayMismatch("timed out waiting for a reply")
+    return bytes(reply[:_HEADER_LENGTH]).hex()
+
+
+def _encode_bytes(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"hex": bytes(value).hex()}
+    if isinstance(value, list) and all(isinstance(x, int) for x in value):
+        return value
+    if hasattr(value, "tobytes"):
+        # e.g. array.array, as returned by PyUSB
+        return {"hex": value.tobytes().hex()}
+    return value
+
+
+def _decode_bytes(value):
+    if isinstance(value, dict) and "hex" in value:
+        return bytes.fromhex(value["hex"])
+    return value
+
+
+def _encode(result):
+    if not result:
+        return None
+    encoded = []
+    for key, value, unit in result:
+        if isinstance(value, datetime.timedelta):
+            value = {"timedelta": value.total_seconds()}
+        elif not isinstance(value, (bool, int, float, str)) and value is not None:
+            # e.g. enums
+            value = str(value)
+        encoded.append([key, value, unit])
+    return encoded
+
+
+def _decode(result):
+    if result is None:
+        return None
+    decoded = []
+    for key, value, unit in result:
+        if isinstance(value, dict) and "timedelta" in value:
+            value = datetime.timedelta(seconds=value["timedelta"])
+        decoded.append((key, value, unit))
+    return decoded
@@ -0,0 +1,111 @@
+"""Share recently read device status between processes.
+
+Programs that poll the same device, like a metrics exporter, a desktop widget
+and a fan control loop, can each read its status several times per second.
+Each read is a full round trip to the device, and the reads contend for it.
+
+With this module, the latest status of each device is kept in a small file in
+the runtime directory.  Reads within `ttl` seconds of the last refresh, by any
+process, are served from that file.  Refreshes are coalesced: while one
+process reads from the device, others wait for it and then use its result.
+
+    from liquidctl import status_cache
+
+    with dev.connect():
+        status = status_cache.get_status(dev, ttl=1.0)
+
+Devices are identified by their serial numbers or, if those are not
+available, by their locations.  Keyword arguments are only forwarded to the
+driver on refreshes, and do not distinguish cached results.  When served from
+the cache, values other than numbers, strings, booleans, None and timedeltas
+(e.g. enums) are returned as strings.
+
+Unstable API.
+
+Copyright Jonas Malaco and contributors
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+# uses the psf/black style
+
+import datetime
+import logging
+import math
+import time
+
+from liquidctl.keyval import RuntimeStorage, device_key
+
+_LOGGER = logging.getLogger(__name__)
+
+_KEY = "latest"
+
+
+def get_status(dev, ttl, storage=None, **kwargs):
+    """Return the status of `dev`, reusing a result up to `ttl` seconds old.
+
+    `dev` must already be connected.  `storage` can be passed to override the
+    default `RuntimeStorage`.  Other `**kwargs` are forwarded to
+    `dev.get_status()` when a refresh is necessary.
+    """
+
+    # a status the device pushed within the TTL is just as good
+    kwargs.setdefault("max_age", ttl)
+
+    try:
+        storage = storage or RuntimeStorage(key_prefixes=["status", device_key(dev)])
+        entry = storage.load(_KEY, of_type=dict)
+        if _is_fresh(entry, ttl):
+            _LOGGER.debug("%s: reusing cached status", dev.description)
+            return _decode(entry["status"])
+    except OSError as err:
+        _LOGGER.warning("%s: status cache unavailable: %r", dev.description, err)
+        return dev.get_status(**kwargs)
+
+    refreshed = []
+
+    def refresh(entry):
+        # holding the exclusive lock: another process may have refreshed the
+        # status while this one waited for it
+        if _is_fresh(entry, ttl):
+            return entry
+        refreshed.append(dev.get_status(**kwargs))
+        return {"time": time.time(), "status": _encode(refreshed[0])}
+
+    _, entry = storage.load_store(_KEY, refresh, of_type=dict)
+    if refreshed:
+        return refreshed[0]
+    _LOGGER.debug("%s: reusing status refreshed by another process", dev.description)
+    return _decode(entry["status"])
+
+
+def _is_fresh(entry, ttl):
+    if not entry or "time" not in entry or "status" not in entry:
+        return False
+    # wall clock time is comparable between processes, but can go backwards
+    age = time.time() - entry["time"]
+    return 0 <= age <= ttl
+
+
+def _encode(status):
+    encoded = []
+    for key, value, unit in status or []:
+        if isinstance(value, datetime.timedelta):
+            value = {"timedelta": value.total_seconds()}
+        elif isinstance(value, float) and not math.isfinite(value):
+            value = {"float": repr(value)}
+        elif type(value) not in (bool, int, float, str, type(None)):
+            # e.g. enums, including IntEnums, whose reprs cannot be evaluated
+            value = str(value)
+        encoded.append((key, value, unit))
+    return encoded
+
+
+def _decode(status):
+    decoded = []
+    for key, value, unit in status:
+        if isinstance(value, dict) and "timedelta" in value:
+            value = datetime.timedelta(seconds=value["timedelta"])
+        elif isinstance(value, dict) and "float" in value:
+            value = float(value["float"])
+        decoded.append((key, value, unit))
+    return decoded
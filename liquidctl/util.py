@@ -12,8 +12,6 @@ from typing import Optional
 
 from functools import lru_cache
 
-import crcmod.predefined
-
 from liquidctl.error import UnsafeFeaturesNotEnabled
 
 _LOGGER = logging.getLogger(__name__)
@@ -535,4 +533,6 @@ def mkCrcFun(crc_name):
     algorithm implementation once.
     """
 
+    # only import crcmod when it is first needed, as most drivers never use it
+    import crcmod.predefined
     return crcmod.predefined.mkCrcFun(crc_name)
@@ -0,0 +1,121 @@
+# uses the psf/black style
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from _testutils import VirtualBusDevice
+
+from liquidctl import aio
+from liquidctl.driver.usb import HidapiDevice, UsbHidDriver
+from liquidctl.error import Timeout
+
+
+class _SlowDevice(VirtualBusDevice):
+    def __init__(self, calls):
+        super().__init__()
+        self.calls = calls
+
+    def get_status(self, delay=0, tag=None, **kwargs):
+        self.calls.append(("start", tag, threading.current_thread()))
+        time.sleep(delay)
+        self.calls.append(("end", tag, threading.current_thread()))
+        return [("Tag", tag, "")]
+
+
+def test_operations_on_one_device_are_ordered():
+    calls = []
+    dev = aio.AsyncDevice(_SlowDevice(calls))
+
+    async def main():
+        async with dev.connect():
+            return await asyncio.gather(
+                dev.get_status(delay=0.05, tag=1),
+                dev.get_status(tag=2),
+            )
+
+    assert asyncio.run(main()) == [[("Tag", 1, "")], [("Tag", 2, "")]]
+    assert [call[:2] for call in calls] == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    assert calls[0][2].name.startswith("liquidctl-aio")
+    assert dev.driver.connected is False
+
+
+def test_operations_on_different_devices_overlap():
+    calls = []
+    devs = [aio.AsyncDevice(_SlowDevice(calls)) for _ in range(2)]
+
+    async def main():
+        await asyncio.gather(*[dev.connect() for dev in devs])
+        await asyncio.gather(*[dev.get_status(delay=0.1, tag=i) for i, dev in enumerate(devs)])
+        await asyncio.gather(*[dev.disconnect() for dev in devs])
+
+    asyncio.run(main())
+    assert [call[0] for call in calls] == ["start", "start", "end", "end"]
+    assert calls[0][2] != calls[1][2]
+
+
+class _SilentHid:
+    def read(self, max_length, timeout_ms=0):
+        time.sleep(timeout_ms / 1000 if timeout_ms else 1)
+        return []
+
+    def set_nonblocking(self, value):
+        return 0
+
+    def close(self):
+        pass
+
+
+class _WaitingDriver(UsbHidDriver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = []
+
+    def get_status(self, **kwargs):
+        try:
+            self.device.read(64)  # default timeout of 5 seconds
+        except Timeout as err:
+            self.errors.append(err)
+            raise
+        return []
+
+    def set_fixed_speed(self, channel, duty, **kwargs):
+        pass
+
+
+@pytest.fixture
+def waiting_driver():
+    info = {"path": b"/dev/hidraw9", "vendor_id": 0, "product_id": 0}
+    hiddev = HidapiDevice(SimpleNamespace(device=_SilentHid), info)
+    return _WaitingDriver(hiddev, "Waiting")
+
+
+def test_cancellation_times_out_the_running_operation(waiting_driver):
+    dev = aio.AsyncDevice(waiting_driver)
+
+    async def main():
+        task = asyncio.create_task(dev.get_status())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # the device is usable again well before the read would have timed out
+        start = time.monotonic()
+        await asyncio.wait_for(dev.set_fixed_speed("fan", 50), timeout=1)
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 1
+    assert len(waiting_driver.errors) == 1
+
+
+def test_find_liquidctl_devices_wraps_drivers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(aio, "_find_liquidctl_devices", lambda **kwargs: iter([_SlowDevice(calls)]))
+
+    devs = asyncio.run(aio.find_liquidctl_devices(match="virtual"))
+    assert len(devs) == 1
+    assert isinstance(devs[0], aio.AsyncDevice)
+    assert devs[0].description == devs[0].driver.description
@@ -72,3 +72,45 @@ def test_modified_readme_example(capsys):
     assert 'get status' in out
     assert 'Temperature: 30.4 °C' in out
     assert 'set pump to radical red' in out
+
+
+class _BarrierBus:
+    # not a BaseBus: only found while find_all_subclasses is patched
+    def __init__(self):
+        self.name = type(self).__name__
+
+    def find_devices(self, **kwargs):
+        _BarrierBus.barrier.wait()
+        yield from [f'{self.name}:0', f'{self.name}:1']
+
+
+class _FirstBus(_BarrierBus):
+    pass
+
+
+class _SecondBus(_BarrierBus):
+    pass
+
+
+@pytest.fixture
+def barrier_buses(monkeypatch):
+    import threading
+    import liquidctl.driver
+
+    _BarrierBus.barrier = threading.Barrier(2, timeout=5)
+    monkeypatch.setattr(liquidctl.driver, 'find_all_subclasses',
+                        lambda _: [_SecondBus, _FirstBus])
+
+
+def test_enumerates_buses_concurrently_in_sequential_order(barrier_buses):
+    from liquidctl import find_liquidctl_devices
+
+    # both buses wait on each other, so this only completes if concurrent
+    devs = list(find_liquidctl_devices(concurrent=True))
+    assert devs == ['_FirstBus:0', '_FirstBus:1', '_SecondBus:0', '_SecondBus:1']
+
+
+def test_picks_from_concurrently_enumerated_buses(barrier_buses):
+    from liquidctl import find_liquidctl_devices
+
+    assert list(find_liquidctl_devices(pick=2, concurrent=True)) == ['_SecondBus:0']
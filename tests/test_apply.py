@@ -0,0 +1,164 @@
+# uses the psf/black style
+
+import json
+import sys
+
+import pytest
+from _testutils import MockRuntimeStorage, VirtualBusDevice
+
+import liquidctl.apply
+import liquidctl.cli
+from liquidctl.apply import load_spec, pending, plan, selection_filters
+
+SPEC = {
+    "devices": [
+        {
+            "match": "virtual",
+            "speed": {"fan": [[20, 30], [40, 50]], "Pump": 70},
+            "color": {
+                "ring": {"mode": "Fading", "colors": ["ff0000", "00ff00"], "speed": "slower"}
+            },
+        }
+    ]
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record the driver calls made to virtual devices."""
+
+    calls = []
+    for method in ["initialize", "set_fixed_speed", "set_speed_profile", "set_color"]:
+
+        def record(self, *args, _method=method, **kwargs):
+            calls.append((_method, args[0] if args else None))
+
+        monkeypatch.setattr(VirtualBusDevice, method, record)
+    return calls
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = MockRuntimeStorage(key_prefixes=["apply"])
+    monkeypatch.setattr(liquidctl.apply, "RuntimeStorage", lambda **_: storage)
+    monkeypatch.setattr(liquidctl.apply, "_boot_id", lambda: "first boot")
+    return storage
+
+
+@pytest.fixture
+def apply_spec(monkeypatch, tmp_path):
+    def apply_spec(spec, *extra):
+        path = tmp_path / "spec.json"
+        path.write_text(json.dumps(spec))
+        monkeypatch.setattr(sys, "argv", ["test", "--bus", "virtual", "apply", str(path), *extra])
+        return liquidctl.cli.main()
+
+    return apply_spec
+
+
+def test_plan_normalizes_inputs():
+    ops = plan(SPEC["devices"][0])
+    assert [(op.key, op.method) for op in ops] == [
+        ("speed_fan", "set_speed_profile"),
+        ("speed_pump", "set_fixed_speed"),
+        ("color_ring", "set_color"),
+    ]
+    assert ops[2].args == ["ring", "fading", [[255, 0, 0], [0, 255, 0]]]
+    assert ops[2].kwargs == {"speed": "slower"}
+
+    same = plan(
+        {
+            "color": {
+                "RING": {
+                    "mode": "fading",
+                    "colors": ["rgb(255, 0, 0)", "00FF00"],
+                    "speed": "slower",
+                }
+            }
+        }
+    )
+    assert same[0].fingerprint == ops[2].fingerprint
+
+
+def test_initialize_invalidates_everything_else():
+    ops = plan({"initialize": True, "speed": {"pump": 70}})
+    fingerprints = {op.key: op.fingerprint for op in ops}
+    assert pending(ops, fingerprints) == []
+    assert pending(ops, {"speed_pump": fingerprints["speed_pump"]}) == ops
+
+
+def test_selection_filters_are_parsed_like_cli_options():
+    entry = {"vendor": "1e71", "usb_port": "1.2", "address": 80, "match": "kraken"}
+    assert selection_filters(entry) == {
+        "vendor": 0x1E71,
+        "usb_port": (1, 2),
+        "address": "80",
+        "match": "kraken",
+    }
+
+
+def test_loads_toml_specs(tmp_path):
+    path = tmp_path / "spec.toml"
+    path.write_text('[[devices]]\nmatch = "kraken"\nspeed = { pump = 70 }\n')
+    assert load_spec(str(path)) == [{"match": "kraken", "speed": {"pump": 70}}]
+
+
+def test_rejects_unknown_keys(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps({"devices": [{"match": "kraken", "speeds": {}}]}))
+    with pytest.raises(ValueError, match="unknown keys: speeds"):
+        load_spec(str(path))
+
+
+def test_only_applies_what_changed(apply_spec, calls, storage):
+    assert apply_spec(SPEC) == 0
+    assert calls == [
+        ("set_speed_profile", "fan"),
+        ("set_fixed_speed", "pump"),
+        ("set_color", "ring"),
+    ]
+
+    calls.clear()
+    assert apply_spec(SPEC) == 0
+    assert calls == []
+
+    changed = json.loads(json.dumps(SPEC))
+    changed["devices"][0]["speed"]["Pump"] = 80
+    assert apply_spec(changed) == 0
+    assert calls == [("set_fixed_speed", "pump")]
+
+    calls.clear()
+    assert apply_spec(changed, "--force") == 0
+    assert len(calls) == 3
+
+
+def test_reapplies_everything_after_reboot(apply_spec, calls, storage, monkeypatch):
+    assert apply_spec(SPEC) == 0
+    calls.clear()
+
+    monkeypatch.setattr(liquidctl.apply, "_boot_id", lambda: "second boot")
+    assert apply_spec(SPEC) == 0
+    assert len(calls) == 3
+
+
+def test_reapplies_everything_after_replug(apply_spec, calls, storage, monkeypatch):
+    assert apply_spec(SPEC) == 0
+    calls.clear()
+
+    # e.g. replugged, and assigned a new USB address
+    monkeypatch.setattr(VirtualBusDevice, "address", "virtual_address_2")
+    assert apply_spec(SPEC) == 0
+    assert len(calls) == 3
+
+
+def test_does_not_record_failed_operations(apply_spec, calls, storage, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("simulated failure")
+
+    with monkeypatch.context() as m:
+        m.setattr(VirtualBusDevice, "set_color", fail)
+        assert apply_spec(SPEC) == 1
+
+    calls.clear()
+    assert apply_spec(SPEC) == 0
+    assert calls == [("set_color", "ring")]
@@ -1,8 +1,12 @@
 import pytest
 from _testutils import VirtualBusDevice, VirtualControlMode
 
+import io
 import json
+import os
+import subprocess
 import sys
+import threading
 
 import liquidctl.cli
 
@@ -13,11 +17,9 @@ def main(monkeypatch, capsys):
     def call_with_args(*args):
         monkeypatch.setattr(sys, 'argv', list(args))
         try:
-            liquidctl.cli.main()
+            code = liquidctl.cli.main() or 0
         except SystemExit as exit:
             code = exit.code
-        else:
-            code = 0
         out, err = capsys.readouterr()
         return code, out, err
     return call_with_args
@@ -45,6 +47,13 @@ def test_json_list(main):
     assert got == exp
 
 
+def test_json_list_with_concurrent_buses(main):
+    _, sequential, _ = main('test', '--bus', 'virtual', 'list', '--json')
+    code, concurrent, _ = main('test', '--bus', 'virtual', '--concurrent-buses', 'list', '--json')
+    assert code == 0
+    assert json.loads(concurrent) == json.loads(sequential)
+
+
 def test_json_initialize(main):
     code, out, _ = main('test', '--bus', 'virtual', 'initialize', '--json')
     assert code == 0
@@ -83,3 +92,306 @@ def test_json_status(main):
         }
     ]
     assert got == exp
+
+
+def test_jsonl_status_uses_sanitized_ids(main):
+    code, out, _ = main('test', '--bus', 'virtual', 'status', '--format', 'jsonl')
+    assert code == 0
+
+    (got,) = [json.loads(line) for line in out.splitlines()]
+    assert got['description'] == 'Virtual Bus Device'
+    assert got['status'][0] == {'id': 'temperature', 'key': 'Temperature', 'value': 30.4,
+                                'unit': '°C'}
+    assert [item['id'] for item in got['status']] == [
+        'temperature', 'fan_control_mode', 'animation', 'uptime', 'hardware_mode'
+    ]
+
+
+def test_csv_status(main):
+    code, out, _ = main('test', '--bus', 'virtual', 'status', '--format', 'csv')
+    assert code == 0
+
+    lines = out.splitlines()
+    assert lines[0] == 'bus,address,description,id,key,value,unit'
+    assert lines[1] == 'virtual,virtual_address,Virtual Bus Device,temperature,Temperature,30.4,°C'
+    assert lines[4] == 'virtual,virtual_address,Virtual Bus Device,uptime,Uptime,66192.0,s'
+
+
+def test_openmetrics_status(main):
+    code, out, _ = main('test', '--bus', 'virtual', 'status', '--format', 'openmetrics')
+    assert code == 0
+
+    labels = 'device="Virtual Bus Device",bus="virtual",address="virtual_address"'
+    assert out.splitlines() == [
+        '# TYPE liquidctl_temperature_celsius gauge',
+        '# UNIT liquidctl_temperature_celsius celsius',
+        '# HELP liquidctl_temperature_celsius Temperature',
+        f'liquidctl_temperature_celsius{{{labels}}} 30.4',
+        '# TYPE liquidctl_fan_control_mode_info gauge',
+        '# HELP liquidctl_fan_control_mode_info Fan control mode',
+        f'liquidctl_fan_control_mode_info{{{labels},value="VirtualControlMode.QUIET"}} 1',
+        '# TYPE liquidctl_uptime_seconds gauge',
+        '# UNIT liquidctl_uptime_seconds seconds',
+        '# HELP liquidctl_uptime_seconds Uptime',
+        f'liquidctl_uptime_seconds{{{labels}}} 66192.0',
+        '# TYPE liquidctl_hardware_mode gauge',
+        '# HELP liquidctl_hardware_mode Hardware mode',
+        f'liquidctl_hardware_mode{{{labels}}} 1',
+        '# EOF',
+    ]
+
+
+def test_format_requires_status(main, caplog):
+    code, _, _ = main('test', '--bus', 'virtual', 'initialize', '--format', 'csv')
+    assert code == 1
+    assert '--format requires status' in caplog.text
+
+
+def test_batch_connects_to_each_device_once(main, monkeypatch, tmp_path):
+    connects = []
+    original = VirtualBusDevice.connect
+
+    def connect(self, *args, **kwargs):
+        connects.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(VirtualBusDevice, 'connect', connect)
+
+    batch = tmp_path / 'batch'
+    batch.write_text(
+        '# comments and blank lines are ignored\n'
+        '\n'
+        'initialize all\n'
+        'liquidctl --match virtual set fan speed 50\n'
+        'status\n'
+    )
+
+    code, out, _ = main('test', '--bus', 'virtual', 'batch', str(batch), '--json')
+    assert code == 0
+    assert len(connects) == 1
+    assert not connects[0].connected
+    assert connects[0].call_args['set_fixed_speed'].args == ('fan', 50)
+
+    got = json.loads(out)
+    assert [obj['status'][0]['key'] for obj in got] == ['Firmware version', 'Temperature']
+
+
+def test_batch_reads_from_stdin(main, monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('status\n'))
+    code, out, _ = main('test', '--bus', 'virtual', 'batch', '--json')
+    assert code == 0
+    assert len(json.loads(out)) == 1
+
+
+def test_batch_rejects_invalid_commands(main, monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(VirtualBusDevice, 'connect', lambda *_, **__: pytest.fail())
+
+    batch = tmp_path / 'batch'
+    batch.write_text('status\nset fan speed\nlist\nstatus --json\n')
+
+    code, _, _ = main('test', '--bus', 'virtual', 'batch', str(batch))
+    assert code == 1
+    err = caplog.text
+    assert 'line 2: invalid command' in err
+    assert 'line 3: command not supported in batch mode' in err
+    assert 'line 4: --json can only be passed to the batch command' in err
+
+
+def test_batch_counts_errors_per_command(main, tmp_path, caplog):
+    batch = tmp_path / 'batch'
+    batch.write_text('status\n--match foo status\n--vendor 1234 set fan speed 50\n')
+
+    code, _, _ = main('test', '--bus', 'virtual', 'batch', str(batch))
+    assert code == 1
+    err = caplog.text
+    assert 'line 2: no device matches' in err
+    assert 'line 3' not in err
+
+
+class _AliasedVirtualDevice(VirtualBusDevice):
+    @classmethod
+    def _match_texts(cls, description):
+        text = description.lower()
+        return [text, text.replace('bus ', '')]
+
+
+def test_select_devices_matches_driver_aliases():
+    devs = [_AliasedVirtualDevice()]
+    assert liquidctl.cli._select_devices(devs, {'match': 'virtual device'}) == devs
+    assert liquidctl.cli._select_devices([VirtualBusDevice()], {'match': 'virtual device'}) == []
+
+
+class _SlowVirtualDevice(VirtualBusDevice):
+    def __init__(self, address, barrier=None, fail=False):
+        super().__init__()
+        self._address = address
+        self._barrier = barrier
+        self._fail = fail
+
+    def get_status(self, *args, **kwargs):
+        if self._barrier:
+            # only returns if the other device is being handled at the same time
+            self._barrier.wait(timeout=5)
+        if self._fail:
+            raise OSError('simulated failure')
+        return [('Address', self._address, '')]
+
+    @property
+    def address(self):
+        return self._address
+
+
+def test_jobs_handle_devices_concurrently_but_keep_order(main, monkeypatch):
+    barrier = threading.Barrier(2)
+    devs = [_SlowVirtualDevice('a', barrier), _SlowVirtualDevice('b', barrier)]
+    monkeypatch.setattr(liquidctl.cli, 'find_liquidctl_devices', lambda **_: iter(devs))
+
+    code, out, _ = main('test', '--jobs', '2', 'status', '--json')
+    assert code == 0
+    assert [obj['address'] for obj in json.loads(out)] == ['a', 'b']
+    assert all(not dev.connected for dev in devs)
+
+
+def test_jobs_collect_per_device_errors(main, monkeypatch, caplog):
+    devs = [_SlowVirtualDevice('a', fail=True), _SlowVirtualDevice('b')]
+    monkeypatch.setattr(liquidctl.cli, 'find_liquidctl_devices', lambda **_: iter(devs))
+
+    code, out, _ = main('test', '--jobs', '2', 'status')
+    assert code == 1
+    assert 'unexpected OS error' in caplog.text
+    assert 'Address' in out
+
+
+class _FakeClock:
+    def __init__(self, ticks):
+        self.now = 100.0
+        self.sleeps = []
+        self._ticks = ticks
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.sleeps.append(secs)
+        if len(self.sleeps) == self._ticks:
+            raise KeyboardInterrupt()
+        self.now += secs
+
+
+class _SamplingDevice(_SlowVirtualDevice):
+    def __init__(self, address, clock, fail_on=()):
+        super().__init__(address)
+        self._clock = clock
+        self._fail_on = fail_on
+        self.samples = 0
+
+    def get_status(self, *args, **kwargs):
+        self.samples += 1
+        self._clock.now += 0.25  # sampling takes time, which must not cause drift
+        if self.samples in self._fail_on:
+            raise OSError('simulated disconnection')
+        return [('Sample', self.samples, '')]
+
+
+def test_watch_streams_json_lines_on_fixed_schedule(main, monkeypatch):
+    clock = _FakeClock(ticks=3)
+    dev = _SamplingDevice('a', clock)
+    monkeypatch.setattr(liquidctl.cli, 'time', clock)
+    monkeypatch.setattr(liquidctl.cli, 'find_liquidctl_devices', lambda **_: iter([dev]))
+
+    code, out, _ = main('test', 'status', '--watch', '1', '--json')
+    assert code == 0
+    assert clock.sleeps == [0.75, 0.75, 0.75]
+
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [rec['timestamp'] for rec in records] == [100.0, 101.0, 102.0]
+    assert [rec['status'][0]['value'] for rec in records] == [1, 2, 3]
+    assert dev.call_args['connect'] and not dev.connected
+
+
+def test_watch_streams_csv_with_timestamps(main, monkeypatch):
+    clock = _FakeClock(ticks=2)
+    dev = _SamplingDevice('a', clock)
+    monkeypatch.setattr(liquidctl.cli, 'time', clock)
+    monkeypatch.setattr(liquidctl.cli, 'find_liquidctl_devices', lambda **_: iter([dev]))
+
+    code, out, _ = main('test', 'status', '--watch', '1', '--format', 'csv')
+    assert code == 0
+    assert out.splitlines() == [
+        'timestamp,bus,address,description,id,key,value,unit',
+        '100.0,virtual,a,Virtual Bus Device,sample,Sample,1,',
+        '101.0,virtual,a,Virtual Bus Device,sample,Sample,2,',
+    ]
+
+
+def test_watch_reconnects_to_lost_devices(main, monkeypatch, caplog):
+    clock = _FakeClock(ticks=4)
+    first = _SamplingDevice('a', clock, fail_on=[2])
+    again = _SamplingDevice('a', clock)
+    found = iter([[first], [again]])
+    monkeypatch.setattr(liquidctl.cli, 'time', clock)
+    monkeypatch.setattr(liquidctl.cli, 'find_liquidctl_devices', lambda **_: iter(next(found)))
+
+    code, out, _ = main('test', 'status', '--watch', '1', '--json')
+    assert code == 1
+    assert 'simulated disconnection' in caplog.text
+    assert not first.connected and not again.connected
+
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [rec['status'][0]['value'] for rec in records] == [1, 1, 2]
+
+
+@pytest.mark.parametrize('jobs', ['0', '-1', 'x'])
+def test_jobs_must_be_positive_number(main, caplog, jobs):
+    code, _, _ = main('test', '--bus', 'virtual', '--jobs', jobs, 'status')
+    assert code == 1
+    assert '--jobs must be a number of at least 1' in caplog.text
+
+
+def test_watch_requires_status(main, caplog):
+    code, _, _ = main('test', '--bus', 'virtual', 'initialize', '--watch', '1')
+    assert code == 1
+    assert '--watch requires status' in caplog.text
+
+
+@pytest.mark.parametrize('interval', ['0', 'abc'])
+def test_watch_requires_positive_interval(main, caplog, interval):
+    code, _, _ = main('test', '--bus', 'virtual', 'status', '--watch', interval)
+    assert code == 1
+    assert 'a positive interval' in caplog.text
+
+
+# run the CLI in a fresh interpreter, and report which modules it imported
+_STARTUP_SCRIPT = """
+import json, sys
+import liquidctl.cli
+sys.argv = ['liquidctl'] + sys.argv[1:]
+try:
+    liquidctl.cli.main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _startup_modules(*args, runtime_dir=None):
+    root = os.path.dirname(os.path.dirname(liquidctl.cli.__file__))
+    env = {**os.environ, 'PYTHONPATH': root}
+    if runtime_dir:
+        env['XDG_RUNTIME_DIR'] = str(runtime_dir)
+    env.pop('FORCE_COLOR', None)
+    proc = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, *args], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def test_version_skips_buses_and_metadata():
+    modules = _startup_modules('--version')
+    for heavy in ['importlib.metadata', 'colorlog', 'liquidctl.driver.usb', 'usb', 'hid']:
+        assert heavy not in modules
+
+
+def test_list_skips_metadata_and_unused_colors(tmp_path):
+    modules = _startup_modules('--bus', 'virtual', '--no-cache', 'list', runtime_dir=tmp_path)
+    for heavy in ['importlib.metadata', 'importlib.abc', 'colorlog']:
+        assert heavy not in modules
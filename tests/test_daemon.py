@@ -0,0 +1,136 @@
+# uses the psf/black style
+
+import json
+import sys
+import threading
+from datetime import timedelta
+
+import pytest
+from _testutils import VirtualBusDevice
+
+import liquidctl.cli
+from liquidctl.daemon import DaemonClient, DeviceServer, RemoteError, serve
+from liquidctl.error import NotSupportedByDevice
+
+
+class _CountingDevice(VirtualBusDevice):
+    def __init__(self):
+        super().__init__()
+        self.status_reads = 0
+
+    def get_status(self, *args, **kwargs):
+        self.status_reads += 1
+        return super().get_status(*args, **kwargs)
+
+    def set_screen(self, *args, **kwargs):
+        raise NotSupportedByDevice()
+
+
+@pytest.fixture
+def device_server():
+    server = DeviceServer(status_ttl=60)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def socket_path(tmp_path, device_server, monkeypatch):
+    path = str(tmp_path / "liquidctld.sock")
+    server = serve(device_server, path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("LIQUIDCTLD_SOCKET", path)
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def _call(server, method, **params):
+    return server.handle({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+
+
+def test_connects_once_and_keeps_devices_connected(device_server):
+    dev = _CountingDevice()
+    dev_id = device_server.add_device(dev)
+
+    _call(device_server, "initialize", device=dev_id)
+    _call(device_server, "set_fixed_speed", device=dev_id, args=["fan", 42])
+    assert dev.connected
+    assert dev.call_args["set_fixed_speed"].args == ("fan", 42)
+
+    device_server.close()
+    assert not dev.connected
+
+
+def test_caches_status_until_another_operation(device_server):
+    dev = _CountingDevice()
+    dev_id = device_server.add_device(dev)
+
+    first = _call(device_server, "get_status", device=dev_id)
+    second = _call(device_server, "get_status", device=dev_id)
+    assert first == second
+    assert dev.status_reads == 1
+
+    _call(device_server, "get_status", device=dev_id, max_age=0)
+    assert dev.status_reads == 2
+
+    _call(device_server, "set_fixed_speed", device=dev_id, args=["fan", 42])
+    _call(device_server, "get_status", device=dev_id)
+    assert dev.status_reads == 3
+
+
+def test_reports_errors(device_server):
+    dev = _CountingDevice()
+    dev_id = device_server.add_device(dev)
+
+    error = _call(device_server, "set_screen", device=dev_id, args=["lcd", "static", None])
+    assert error["error"]["data"]["type"] == "NotSupportedByDevice"
+
+    assert _call(device_server, "reboot", device=dev_id)["error"]["code"] == -32601
+    assert _call(device_server, "get_status", device=dev_id + 1)["error"]["code"] == -32001
+
+    device_server.remove_device(dev)
+    assert _call(device_server, "get_status", device=dev_id)["error"]["code"] == -32001
+
+    response = json.loads(device_server.handle_line(b"{"))
+    assert response["error"]["code"] == -32700
+
+
+def test_client_proxies_devices(device_server, socket_path):
+    dev = _CountingDevice()
+    device_server.add_device(dev)
+
+    with DaemonClient() as client:
+        (proxy,) = client.find_devices()
+        assert type(proxy).__name__ == "_CountingDevice"
+        assert proxy.description == "Virtual Bus Device"
+
+        status = proxy.get_status()
+        assert ("Uptime", timedelta(hours=18, minutes=23, seconds=12), "") in status
+
+        proxy.set_speed_profile("fan", iter([(20, 30), (40, 50)]))
+        assert dev.call_args["set_speed_profile"].args == ("fan", [[20, 30], [40, 50]])
+
+        with pytest.raises(RemoteError, match="not supported by the device"):
+            proxy.set_screen("lcd", "static", None)
+
+
+def test_cli_routes_through_daemon(device_server, socket_path, monkeypatch, capsys):
+    dev = _CountingDevice()
+    device_server.add_device(dev)
+
+    monkeypatch.setattr(sys, "argv", ["test", "--daemon", "status", "--json"])
+    assert liquidctl.cli.main() == 0
+    out, _ = capsys.readouterr()
+    assert json.loads(out)[0]["status"][3] == {"key": "Uptime", "value": 66192.0, "unit": "s"}
+
+    monkeypatch.setattr(sys, "argv", ["test", "--daemon", "--match", "none", "status"])
+    assert liquidctl.cli.main() == 1
+
+
+def test_main_rejects_invalid_status_ttl(monkeypatch, caplog):
+    import liquidctl.daemon
+
+    monkeypatch.setattr(sys, "argv", ["liquidctld", "--status-ttl", "soon"])
+    assert liquidctl.daemon.main() == 1
+    assert "invalid --status-ttl: soon" in caplog.text
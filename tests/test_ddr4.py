@@ -1,5 +1,5 @@
 import pytest
-from _testutils import VirtualSmbus
+from _testutils import MockRuntimeStorage, VirtualSmbus
 
 from liquidctl.driver.ddr4 import *
 from liquidctl.error import *
@@ -84,6 +84,15 @@ def test_dram_manufacturer(cmr_spd):
     assert cmr_spd.dram_manufacturer == 'Samsung'
 
 
+@pytest.fixture(autouse=True)
+def spd_storage(monkeypatch):
+    import liquidctl.driver.ddr4
+
+    storage = MockRuntimeStorage(key_prefixes=['ddr4'])
+    monkeypatch.setattr(liquidctl.driver.ddr4, '_spd_storage', lambda: storage)
+    return storage
+
+
 @pytest.fixture
 def smbus():
     smbus = VirtualSmbus(parent_driver='i801_smbus')
@@ -134,6 +143,36 @@ def test_tse2004_finds_ts_devices(smbus):
     assert devs[1].description.startswith('Corsair DIMM4')
 
 
+def test_tse2004_caches_spd_summaries_until_reboot(smbus, monkeypatch):
+    import liquidctl.driver.ddr4
+
+    smbus.emulate_eeprom_at(0x51, 'ee1004', _TS_SPD)
+
+    loads = []
+    load_eeprom = smbus.load_eeprom
+    monkeypatch.setattr(smbus, 'load_eeprom', lambda x: loads.append(x) or load_eeprom(x))
+    monkeypatch.setattr(liquidctl.driver.ddr4, '_boot_id', lambda: 'first boot')
+
+    first = list(Ddr4Temperature.probe(smbus))
+    assert len(loads) == 8
+
+    # only the EEPROM that was read is cached, the others are probed again
+    second = list(Ddr4Temperature.probe(smbus))
+    assert len(loads) == 15
+    assert 0x51 not in loads[8:]
+    assert [dev.description for dev in second] == [dev.description for dev in first]
+
+    # e.g. ee1004 was bound after the first probe
+    smbus.emulate_eeprom_at(0x53, 'ee1004', _TS_SPD)
+    third = list(Ddr4Temperature.probe(smbus))
+    assert len(third) == 2
+    assert len(loads) == 22
+
+    monkeypatch.setattr(liquidctl.driver.ddr4, '_boot_id', lambda: 'second boot')
+    list(Ddr4Temperature.probe(smbus))
+    assert len(loads) == 30
+
+
 def test_tse2004_get_status_is_unsafe(smbus):
     smbus.emulate_eeprom_at(0x51, 'ee1004', _TS_SPD)
     dimm = next(Ddr4Temperature.probe(smbus))
@@ -1,6 +1,11 @@
-from pytest import fixture
+import queue
+import threading
+import time
 
-from liquidctl.driver.usb import HidapiDevice
+from pytest import fixture, raises
+
+from liquidctl.driver.usb import HidapiDevice, cancel_scope
+from liquidctl.error import Timeout
 
 
 class _mockhidapi:
@@ -160,3 +165,141 @@ def test_exposes_unified_properties(dev):
     assert dev.bus == 'hid'
     assert dev.address == 'path'
     assert dev.port is None
+
+
+class _pushingdevice:
+    """Device that replies to reads with the reports pushed to it."""
+
+    def __init__(self):
+        self.reports = queue.Queue()
+        self.closed = False
+
+    def read(self, max_length, timeout_ms=0):
+        try:
+            return self.reports.get(timeout=timeout_ms / 1000)[:max_length]
+        except queue.Empty:
+            return []
+
+    def close(self):
+        self.closed = True
+
+
+@fixture
+def dispatching_dev():
+    dev = HidapiDevice(_mockhidapi, _SAMPLE_HID_INFO)
+    dev.hiddev = _pushingdevice()
+    dev.start_dispatcher(64)
+    yield dev
+    if dev.dispatcher:
+        dev.close()
+
+
+def _wait_for_reports(dispatcher, count):
+    while dispatcher.mark() < count:
+        time.sleep(0.001)
+
+
+def test_dispatcher_routes_reports_by_key(dispatching_dev):
+    dev = dispatching_dev
+    for report in [[0x75, 0x02, 1], [0x11, 0x01, 2], [0x75, 0x02, 3], [0x21, 0x03, 4]]:
+        dev.hiddev.reports.put(report)
+    _wait_for_reports(dev.dispatcher, 4)
+
+    assert dev.dispatcher.read([b'\x21\x03', b'\x11\x01']) == [0x11, 0x01, 2]
+    assert dev.dispatcher.read([b'\x21\x03']) == [0x21, 0x03, 4]
+
+    # other reports are kept, in order
+    assert dev.read(64) == [0x75, 0x02, 1]
+    assert dev.read(2) == [0x75, 0x02]
+
+    with raises(Timeout):
+        dev.read(64, timeout=10)
+
+
+def test_dispatcher_reads_after_mark(dispatching_dev):
+    dev = dispatching_dev
+    dev.hiddev.reports.put([0x75, 0x01, 1])
+    _wait_for_reports(dev.dispatcher, 1)
+
+    mark = dev.dispatcher.mark()
+    dev.hiddev.reports.put([0x75, 0x01, 2])
+    assert dev.dispatcher.read([b'\x75\x01'], after=mark) == [0x75, 0x01, 2]
+
+
+def test_dispatcher_reuses_recent_reports(dispatching_dev):
+    dev = dispatching_dev
+    dev.hiddev.reports.put([0x67, 0x02, 1])
+    _wait_for_reports(dev.dispatcher, 1)
+
+    # clearing the queues keeps the latest report of each key
+    dev.clear_enqueued_reports()
+    assert dev.dispatcher.read_recent(b'\x67\x02', max_age=60) == [0x67, 0x02, 1]
+    assert dev.dispatcher.read_recent(b'\x67\x02', max_age=60) == [0x67, 0x02, 1]
+
+    # too old, waits for the next one
+    dev.hiddev.reports.put([0x67, 0x02, 2])
+    assert dev.dispatcher.read_recent(b'\x67\x02', max_age=0) == [0x67, 0x02, 2]
+
+    with raises(Timeout):
+        dev.dispatcher.read_recent(b'\x67\x02', max_age=0, timeout=10)
+
+
+def test_dispatcher_returns_latest_report_without_waiting(dispatching_dev):
+    dev = dispatching_dev
+    assert dev.dispatcher.latest(b'\x67\x02', max_age=60) is None
+
+    dev.hiddev.reports.put([0x67, 0x02, 1])
+    _wait_for_reports(dev.dispatcher, 1)
+    assert dev.dispatcher.latest(b'\x67\x02', max_age=60) == [0x67, 0x02, 1]
+    time.sleep(0.01)
+    assert dev.dispatcher.latest(b'\x67\x02', max_age=0.005) is None
+
+
+def test_dispatcher_uses_custom_key():
+    dev = HidapiDevice(_mockhidapi, _SAMPLE_HID_INFO)
+    dev.hiddev = _pushingdevice()
+    dev.start_dispatcher(64, key=lambda report: bytes([report[0], report[2] >> 4]))
+    try:
+        for report in [[0x04, 0x00, 0x01], [0x04, 0x00, 0x12], [0x04, 0x00, 0x03]]:
+            dev.hiddev.reports.put(report)
+        _wait_for_reports(dev.dispatcher, 3)
+
+        assert dev.dispatcher.latest(b'\x04\x00', max_age=60) == [0x04, 0x00, 0x03]
+        assert dev.dispatcher.latest(b'\x04\x01', max_age=60) == [0x04, 0x00, 0x12]
+    finally:
+        dev.close()
+
+
+def test_dispatcher_reports_key_errors_to_readers():
+    dev = HidapiDevice(_mockhidapi, _SAMPLE_HID_INFO)
+    dev.hiddev = _pushingdevice()
+    dev.start_dispatcher(64, key=lambda report: bytes([report[0], report[15] >> 4]))
+    try:
+        dev.hiddev.reports.put([0x04, 0x00])  # too short for the key
+
+        start = time.monotonic()
+        with raises(IndexError):
+            dev.read(64, timeout=None)
+        assert time.monotonic() - start < 1
+    finally:
+        dev.close()
+
+
+def test_dispatcher_stops_when_closed(dispatching_dev):
+    dev = dispatching_dev
+    thread = dev.dispatcher._thread
+    dev.close()
+    assert not thread.is_alive()
+    assert dev.dispatcher is None
+    assert dev.hiddev.closed
+
+
+def test_dispatcher_reads_can_be_cancelled(dispatching_dev):
+    dev = dispatching_dev
+    cancelled = threading.Event()
+    threading.Timer(0.05, cancelled.set).start()
+
+    start = time.monotonic()
+    with cancel_scope(cancelled), raises(Timeout):
+        dev.read(64)
+    assert time.monotonic() - start < 1
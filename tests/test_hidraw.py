@@ -0,0 +1,128 @@
+# uses the psf/black style
+
+import os
+import socket
+import sys
+
+import pytest
+
+if sys.platform != "linux":
+    pytest.skip("hidraw is only available on Linux", allow_module_level=True)
+
+from liquidctl.driver import hidraw
+from liquidctl.driver.usb import HidapiBus, HidapiDevice
+
+# Usage Page (0xff00), Usage (0x01), Collection (Application), ...
+_REPORT_DESCRIPTOR = bytes([0x06, 0x00, 0xFF, 0x09, 0x01, 0xA1, 0x01, 0x15, 0x00, 0xC0])
+
+
+def _make_hidraw(sysfs, name, hid_id, usb=True):
+    usb_dir = sysfs / "devices" / f"usb-{name}"
+    hid_dir = usb_dir / "1-9:1.0" / f"{hid_id}.0001"
+    hid_dir.mkdir(parents=True)
+    (hid_dir / "uevent").write_text(
+        f"DRIVER=hid-generic\nHID_ID={hid_id}\nHID_NAME=NZXT Kraken\nHID_UNIQ=\n"
+    )
+    (hid_dir / "report_descriptor").write_bytes(_REPORT_DESCRIPTOR)
+    if usb:
+        (usb_dir / "1-9:1.0" / "bInterfaceNumber").write_text("01\n")
+        (usb_dir / "bcdDevice").write_text("0100\n")
+        (usb_dir / "manufacturer").write_text("NZXT\n")
+        (usb_dir / "serial").write_text("49874481333\n")
+    class_dir = sysfs / "class" / "hidraw" / name
+    class_dir.mkdir(parents=True)
+    (class_dir / "device").symlink_to(hid_dir)
+
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(hidraw, "_SYSFS_HIDRAW", tmp_path / "class" / "hidraw")
+    return tmp_path
+
+
+def test_enumerates_through_sysfs(sysfs):
+    _make_hidraw(sysfs, "hidraw10", "0003:00001E71:0000170E")
+    _make_hidraw(sysfs, "hidraw2", "0005:0000046D:0000B023", usb=False)
+
+    infos = hidraw.enumerate()
+    assert [info["path"] for info in infos] == [b"/dev/hidraw2", b"/dev/hidraw10"]
+    assert infos[1] == {
+        "path": b"/dev/hidraw10",
+        "vendor_id": 0x1E71,
+        "product_id": 0x170E,
+        "serial_number": "49874481333",
+        "release_number": 0x0100,
+        "manufacturer_string": "NZXT",
+        "product_string": "NZXT Kraken",
+        "usage_page": 0xFF00,
+        "usage": 0x01,
+        "interface_number": 1,
+    }
+    assert infos[0]["interface_number"] == -1
+
+    assert [info["path"] for info in hidraw.enumerate(0x1E71, 0x170E)] == [b"/dev/hidraw10"]
+    assert hidraw.enumerate(0x1E71, 0x2007) == []
+
+
+def test_hidapi_bus_uses_hidraw_when_selected(sysfs, monkeypatch):
+    import liquidctl.driver.usb
+
+    _make_hidraw(sysfs, "hidraw1", "0003:00001E71:0000170E")
+    monkeypatch.setattr(liquidctl.driver.usb.HwmonDevice, "from_hidraw", lambda path: None)
+
+    monkeypatch.setenv("LIQUIDCTL_HID_BACKEND", "hidraw")
+    devs = list(HidapiBus().find_devices(match="kraken x"))
+    assert len(devs) == 1
+    assert devs[0].device.api is hidraw
+    assert devs[0].address == "/dev/hidraw1"
+
+
+@pytest.fixture
+def hidraw_pair():
+    # a SOCK_SEQPACKET socket keeps the boundaries between reports, like hidraw
+    ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    dev = hidraw.device()
+    dev._attach(os.dup(ours.fileno()))
+    ours.close()
+    yield dev, theirs
+    dev.close()
+    theirs.close()
+
+
+def test_reads_and_writes_reports(hidraw_pair):
+    dev, other = hidraw_pair
+    handle = HidapiDevice(hidraw, {"path": b"/dev/hidraw1"})
+    handle.hiddev = dev
+
+    assert handle.write([0x02, 0x4D, 0x00]) == 3
+    assert other.recv(64) == bytes([0x02, 0x4D, 0x00])
+    assert dev.write(bytearray([0x01, 0x02])) == 2
+    assert other.recv(64) == bytes([0x01, 0x02])
+
+    other.send(bytes([0x75, 0x02, 0x1D]))
+    other.send(bytes([0x75, 0x01, 0x1E]))
+    assert handle.read(2) == [0x75, 0x02]
+    assert handle.read(64) == [0x75, 0x01, 0x1E]
+
+    assert dev.read(64, timeout_ms=10) == []
+    dev.set_nonblocking(True)
+    assert dev.read(64) == []
+
+
+def test_feature_reports_use_ioctls(hidraw_pair, monkeypatch):
+    dev, _ = hidraw_pair
+    calls = []
+
+    def ioctl(fd, request, buf, mutate):
+        calls.append((request, bytes(buf)))
+        if request == hidraw.HIDIOCGFEATURE(len(buf)):
+            buf[1:3] = b"\xaa\xbb"
+            return 3
+        return len(buf)
+
+    monkeypatch.setattr(hidraw.fcntl, "ioctl", ioctl)
+
+    assert dev.get_feature_report(0x05, 64) == [0x05, 0xAA, 0xBB]
+    assert dev.send_feature_report([0x06, 0x01]) == 2
+    assert [request for request, _ in calls] == [0xC0404807, 0xC0024806]
+    assert calls[1][1] == bytes([0x06, 0x01])
@@ -0,0 +1,116 @@
+# uses the psf/black style
+
+import pytest
+from _testutils import MockRuntimeStorage
+
+from liquidctl.driver.inventory import DeviceInventory, sysfs_fingerprint
+
+
+class FakeBus:
+    _INVENTORY_PATHS = ["class/fake"]
+
+    def __init__(self, handles):
+        self.handles = handles
+        self.enumerations = 0
+
+    def find_devices(self, **kwargs):
+        self.enumerations += 1
+        yield from self.handles
+
+    def _inventory_drivers(self):
+        return ["fake"]
+
+    def _inventory_select(self, match=None, **kwargs):
+        return match != "other bus"
+
+    def _inventory_entries(self):
+        self.enumerations += 1
+        return list(self.handles)
+
+    def _find_devices_in_inventory(self, entries, match=None, **kwargs):
+        for entry in entries:
+            if match and match not in entry:
+                continue
+            yield entry
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    (tmp_path / "class" / "fake" / "dev0").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def inventory(sysfs):
+    return DeviceInventory(storage=MockRuntimeStorage(["inventory"]), sysfs_root=str(sysfs))
+
+
+def test_fingerprint_is_stable(sysfs):
+    assert sysfs_fingerprint(["class/fake"], sysfs_root=str(sysfs)) == sysfs_fingerprint(
+        ["class/fake"], sysfs_root=str(sysfs)
+    )
+
+
+def test_fingerprint_changes_on_hotplug(sysfs):
+    before = sysfs_fingerprint(["class/fake"], sysfs_root=str(sysfs))
+    (sysfs / "class" / "fake" / "dev1").mkdir()
+    assert sysfs_fingerprint(["class/fake"], sysfs_root=str(sysfs)) != before
+
+
+def test_fingerprint_changes_on_replug(sysfs):
+    before = sysfs_fingerprint(["class/fake"], sysfs_root=str(sysfs))
+    (sysfs / "class" / "fake" / "dev0").rename(sysfs / "dev0")
+    (sysfs / "class" / "fake" / "dev0").mkdir()
+    assert sysfs_fingerprint(["class/fake"], sysfs_root=str(sysfs)) != before
+
+
+def test_fingerprint_requires_sysfs(tmp_path):
+    assert sysfs_fingerprint(["class/fake"], sysfs_root=str(tmp_path / "missing")) is None
+
+
+def test_reuses_inventory(inventory):
+    bus = FakeBus(["foo", "bar"])
+
+    assert list(inventory.find_devices(bus)) == ["foo", "bar"]
+    assert list(inventory.find_devices(bus, match="ba")) == ["bar"]
+    assert bus.enumerations == 1
+
+
+def test_refreshes_inventory_on_hotplug(inventory, sysfs):
+    bus = FakeBus(["foo"])
+    assert list(inventory.find_devices(bus)) == ["foo"]
+
+    bus.handles = ["foo", "bar"]
+    (sysfs / "class" / "fake" / "dev1").mkdir()
+
+    assert list(inventory.find_devices(bus)) == ["foo", "bar"]
+    assert bus.enumerations == 2
+
+
+def test_refreshes_inventory_on_request(inventory):
+    bus = FakeBus(["foo"])
+    assert list(inventory.find_devices(bus)) == ["foo"]
+
+    bus.handles = ["bar"]
+
+    assert list(inventory.find_devices(bus)) == ["foo"]
+    assert list(inventory.find_devices(bus, refresh=True)) == ["bar"]
+    assert list(inventory.find_devices(bus)) == ["bar"]
+
+
+def test_enumerates_without_sysfs(tmp_path):
+    inventory = DeviceInventory(
+        storage=MockRuntimeStorage(["inventory"]), sysfs_root=str(tmp_path / "missing")
+    )
+    bus = FakeBus(["foo"])
+
+    assert list(inventory.find_devices(bus)) == ["foo"]
+    assert list(inventory.find_devices(bus)) == ["foo"]
+    assert bus.enumerations == 2
+
+
+def test_skips_bus_that_cannot_match(inventory):
+    bus = FakeBus(["foo"])
+
+    assert list(inventory.find_devices(bus, match="other bus")) == []
+    assert bus.enumerations == 0
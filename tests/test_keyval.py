@@ -231,6 +231,24 @@ def test_fs_backend_releases_locks(tmpdir):
     assert store.load("key") == 1
 
 
+def test_fs_backend_lock_times_out(tmpdir):
+    run_dir = tmpdir.mkdir("run_dir")
+    store = _FilesystemBackend(key_prefixes=["prefix"], runtime_dirs=[run_dir])
+    other = _FilesystemBackend(key_prefixes=["prefix"], runtime_dirs=[run_dir])
+
+    with store.lock("key", timeout=None):
+        start_time = time.monotonic()
+        with pytest.raises(TimeoutError):
+            with other.lock("key", timeout=0.2):
+                pass
+        assert time.monotonic() - start_time >= 0.2
+
+    with other.lock("key", timeout=0):
+        pass
+
+    assert store.load("key") is None
+
+
 def _fs_mp_increment_key(run_dir, prefix, key, sleep):
     """Open a _FilesystemBackend and increment `key`.
 
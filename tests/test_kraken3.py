@@ -2,11 +2,16 @@
 
 import pytest
 import os
+import queue
+import threading
+import time
+from types import SimpleNamespace
 
 from _testutils import MockHidapiDevice, MockPyusbDevice, Report
 
 from liquidctl.driver.hwmon import HwmonDevice
 from liquidctl.driver.kraken3 import KrakenX3, KrakenZ3
+from liquidctl.driver.usb import HidapiDevice
 from liquidctl.driver.kraken3 import (
     _COLOR_CHANNELS_KRAKENX,
     _SPEED_CHANNELS_KRAKENX,
@@ -118,6 +123,7 @@ class MockKraken(MockHidapiDevice):
         self.raw_led_channels = raw_led_channels
 
     def write(self, data):
+        data = list(data)  # drivers can write any bytes-like object
         reply = bytearray(64)
         if data[0:2] == [0x10, 0x01]:
             reply[0:2] = [0x11, 0x01]
@@ -202,7 +208,7 @@ class MockKrakenZ3(KrakenZ3):
             fixed_data_index = 1
 
         assert (
-            data == krakenz3_response[self.screen_mode + "_bulk"][fixed_data_index]
+            list(data) == krakenz3_response[self.screen_mode + "_bulk"][fixed_data_index]
         ), f"Bulk write failed, wrong data for mode: {self.screen_mode}, data index: {self.bulk_data_index}"
         self.bulk_data_index += 1
         return super()._bulk_write(data)
@@ -237,6 +243,91 @@ def test_krakenx3_reads_status_directly(mock_krakenx3, has_hwmon, direct_access)
     assert pump_duty == ("Pump duty", 53, "%")
 
 
+class _PushingKrakenX3:
+    """hidapi device that pushes status reports, and replies like MockKraken."""
+
+    def __init__(self):
+        self.replies = MockKraken(raw_led_channels=len(_COLOR_CHANNELS_KRAKENX) - 1)
+        self.reports = queue.Queue()
+        self.reports.put(list(X3_SAMPLE_STATUS))
+
+    def open_path(self, path):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self, max_length, timeout_ms=0):
+        try:
+            return self.reports.get(timeout=timeout_ms / 1000)[:max_length]
+        except queue.Empty:
+            return []
+
+    def write(self, data):
+        self.replies.write(data)
+        # unsolicited status reports are interleaved with the replies
+        self.reports.put(list(X3_FAULTY_STATUS))
+        self.reports.put(self.replies.read(64))
+        return len(data)
+
+
+def test_krakenx3_dispatches_reports_in_the_background(monkeypatch):
+    monkeypatch.setattr(HwmonDevice, "from_hidraw", lambda path: None)
+    handle = HidapiDevice(SimpleNamespace(device=_PushingKrakenX3), {"path": b"path"})
+    dev = KrakenX3(
+        handle,
+        "Mock Kraken X73",
+        speed_channels=_SPEED_CHANNELS_KRAKENX,
+        color_channels=_COLOR_CHANNELS_KRAKENX,
+        hwmon_ctrl_mapping=_HWMON_CTRL_MAPPING_KRAKENX,
+    )
+
+    with dev.connect():
+        # only started once pushed reports can be reused
+        assert handle.dispatcher is None
+        assert dev.get_status(max_age=60)[0] == ("Liquid temperature", 33.1, "°C")
+        assert handle.dispatcher
+
+        status = dev.initialize()
+        assert ("Firmware version", "0.0.0", "") in status
+        assert ("Pump Ring LEDs", "detected", "") in status
+
+        # reuses the latest status report pushed by the device, if asked to
+        assert dev.get_status(max_age=60)[0] == ("Liquid temperature", 255 + 255 / 10, "°C")
+
+        # otherwise waits for the next one
+        threading.Timer(0.1, handle.hiddev.reports.put, [list(X3_SAMPLE_STATUS)]).start()
+        assert dev.get_status()[0] == ("Liquid temperature", 33.1, "°C")
+
+    assert handle.dispatcher is None
+
+
+def test_krakenz3_skips_stale_replies_when_dispatching(monkeypatch):
+    monkeypatch.setattr(HwmonDevice, "from_hidraw", lambda path: None)
+    handle = HidapiDevice(SimpleNamespace(device=_PushingKrakenX3), {"path": b"path"})
+    dev = MockKrakenZ3(
+        handle,
+        "Mock Kraken Z73",
+        speed_channels=_SPEED_CHANNELS_KRAKENZ,
+        color_channels=_COLOR_CHANNELS_KRAKENZ,
+        hwmon_ctrl_mapping=_HWMON_CTRL_MAPPING_KRAKENZ,
+        bulk_buffer_size=512,
+        lcd_resolution=(320, 320),
+    )
+
+    with dev.connect():
+        dev._start_dispatcher()
+
+        # e.g. a late reply, or one to a request made by another process
+        stale = [0x31, 0x01] + [0] * 62
+        stale[0x1A] = 3  # lcd orientation
+        handle.hiddev.reports.put(stale)
+        while not handle.dispatcher.latest(b"\x31\x01", max_age=60):
+            time.sleep(0.01)
+
+        dev.set_screen("lcd", "brightness", "60")
+
+
 def test_krakenx3_reads_status_from_hwmon(mock_krakenx3, tmp_path):
     mock_krakenx3._hwmon = HwmonDevice("mock_module", tmp_path)
     (tmp_path / "temp1_input").write_text("33100\n")
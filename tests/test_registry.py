@@ -0,0 +1,65 @@
+# uses the psf/black style
+
+import subprocess
+import sys
+
+import pytest
+
+from liquidctl.driver import registry
+from liquidctl.driver._registry_table import DRIVERS
+
+
+@pytest.fixture
+def imported(monkeypatch):
+    names = []
+    monkeypatch.setattr(registry, "_import", names.append)
+    return names
+
+
+def test_table_is_in_sync_with_drivers():
+    # if this fails, run extra/generate-driver-registry.py
+    assert registry.build_table() == DRIVERS
+
+
+def test_only_loads_drivers_for_present_devices(imported):
+    registry.load_drivers("hid", {(0x1E71, 0x170E), (0xFFFF, 0xFFFF)})
+    assert imported == ["kraken2"]
+
+
+def test_does_not_load_drivers_from_other_buses(imported):
+    registry.load_drivers("usb", {(0x1E71, 0x170E)})
+    assert imported == []
+
+
+def test_loads_all_drivers_for_bus(imported):
+    registry.load_drivers("smbus")
+    assert imported == ["ddr4", "nvidia"]
+
+
+def test_can_match_filters():
+    assert registry.can_match("hid", vendor=0x1E71, product=0x170E)
+    assert registry.can_match("hid", match="kraken x")
+    assert not registry.can_match("hid", vendor=0x1E71, product=0xFFFF)
+    assert not registry.can_match("usb", match="commander pro")
+
+
+def test_can_match_aliases():
+    assert registry.can_match("hid", match="corsair h100i platinum")
+
+
+def test_detects_registered_drivers():
+    from liquidctl.driver.kraken2 import Kraken2
+    from liquidctl.driver.usb import UsbHidDriver
+
+    assert registry.is_registered(Kraken2)
+    assert not registry.is_registered(UsbHidDriver)
+
+
+def test_import_does_not_load_drivers():
+    code = "import sys, liquidctl; print(','.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+    modules = out.stdout.strip().split(",")
+
+    assert "liquidctl.driver.kraken2" not in modules
+    assert "liquidctl.driver.usb" not in modules
+    assert "hid" not in modules and "usb" not in modules
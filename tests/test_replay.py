@@ -0,0 +1,120 @@
+# uses the psf/black style
+
+import sys
+
+import pytest
+from _testutils import MockHidapiDevice, MockRuntimeStorage
+from test_kraken3 import MockKraken
+
+import liquidctl.cli
+from liquidctl.driver.kraken3 import (
+    _COLOR_CHANNELS_KRAKENX,
+    _HWMON_CTRL_MAPPING_KRAKENX,
+    _SPEED_CHANNELS_KRAKENX,
+    KrakenX3,
+)
+from liquidctl.driver.usb import UsbHidDriver
+from liquidctl.replay import Transcript
+
+
+def _make_krakenx3(release_number=None):
+    raw = MockKraken(raw_led_channels=len(_COLOR_CHANNELS_KRAKENX) - 1)
+    raw.release_number = release_number
+    dev = KrakenX3(
+        raw,
+        "Mock Kraken X73",
+        speed_channels=_SPEED_CHANNELS_KRAKENX,
+        color_channels=_COLOR_CHANNELS_KRAKENX,
+        hwmon_ctrl_mapping=_HWMON_CTRL_MAPPING_KRAKENX,
+    )
+    dev.connect()
+    return dev
+
+
+def _unexpected():
+    raise AssertionError("should have been replayed")
+
+
+def _reload(transcript, tmp_path, record=False):
+    path = tmp_path / "boot.transcript"
+    transcript.save(path)
+    return Transcript.load(path, record=record)
+
+
+@pytest.fixture
+def recorded():
+    dev = _make_krakenx3()
+    transcript = Transcript(record=True)
+    status = transcript.run(dev, "initialize", dev.initialize)
+    transcript.run(dev, "pump 50", lambda: dev.set_fixed_speed("pump", 50))
+    return transcript, status, dev.device.sent
+
+
+def test_replays_recorded_transfers(recorded, tmp_path):
+    transcript, status, sent = recorded
+    replay = _reload(transcript, tmp_path)
+    dev = _make_krakenx3()
+    assert replay.run(dev, "initialize", _unexpected) == status
+    replay.run(dev, "pump 50", _unexpected)
+    assert dev.device.sent == sent
+
+
+def test_runs_unknown_operations_normally(recorded, tmp_path):
+    transcript, _, _ = recorded
+    replay = _reload(transcript, tmp_path)
+    dev = _make_krakenx3()
+
+    calls = []
+    replay.run(dev, "pump 60", lambda: calls.append("pump 60"))
+    assert calls == ["pump 60"]
+
+
+def test_does_not_replay_after_release_number_changes(recorded, tmp_path):
+    transcript, status, _ = recorded
+    replay = _reload(transcript, tmp_path)
+    dev = _make_krakenx3(release_number=0x200)
+
+    calls = []
+    replay.run(dev, "initialize", lambda: calls.append("initialize"))
+    assert calls == ["initialize"]
+
+
+def test_falls_back_when_replies_differ(recorded, tmp_path):
+    transcript, status, _ = recorded
+    replay = _reload(transcript, tmp_path, record=True)
+    dev = _make_krakenx3()
+    # a different firmware that replies differently
+    preload_read = dev.device.preload_read
+    dev.device.preload_read = lambda report: preload_read((report.number, bytes(64)))
+
+    calls = []
+    replay.run(dev, "initialize", lambda: calls.append("initialize"))
+    assert calls == ["initialize"]
+
+
+class _StatefulDriver(UsbHidDriver):
+    def __init__(self, device, description, **kwargs):
+        super().__init__(device, description, **kwargs)
+        self._data = MockRuntimeStorage(key_prefixes=["stateful"])
+
+    def initialize(self, **kwargs):
+        self.device.write([0x01, 0x02])
+        self._data.store("mode", (1, "fixed"))
+
+
+def test_replays_runtime_storage_changes(tmp_path):
+    dev = _StatefulDriver(MockHidapiDevice(), "Stateful")
+    transcript = Transcript(record=True)
+    transcript.run(dev, "initialize", dev.initialize)
+
+    other = _StatefulDriver(MockHidapiDevice(), "Stateful")
+    _reload(transcript, tmp_path).run(other, "initialize", _unexpected)
+    assert other._data.load("mode") == (1, "fixed")
+    assert other.device.sent == dev.device.sent
+
+
+def test_cli_requires_initialize_set_or_batch(monkeypatch, tmp_path, caplog):
+    path = str(tmp_path / "boot.transcript")
+    monkeypatch.setattr(sys, "argv", ["test", "--bus", "virtual", "--record", path, "status"])
+    assert liquidctl.cli.main() == 1
+    assert "--record and --replay require initialize, set or batch" in caplog.text
@@ -144,3 +144,8 @@ def test_smart_device_reads_status_from_hwmon(mockSmartDevice, tmp_path):
     got = dev.get_status()
 
     assert expected == got
+
+
+def test_smart_device_routes_short_reports(mockSmartDevice):
+    assert mockSmartDevice._dispatch_key([0x04, 0x00]) == b'\x04'
+    assert mockSmartDevice._dispatch_key([0x04] + [0] * 14 + [0x12]) == b'\x04\x01'
@@ -156,3 +156,86 @@ def test_loads_eeprom(emulated_device):
     spd.joinpath('name').write_text('name\n')
 
     assert bus.load_eeprom(0x51) == ('name', b'012345')
+
+
+def test_skips_sysfs_if_bus_filter_cannot_match(emulated_smbus, tmpdir):
+    i2c_root = tmpdir.mkdir('sys').mkdir('bus').mkdir('i2c')
+    i2c_root.mkdir('devices').mkdir('i2c-0')
+
+    virtual_bus = LinuxI2c(i2c_root=i2c_root)
+
+    discovered = Canary.find_supported_devices(bus='hid', root_bus=virtual_bus)
+    assert discovered == []
+
+
+def test_skips_drivers_that_cannot_match_filters(emulated_smbus, tmpdir):
+    i2c_root = tmpdir.mkdir('sys').mkdir('bus').mkdir('i2c')
+    i2c_root.mkdir('devices').mkdir('i2c-0')
+
+    class Picky(Canary):
+        @classmethod
+        def probe(cls, smbus, **kwargs):
+            yield Picky(smbus, 'Picky', vendor_id=-1, product_id=-1, address=-1)
+
+        @classmethod
+        def can_match(cls, match=None, **kwargs):
+            return not match
+
+    virtual_bus = LinuxI2c(i2c_root=i2c_root)
+
+    assert len(Picky.find_supported_devices(root_bus=virtual_bus)) == 1
+    assert Picky.find_supported_devices(match='foo', root_bus=virtual_bus) == []
+
+
+def _make_adapter(devices, name, vendor, device, driver):
+    adapter = devices.mkdir(name)
+    parent = adapter.mkdir('device')
+    parent.join('vendor').write(f'{vendor:#06x}\n')
+    parent.join('device').write(f'{device:#06x}\n')
+    parent.join('driver').mksymlinkto(devices.mkdir(f'{name}-{driver}').mkdir(driver))
+    return adapter
+
+
+def test_only_probes_declared_adapters(emulated_smbus, tmpdir):
+    i2c_root = tmpdir.mkdir('sys').mkdir('bus').mkdir('i2c')
+    devices = i2c_root.mkdir('devices')
+    _make_adapter(devices, 'i2c-0', 0x8086, 0xa323, 'i801_smbus')
+    _make_adapter(devices, 'i2c-1', 0x10de, 0x1b81, 'nvidia')
+    _make_adapter(devices, 'i2c-2', 0x10de, 0x1b80, 'nvidia')
+
+    class ByPciIds(Canary):
+        @classmethod
+        def probe_adapters(cls):
+            return [(0x10de, 0x1b81)]
+
+        @classmethod
+        def probe(cls, smbus, **kwargs):
+            yield ByPciIds(smbus, 'ByPciIds', vendor_id=-1, product_id=-1, address=-1)
+
+    class ByDriver(Canary):
+        @classmethod
+        def probe_adapters(cls):
+            return ['i801_smbus']
+
+        @classmethod
+        def probe(cls, smbus, **kwargs):
+            yield ByDriver(smbus, 'ByDriver', vendor_id=-1, product_id=-1, address=-1)
+
+    virtual_bus = LinuxI2c(i2c_root=i2c_root)
+
+    by_ids = ByPciIds.find_supported_devices(root_bus=virtual_bus)
+    assert [dev._smbus.name for dev in by_ids] == ['i2c-1']
+
+    by_driver = ByDriver.find_supported_devices(root_bus=virtual_bus)
+    assert [dev._smbus.name for dev in by_driver] == ['i2c-0']
+
+
+def test_reads_adapter_attributes_once(emulated_smbus, tmpdir):
+    devices = tmpdir.mkdir('devices')
+    adapter = _make_adapter(devices, 'i2c-0', 0x8086, 0xa323, 'i801_smbus')
+    bus = LinuxI2cBus(i2c_dev=Path(adapter))
+
+    assert bus.parent_device == 0xa323
+
+    adapter.join('device', 'device').write('0xffff\n')
+    assert bus.parent_device == 0xa323
@@ -0,0 +1,94 @@
+# uses the psf/black style
+
+import sys
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from _testutils import MockRuntimeStorage, VirtualBusDevice, VirtualControlMode
+
+import liquidctl.cli
+from liquidctl import status_cache
+
+
+class _CountingDevice(VirtualBusDevice):
+    def __init__(self, delay=0):
+        super().__init__()
+        self.reads = 0
+        self._delay = delay
+
+    def get_status(self, *args, **kwargs):
+        self.reads += 1
+        time.sleep(self._delay)
+        return super().get_status(*args, **kwargs)
+
+
+@pytest.fixture
+def storage():
+    return MockRuntimeStorage(key_prefixes=["status"])
+
+
+def test_reuses_fresh_status(storage):
+    dev = _CountingDevice()
+    first = status_cache.get_status(dev, ttl=60, storage=storage)
+    second = status_cache.get_status(dev, ttl=60, storage=storage)
+    assert dev.reads == 1
+
+    assert first[0] == ("Temperature", 30.4, "°C")
+    assert first[1] == ("Fan control mode", VirtualControlMode.QUIET, "")
+    # the cached copy went through the file
+    assert second[0] == first[0]
+    assert second[1] == ("Fan control mode", "VirtualControlMode.QUIET", "")
+    assert second[3] == ("Uptime", timedelta(hours=18, minutes=23, seconds=12), "")
+
+
+def test_refreshes_stale_status(storage, monkeypatch):
+    dev = _CountingDevice()
+    status_cache.get_status(dev, ttl=1, storage=storage)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 2)
+    status_cache.get_status(dev, ttl=1, storage=storage)
+    assert dev.reads == 2
+
+    # clocks can go backwards
+    monkeypatch.setattr(time, "time", lambda: now - 10)
+    status_cache.get_status(dev, ttl=1, storage=storage)
+    assert dev.reads == 3
+
+
+def test_coalesces_concurrent_refreshes(storage):
+    dev = _CountingDevice(delay=0.2)
+    results = []
+
+    def read():
+        results.append(status_cache.get_status(dev, ttl=60, storage=storage))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert dev.reads == 1
+    assert len(results) == 4
+
+
+def test_cli_status_ttl(monkeypatch, storage, capsys):
+    devs = [_CountingDevice()]
+    monkeypatch.setattr(liquidctl.cli, "find_liquidctl_devices", lambda **_: iter(devs))
+    monkeypatch.setattr(status_cache, "RuntimeStorage", lambda **_: storage)
+    monkeypatch.setattr(sys, "argv", ["test", "status", "--status-ttl", "60"])
+
+    assert liquidctl.cli.main() == 0
+    assert liquidctl.cli.main() == 0
+    assert devs[0].reads == 1
+
+
+@pytest.mark.parametrize("ttl", ["-1", "soon"])
+def test_cli_rejects_invalid_status_ttl(monkeypatch, caplog, ttl):
+    monkeypatch.setattr(sys, "argv", ["test", "--bus", "virtual", "status", "--status-ttl", ttl])
+
+    assert liquidctl.cli.main() == 1
+    assert "--status-ttl must be a number of seconds" in caplog.text
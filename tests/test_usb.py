@@ -1,7 +1,12 @@
+import sys
+import threading
+import time
+
 import pytest
-from _testutils import MockHidapiDevice
+from _testutils import MockHidapiDevice, MockRuntimeStorage
 
-from liquidctl.driver.usb import UsbDriver, UsbHidDriver
+from liquidctl.driver.usb import ReportBuffer, UsbDriver, UsbHidDriver
+from liquidctl.error import DeviceBusy
 
 
 @pytest.fixture
@@ -74,3 +79,286 @@ def test_usb_disconnect(emulated_usb_device):
 
     dev.disconnect()
     assert not opened
+
+
+class _FakeHidapi:
+    def __init__(self, infos):
+        self.infos = infos
+        self.enumerations = 0
+
+    def enumerate(self, vid=0, pid=0):
+        self.enumerations += 1
+        return [info for info in self.infos
+                if (not vid or info['vendor_id'] == vid)
+                and (not pid or info['product_id'] == pid)]
+
+    def device(self):
+        return None
+
+
+def _hidinfo(vid, pid, path):
+    return {'vendor_id': vid, 'product_id': pid, 'path': path, 'serial_number': None,
+            'release_number': 0x100, 'usage_page': 0, 'usage': 0, 'interface_number': 0}
+
+
+def test_hid_inventory_restores_candidate_drivers(monkeypatch):
+    import liquidctl.driver.usb
+    from liquidctl.driver.kraken2 import Kraken2
+    from liquidctl.driver.usb import HidapiBus
+
+    fake = _FakeHidapi([
+        _hidinfo(0x046d, 0xc52b, b'/dev/hidraw0'),  # unrelated (mouse)
+        _hidinfo(0x1e71, 0x170e, b'/dev/hidraw1'),  # Kraken X62
+    ])
+    monkeypatch.setattr(liquidctl.driver.usb, 'hid', fake)
+    monkeypatch.setattr(liquidctl.driver.usb.HwmonDevice, 'from_hidraw', lambda path: None)
+
+    bus = HidapiBus()
+    entries = bus._inventory_entries()
+    assert len(entries) == 1
+    assert entries[0][0]['path'] == b'/dev/hidraw1'
+
+    found = list(bus._find_devices_in_inventory(entries))
+    assert [type(dev) for dev in found] == [Kraken2]
+    assert found[0].device.path == b'/dev/hidraw1'
+    assert fake.enumerations == 1
+
+    assert list(bus._find_devices_in_inventory(entries, match='smart device')) == []
+    assert list(bus._find_devices_in_inventory(entries, address='/dev/hidraw0')) == []
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='hidraw is only available on Linux')
+def test_hid_inventory_depends_on_hid_backend(monkeypatch):
+    from liquidctl.driver.usb import HidapiBus
+
+    monkeypatch.delenv('LIQUIDCTL_HID_BACKEND', raising=False)
+    with_hidapi = HidapiBus()._inventory_drivers()
+    monkeypatch.setenv('LIQUIDCTL_HID_BACKEND', 'hidraw')
+    assert HidapiBus()._inventory_drivers() != with_hidapi
+
+
+def test_hid_bus_only_probes_candidate_drivers(monkeypatch):
+    import liquidctl.driver.usb
+    from liquidctl.driver.usb import HidapiBus
+
+    probed = []
+
+    class Exact(UsbHidDriver):
+        _MATCHES = [(0xaaaa, 0x0001, 'Exact', {}), (0xaaaa, 0x0001, 'Exact (alias)', {})]
+
+        @classmethod
+        def probe(cls, handle, **kwargs):
+            probed.append((cls.__name__, handle.product_id))
+            return iter(())
+
+    class AnyProduct(Exact):
+        _MATCHES = []
+
+        @classmethod
+        def probe_ids(cls, match=None):
+            return [(0xaaaa, None)] if not match else []
+
+    fake = _FakeHidapi([
+        _hidinfo(0x046d, 0xc52b, b'/dev/hidraw0'),
+        _hidinfo(0xaaaa, 0x0001, b'/dev/hidraw1'),
+        _hidinfo(0xaaaa, 0x0002, b'/dev/hidraw2'),
+    ])
+    monkeypatch.setattr(liquidctl.driver.usb, 'hid', fake)
+
+    list(HidapiBus().find_devices())
+    assert probed == [('AnyProduct', 0x0001), ('Exact', 0x0001), ('AnyProduct', 0x0002)]
+
+
+def test_hid_bus_skips_enumeration_when_filters_cannot_match(monkeypatch):
+    import liquidctl.driver.usb
+    from liquidctl.driver.usb import HidapiBus
+
+    fake = _FakeHidapi([_hidinfo(0x1e71, 0x170e, b'/dev/hidraw1')])
+    monkeypatch.setattr(liquidctl.driver.usb, 'hid', fake)
+    monkeypatch.setattr(liquidctl.driver.usb.HwmonDevice, 'from_hidraw', lambda path: None)
+
+    assert list(HidapiBus().find_devices(match='no such device')) == []
+    assert list(HidapiBus().find_devices(bus='usb1')) == []
+    assert list(HidapiBus().find_devices(usb_port=(1, 2))) == []
+    assert list(HidapiBus().find_devices(vendor=0xffff)) == []
+    assert fake.enumerations == 0
+
+    assert len(list(HidapiBus().find_devices(match='kraken x'))) == 1
+    assert fake.enumerations == 1
+
+
+def test_hid_looks_up_hwmon_device_lazily(monkeypatch):
+    import liquidctl.driver.usb
+
+    lookups = []
+
+    def from_hidraw(path):
+        lookups.append(path)
+        return None
+
+    monkeypatch.setattr(liquidctl.driver.usb.HwmonDevice, 'from_hidraw', from_hidraw)
+
+    dev = UsbHidDriver(MockHidapiDevice(), 'Test')
+    assert lookups == []
+
+    assert dev._hwmon is None
+    assert dev._hwmon is None
+    assert lookups == [dev.device.path]
+
+
+class _FakeUsbCoreDevice:
+    def __init__(self, vid, pid, address):
+        self.idVendor = vid
+        self.idProduct = pid
+        self.bcdDevice = 0x0100
+        self.bus = 1
+        self.address = address
+        self.port_numbers = (address,)
+        self.serial_number = None
+
+
+def test_usb_find_supported_devices_enumerates_once(monkeypatch):
+    import usb.core
+
+    import liquidctl.driver.usb
+    from liquidctl.driver.asetek import Hydro690Lc
+
+    enumerations = 0
+
+    def find(find_all, backend):
+        nonlocal enumerations
+        enumerations += 1
+        return iter([
+            _FakeUsbCoreDevice(0x1b1c, 0x0c02, 2),
+            _FakeUsbCoreDevice(0x1b1c, 0x0c09, 3),
+            _FakeUsbCoreDevice(0x1e71, 0x170e, 4),
+        ])
+
+    monkeypatch.setattr(usb.core, 'find', find)
+    monkeypatch.setattr(liquidctl.driver.usb, '_usb_backend', lambda: None)
+
+    devs = Hydro690Lc.find_supported_devices()
+    assert [dev.product_id for dev in devs] == [0x0c02, 0x0c09]
+    assert enumerations == 1
+
+    Hydro690Lc.find_supported_devices()
+    assert enumerations == 2
+
+
+class _LockingDriver(UsbHidDriver):
+    def initialize(self, **kwargs):
+        # operations can call each other
+        return self.get_status(**kwargs)
+
+    def get_status(self, delay=0, **kwargs):
+        self.usage['running'] += 1
+        self.usage['max_running'] = max(self.usage['max_running'], self.usage['running'])
+        time.sleep(delay)
+        self.usage['running'] -= 1
+        return []
+
+
+def _locking_driver(path, usage=None):
+    dev = _LockingDriver(MockHidapiDevice(bus='hid', address=path.decode(), path=path), 'Test')
+    dev.usage = usage if usage is not None else {'running': 0, 'max_running': 0}
+    return dev
+
+
+def test_hid_operations_hold_device_lock(lock_storage):
+    dev = _locking_driver(b'/dev/hidraw1')
+    assert dev.initialize() == []
+
+    # another process holds the lock
+    with lock_storage.lock(dev._lock_name()):
+        with pytest.raises(DeviceBusy):
+            dev.get_status(lock_timeout=0.1)
+
+        # other devices are not affected
+        assert _locking_driver(b'/dev/hidraw2').get_status(lock_timeout=0.1) == []
+
+    assert dev.get_status(lock_timeout=0) == []
+
+
+def test_devices_without_location_do_not_share_a_lock():
+    devs = [_LockingDriver(MockHidapiDevice(), 'Test') for _ in range(2)]
+    assert devs[0]._lock_name() != devs[1]._lock_name()
+
+
+def test_hid_operations_on_same_device_are_serialized(lock_storage):
+    usage = {'running': 0, 'max_running': 0}
+    devs = [_locking_driver(b'/dev/hidraw1', usage) for _ in range(3)]
+    threads = [threading.Thread(target=dev.get_status, kwargs={'delay': 0.1}) for dev in devs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert usage == {'running': 0, 'max_running': 1}
+
+
+def test_report_buffer_pads_and_reuses_its_buffer():
+    out = ReportBuffer(8)
+    first = out.fill([0x74, 0x01, 0x02])
+    assert bytes(first) == bytes([0x74, 0x01, 0x02, 0, 0, 0, 0, 0])
+
+    second = out.fill(b'\xaa\xbb', offset=1)
+    assert bytes(second) == bytes([0, 0xaa, 0xbb, 0, 0, 0, 0, 0])
+    assert second.obj is first.obj
+
+    with pytest.raises(ValueError):
+        out.fill([0] * 9)
+
+
+def test_hid_inventory_skips_bus_when_filters_cannot_match(monkeypatch, tmp_path):
+    import liquidctl.driver.usb
+    from liquidctl.driver.inventory import DeviceInventory
+    from liquidctl.driver.usb import HidapiBus
+
+    fake = _FakeHidapi([_hidinfo(0x1e71, 0x170e, b'/dev/hidraw1')])
+    monkeypatch.setattr(liquidctl.driver.usb, 'hid', fake)
+    (tmp_path / 'class' / 'hidraw').mkdir(parents=True)
+    inventory = DeviceInventory(storage=MockRuntimeStorage(['inventory']),
+                                sysfs_root=str(tmp_path))
+
+    assert list(inventory.find_devices(HidapiBus(), bus='virtual')) == []
+    assert list(inventory.find_devices(HidapiBus(), match='no such device')) == []
+    assert fake.enumerations == 0
+
+
+def test_discovery_shares_one_usb_enumeration(monkeypatch):
+    import usb.core
+
+    import liquidctl.driver.usb
+    from liquidctl.driver import find_liquidctl_devices
+    from liquidctl.driver.usb import PyUsbDevice
+
+    class WithBulkDevice(UsbHidDriver):
+        # like the Kraken Z3, which also looks up its bulk USB device
+        _MATCHES = [(0xaaaa, 0x0001, 'Hid with bulk device', {})]
+
+        def __init__(self, device, description, **kwargs):
+            super().__init__(device, description, **kwargs)
+            self.bulk_device = next(PyUsbDevice.enumerate(0xaaaa, 0x0001), None)
+
+    class OnUsbBus(UsbDriver):
+        _MATCHES = [(0xaaaa, 0x0002, 'Usb device', {})]
+
+    enumerations = 0
+
+    def find(find_all, backend):
+        nonlocal enumerations
+        enumerations += 1
+        return iter([_FakeUsbCoreDevice(0xaaaa, 0x0001, 2), _FakeUsbCoreDevice(0xaaaa, 0x0002, 3)])
+
+    monkeypatch.setattr(usb.core, 'find', find)
+    monkeypatch.setattr(liquidctl.driver.usb, '_usb_backend', lambda: None)
+    monkeypatch.setattr(liquidctl.driver.usb, 'hid',
+                        _FakeHidapi([_hidinfo(0xaaaa, 0x0001, b'/dev/hidraw1')]))
+    monkeypatch.setattr(liquidctl.driver.usb.HwmonDevice, 'from_hidraw', lambda path: None)
+
+    found = list(find_liquidctl_devices(vendor=0xaaaa))
+    devs = [dev for dev in found if isinstance(dev, WithBulkDevice)]
+    assert len(devs) == 1
+    assert devs[0].bulk_device
+    assert enumerations == 1
+    assert len([dev for dev in found if isinstance(dev, OnUsbBus)]) == 1
@@ -0,0 +1,90 @@
+# uses the psf/black style
+
+import pytest
+
+from liquidctl.driver.watcher import ADDED, REMOVED, DeviceWatcher, parse_uevent
+
+
+class FakeWatchableBus:
+    def __init__(self, handles):
+        self.handles = dict(handles)
+        self.probed = []
+
+    def _watch_handles(self, match=None, **kwargs):
+        return {key: val for key, val in self.handles.items() if not match or match in val}
+
+    def _probe_handles(self, handles, **kwargs):
+        for handle in handles:
+            self.probed.append(handle)
+            yield f"device on {handle}"
+
+
+class FakeStaticBus:
+    def __init__(self):
+        self.searches = 0
+
+    def find_devices(self, **kwargs):
+        self.searches += 1
+        yield "static device"
+
+
+@pytest.fixture
+def bus():
+    return FakeWatchableBus({"a": "handle a", "b": "handle b"})
+
+
+@pytest.fixture
+def watcher(bus):
+    with DeviceWatcher(poll_interval=0, settle_time=0, netlink=False, buses=[bus]) as watcher:
+        yield watcher
+
+
+def test_reports_present_devices_first(watcher):
+    events = watcher.poll()
+    assert events == [(ADDED, "device on handle a"), (ADDED, "device on handle b")]
+    assert watcher.devices == ["device on handle a", "device on handle b"]
+
+
+def test_only_probes_new_handles(watcher, bus):
+    watcher.poll()
+
+    bus.handles["c"] = "handle c"
+    assert watcher.poll(timeout=0) == [(ADDED, "device on handle c")]
+    assert bus.probed == ["handle a", "handle b", "handle c"]
+
+
+def test_reports_removed_devices(watcher, bus):
+    watcher.poll()
+
+    del bus.handles["a"]
+    assert watcher.poll(timeout=0) == [(REMOVED, "device on handle a")]
+    assert watcher.devices == ["device on handle b"]
+
+
+def test_replugged_devices_are_removed_and_added(watcher, bus):
+    watcher.poll()
+
+    bus.handles["a2"] = bus.handles.pop("a")
+    assert watcher.poll(timeout=0) == [
+        (REMOVED, "device on handle a"),
+        (ADDED, "device on handle a"),
+    ]
+
+
+def test_forwards_selection_filters(bus):
+    with DeviceWatcher(poll_interval=0, netlink=False, buses=[bus], match="b") as watcher:
+        assert watcher.poll() == [(ADDED, "device on handle b")]
+
+
+def test_searches_unsupported_buses_once(bus):
+    static = FakeStaticBus()
+    with DeviceWatcher(poll_interval=0, netlink=False, buses=[static, bus]) as watcher:
+        assert watcher.poll()[0] == (ADDED, "static device")
+        assert watcher.poll(timeout=0) == []
+        assert static.searches == 1
+        assert watcher.devices[0] == "static device"
+
+
+def test_parses_uevents():
+    message = b"add@/devices/pci0000:00/usb1/1-2\0ACTION=add\0SUBSYSTEM=usb\0SEQNUM=42\0"
+    assert parse_uevent(message) == {"ACTION": "add", "SUBSYSTEM": "usb", "SEQNUM": "42"}